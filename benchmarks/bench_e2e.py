@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput benchmark against the local fixture server.
+
+Each scenario runs ``poster_downloader.py`` in a fresh working directory,
+as a child process, against an in-process ``fixture_server.FixtureServer``:
+
+    latest    --latest --pages N
+    year      --year YEAR
+    movie     --movie YEAR/slug.html (a movie with several variants)
+    digest    --email-digest --digest-pages N (smtplib is replaced by a fake)
+
+and records posters/sec, p50/p95 per-poster latency (from the poster page
+request to the end of its image download, measured at the server),
+requests per poster, bytes written and the child's peak RSS. ``--warm``
+repeats every scenario in the same directory to measure the cached path.
+
+Usage:
+    python benchmarks/bench_e2e.py run                       # writes benchmarks/results/e2e-<commit>-<time>.json
+    python benchmarks/bench_e2e.py run --latency-ms 20 --warm --output after.json
+    python benchmarks/bench_e2e.py compare before.json after.json --threshold 10
+
+``compare`` prints the change of every metric and exits with status 1 when
+any of them regressed by more than the threshold (percent).
+"""
+
+import argparse
+import json
+import os
+import platform
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOWNLOADER = os.path.join(ROOT, 'poster_downloader.py')
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixture_server import Faults, FixtureServer, FixtureSite, write_config  # noqa: E402
+
+SCENARIOS = ('latest', 'year', 'movie', 'digest')
+
+# metric -> True if a higher value is better
+METRICS = {
+    'posters_per_sec': True,
+    'wall_seconds': False,
+    'p50_ms': False,
+    'p95_ms': False,
+    'requests_per_poster': False,
+    'bytes_written': False,
+    'peak_rss_mb': False,
+}
+
+SMTP_LOG = 'smtp_log.json'
+CHILD_LOG = 'run.log'
+
+
+def run_child(argv):
+    """Run poster_downloader.py in this process with smtplib replaced."""
+    import smtplib
+
+    sent = []
+
+    class FakeSMTP:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def starttls(self):
+            pass
+
+        def login(self, username, password):
+            pass
+
+        def send_message(self, msg):
+            sent.append(len(msg.as_bytes()))
+
+    smtplib.SMTP = FakeSMTP
+    sys.path.insert(0, ROOT)
+    sys.argv = [DOWNLOADER] + argv
+    try:
+        runpy.run_path(DOWNLOADER, run_name='__main__')
+    finally:
+        with open(SMTP_LOG, 'w', encoding='utf-8') as fh:
+            json.dump({'emails': len(sent), 'bytes': sum(sent)}, fh)
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def poster_latencies(timeline):
+    """Seconds from each poster page's first request to the end of its image download."""
+    latencies = []
+    for path, (_, image_end) in timeline.items():
+        if '/posters/' not in path or path.endswith('_tn.jpg'):
+            continue
+        year, filename = path.lstrip('/').split('/posters/', 1)
+        page = f"/{year}/{filename.rsplit('_', 1)[0]}.html"
+        if page in timeline:
+            latencies.append(image_end - timeline[page][0])
+    return latencies
+
+
+def directory_bytes(path, exclude=(CHILD_LOG, SMTP_LOG, 'config.yaml')):
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            if dirpath == path and filename in exclude:
+                continue
+            try:
+                total += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                pass
+    return total
+
+
+def scenario_args(name, site, args):
+    if name == 'latest':
+        return ['--latest', '--pages', str(args.pages)]
+    if name == 'year':
+        return ['--year', str(args.year)]
+    if name == 'movie':
+        movie = max((m for m in site.movies if m['year'] == args.year), key=lambda m: m['total'])
+        return ['--movie', f"{movie['year']}/{movie['slug']}.html"]
+    if name == 'digest':
+        return ['--email-digest', '--digest-pages', str(args.pages)]
+    raise ValueError(f"Unknown scenario: {name}")
+
+
+def run_scenario(server, workdir, argv, timeout):
+    """Run one child process; returns raw measurements."""
+    server.reset_stats()
+    smtp_path = os.path.join(workdir, SMTP_LOG)
+    if os.path.exists(smtp_path):
+        os.remove(smtp_path)
+    before = directory_bytes(workdir)
+    env = dict(os.environ, TMDB_API_KEY='fixture', SMTP_USERNAME='bench@example.com',
+               SMTP_PASSWORD='bench', EMAIL_TO='bench@example.com', PYTHONUNBUFFERED='1')
+    command = [sys.executable, os.path.abspath(__file__), '_child', '--'] + argv
+    start = time.perf_counter()
+    with open(os.path.join(workdir, CHILD_LOG), 'ab') as log:
+        proc = subprocess.Popen(command, cwd=workdir, env=env, stdin=subprocess.DEVNULL,
+                                stdout=log, stderr=subprocess.STDOUT)
+        deadline = start + timeout
+        while True:
+            pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                break
+            if time.perf_counter() > deadline:
+                proc.kill()
+                _, status, usage = os.wait4(proc.pid, 0)
+                break
+            time.sleep(0.05)
+        proc.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -1
+    wall = time.perf_counter() - start
+    stats = server.snapshot()
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    smtp = {}
+    if os.path.exists(smtp_path):
+        with open(smtp_path, 'r', encoding='utf-8') as fh:
+            smtp = json.load(fh)
+    return {
+        'exit_code': proc.returncode,
+        'wall_seconds': wall,
+        'requests': sum(stats['requests'].values()),
+        'requests_by_kind': stats['requests'],
+        'statuses': stats['statuses'],
+        'images': sum(1 for path in server.timeline if '/posters/' in path and not path.endswith('_tn.jpg')),
+        'latencies': poster_latencies(server.timeline),
+        'bytes_written': directory_bytes(workdir) - before,
+        'peak_rss_mb': rss_mb,
+        'emails': smtp.get('emails', 0),
+        'email_bytes': smtp.get('bytes', 0),
+    }
+
+
+def summarize(raw, posters):
+    latencies = raw.pop('latencies')
+    p50 = percentile(latencies, 50)
+    p95 = percentile(latencies, 95)
+    raw.update({
+        'posters': posters,
+        'posters_per_sec': posters / raw['wall_seconds'] if raw['wall_seconds'] and posters else 0.0,
+        'requests_per_poster': raw['requests'] / posters if posters else None,
+        'p50_ms': p50 * 1000 if p50 is not None else None,
+        'p95_ms': p95 * 1000 if p95 is not None else None,
+    })
+    return raw
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def print_results(results):
+    print()
+    print(f"{'scenario':<16} {'posters':>7} {'posters/s':>10} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'req/poster':>10} {'written MB':>10} {'RSS MB':>7}")
+    for name, metrics in results.items():
+        def fmt(key, width, precision):
+            value = metrics.get(key)
+            return f"{value:>{width}.{precision}f}" if value is not None else f"{'--':>{width}}"
+        print(f"{name:<16} {metrics['posters']:>7} {fmt('posters_per_sec', 10, 1)} "
+              f"{fmt('p50_ms', 8, 0)} {fmt('p95_ms', 8, 0)} {fmt('requests_per_poster', 10, 2)} "
+              f"{metrics['bytes_written'] / 1048576:>10.1f} {metrics['peak_rss_mb']:>7.0f}")
+
+
+def command_run(args):
+    site = FixtureSite(args.posters, args.year - 5, args.year, image_kb=args.image_kb, seed=args.seed)
+    faults = Faults(args.latency_ms, args.jitter_ms, args.error_rate, args.throttle_rate, seed=args.seed)
+    server = FixtureServer(site, faults, record_timeline=True).start()
+    print(f"✓ Fixture server at {server.base_url} ({len(site.archive)} poster pages)")
+    base_dir = tempfile.mkdtemp(prefix='imp-e2e-')
+    results = {}
+    failed = False
+    try:
+        for name in args.scenarios:
+            workdir = os.path.join(base_dir, name)
+            write_config(workdir, server.base_url)
+            argv = scenario_args(name, site, args)
+            print(f"↻ {name}: poster_downloader.py {' '.join(argv)}")
+            raw = run_scenario(server, workdir, argv, args.timeout)
+            cold_posters = raw['images']
+            results[name] = summarize(raw, cold_posters)
+            failed |= raw['exit_code'] != 0
+            if args.warm:
+                # Same workload, now served from caches and existing files
+                raw = run_scenario(server, workdir, argv, args.timeout)
+                results[f"{name} (warm)"] = summarize(raw, cold_posters)
+                failed |= raw['exit_code'] != 0
+    finally:
+        server.stop()
+        if args.keep:
+            print(f"ℹ️  Working directories kept in {base_dir}")
+        else:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+    print_results(results)
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'fixture': {
+            'posters': args.posters, 'year': args.year, 'pages': args.pages, 'image_kb': args.image_kb,
+            'latency_ms': args.latency_ms, 'jitter_ms': args.jitter_ms,
+            'error_rate': args.error_rate, 'throttle_rate': args.throttle_rate, 'seed': args.seed
+        },
+        'scenarios': results,
+    }
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"e2e-{report['commit']}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\n✓ Results written to {output}")
+    if failed:
+        print("✗ At least one run exited with an error (see run.log with --keep)")
+    return 1 if failed else 0
+
+
+def compare_reports(base, new, threshold):
+    """Return (rows, regressions) comparing every shared scenario metric."""
+    rows = []
+    regressions = 0
+    for name, new_metrics in new['scenarios'].items():
+        base_metrics = base['scenarios'].get(name)
+        if not base_metrics:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            before, after = base_metrics.get(metric), new_metrics.get(metric)
+            if before is None or after is None or not before:
+                continue
+            change = (after - before) / before * 100
+            worse = -change if higher_is_better else change
+            regressed = worse > threshold
+            regressions += regressed
+            rows.append((name, metric, before, after, change, regressed))
+    return rows, regressions
+
+
+def command_compare(args):
+    with open(args.base, 'r', encoding='utf-8') as fh:
+        base = json.load(fh)
+    with open(args.new, 'r', encoding='utf-8') as fh:
+        new = json.load(fh)
+    if base.get('fixture') != new.get('fixture'):
+        print("ℹ️  Fixture settings differ between the two runs; numbers may not be comparable")
+    rows, regressions = compare_reports(base, new, args.threshold)
+    print(f"Comparing {base.get('commit')} → {new.get('commit')} (threshold {args.threshold:.0f}%)\n")
+    print(f"{'scenario':<16} {'metric':<20} {'before':>12} {'after':>12} {'change':>8}")
+    for name, metric, before, after, change, regressed in rows:
+        marker = '  ✗ regression' if regressed else ''
+        print(f"{name:<16} {metric:<20} {before:>12.2f} {after:>12.2f} {change:>+7.1f}%{marker}")
+    if regressions:
+        print(f"\n✗ {regressions} metric(s) regressed by more than {args.threshold:.0f}%")
+        return 1
+    print("\n✓ No regressions beyond the threshold")
+    return 0
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '_child':
+        run_child(sys.argv[3:])
+        return 0
+
+    parser = argparse.ArgumentParser(description='End-to-end benchmark against the fixture server')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Run the scenarios and write a JSON report')
+    run.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    run.add_argument('--posters', type=int, default=2000, help='Poster pages on the fixture site (default: 2000)')
+    run.add_argument('--year', type=int, default=2024, help='Year used by the year and movie scenarios')
+    run.add_argument('--pages', type=int, default=4, help='Archive pages for latest/digest (default: 4)')
+    run.add_argument('--image-kb', type=float, default=200)
+    run.add_argument('--latency-ms', type=float, default=0)
+    run.add_argument('--jitter-ms', type=float, default=0)
+    run.add_argument('--error-rate', type=float, default=0.0)
+    run.add_argument('--throttle-rate', type=float, default=0.0)
+    run.add_argument('--seed', type=int, default=1)
+    run.add_argument('--warm', action='store_true', help='Repeat each scenario against its warm caches')
+    run.add_argument('--timeout', type=float, default=900, help='Seconds before a run is killed')
+    run.add_argument('--keep', action='store_true', help='Keep the working directories')
+    run.add_argument('--output', metavar='FILE', help='Report path (default: benchmarks/results/)')
+
+    compare = commands.add_parser('compare', help='Compare two reports')
+    compare.add_argument('base')
+    compare.add_argument('new')
+    compare.add_argument('--threshold', type=float, default=10.0,
+                         help='Percent change counted as a regression (default: 10)')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        return command_run(args)
+    return command_compare(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the parser, metadata store, digest tracker and thumbnails.
+
+Each benchmark is timed at several input sizes and reported as a scaling
+curve: the per-operation time at each size, the time and size ratios
+between sizes, and the growth exponent (per-op time ~ size^k). A flat curve
+has k near 0; k near 1 means the operation is O(n) and a loop over it
+O(n^2). Curves that grow faster than the benchmark's expected exponent
+(plus ``--tolerance``, which absorbs cache effects between sizes) are
+flagged, and the exit code is 1 when any curve is, so the benchmark can
+guard against quadratic regressions in CI.
+
+    parse      parse_poster_page() per poster page, archive link extraction
+               by thumbnails per page (saved pages via --pages)
+    store      MovieMetadataStore per update over a whole run (n updates
+               into an n-movie store, flushes included; expected flat),
+               pending updates and a single flush at 1k/10k/100k movies
+    tracker    DigestTracker.record_sent / get_known_ids at 10k-1M history
+    thumbnail  EmailSender.create_thumbnail per resolution class
+
+Usage:
+    python benchmarks/bench_micro.py                        # everything
+    python benchmarks/bench_micro.py store tracker --quick  # smaller sizes
+    python benchmarks/bench_micro.py parse --pages saved/ --json micro.json
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_parser import load_saved_pages  # noqa: E402
+from fixture_server import SIZE_DIMENSIONS, archive_page, sample_corpus, slug_name  # noqa: E402
+
+BENCHMARKS = ('parse', 'store', 'tracker', 'thumbnail')
+
+
+def time_per_op(func, ops, rounds=3):
+    """Best-of-``rounds`` seconds per call of ``func(i)`` over ``ops`` calls."""
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for i in range(ops):
+            func(i)
+        best = min(best, (time.perf_counter() - start) / ops)
+    return best
+
+
+class Curve:
+    """Per-op timings of one operation across input sizes."""
+
+    def __init__(self, name, unit, expected=0.0, tolerance=None):
+        # expected=None: report the curve without flagging it; tolerance
+        # overrides --tolerance for curves with known cache steps
+        self.name = name
+        self.unit = unit
+        self.expected = expected
+        self.tolerance = tolerance
+        self.points = []
+
+    def add(self, size, seconds):
+        self.points.append((size, seconds))
+        print(f"    {self.name:<34} {self.unit}={size:<9,} {seconds * 1e6:>12.1f} µs/op")
+
+    def exponents(self):
+        out = []
+        for (n1, t1), (n2, t2) in zip(self.points, self.points[1:]):
+            if n2 != n1 and t1 > 0 and t2 > 0:
+                out.append(math.log(t2 / t1) / math.log(n2 / n1))
+        return out
+
+    def ratios(self):
+        """(size ratio, per-op time ratio) between consecutive sizes."""
+        return [(n2 / n1, t2 / t1) for (n1, t1), (n2, t2) in zip(self.points, self.points[1:])
+                if n2 != n1 and t1 > 0 and t2 > 0]
+
+    def flagged(self, tolerance=0.5):
+        exponents = self.exponents()
+        if self.tolerance is not None:
+            tolerance = self.tolerance
+        return bool(exponents) and self.expected is not None and max(exponents) > self.expected + tolerance
+
+    def report(self, tolerance=0.5):
+        exponents = self.exponents()
+        if not exponents:
+            return False
+        flagged = self.flagged(tolerance)
+        marker = f"  ⚠ grows faster than expected (k≈{self.expected:.0f})" if flagged else ''
+        steps = ', '.join(f"{k:.2f} (×{time_ratio:.1f} per ×{size_ratio:.0f})"
+                          for k, (size_ratio, time_ratio) in zip(exponents, self.ratios()))
+        print(f"    {self.name:<34} k = {steps}{marker}")
+        return flagged
+
+    def as_dict(self, tolerance=0.5):
+        return {'unit': self.unit, 'expected_exponent': self.expected,
+                'tolerance': tolerance if self.tolerance is None else self.tolerance,
+                'points': [{'size': size, 'seconds_per_op': seconds} for size, seconds in self.points],
+                'exponents': self.exponents(),
+                'ratios': [{'size': size_ratio, 'seconds_per_op': time_ratio} for size_ratio, time_ratio in self.ratios()],
+                'flagged': self.flagged(tolerance)}
+
+
+def bare_downloader():
+    """A PosterDownloader without session, caches or files (parsing only)."""
+    from poster_downloader import PosterDownloader
+    from stage_timings import StageTimings
+    from tracing import NULL_TRACER
+
+    downloader = PosterDownloader.__new__(PosterDownloader)
+    downloader.parse_cache = None
+    downloader.timings = StageTimings()
+    downloader.tracer = NULL_TRACER
+    return downloader
+
+
+class _Response:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+def bench_parse(args, workdir):
+    downloader = bare_downloader()
+    pages = load_saved_pages(args.pages) if args.pages else sample_corpus()
+    posters = [(url, content) for kind, url, content in pages if kind == 'poster']
+    archives = [content for kind, _, content in pages if kind == 'archive']
+    curves = []
+
+    if posters:
+        # parse_poster_page() with the fetch answered from memory
+        responses = {url: _Response(content) for url, content in posters}
+        downloader._get = lambda url, **kwargs: responses[url]
+        urls = [url for url, _ in posters]
+        per_page = time_per_op(lambda i: downloader.parse_poster_page(urls[i % len(urls)]), len(urls) * args.repeat)
+        size = sum(len(content) for _, content in posters) // len(posters)
+        print(f"    parse_poster_page ({len(posters)} pages, ~{size // 1024} KiB): {per_page * 1e6:.1f} µs/page")
+        curves.append(('parse_poster_page', {'unit': 'page', 'points': [{'size': len(posters), 'seconds_per_op': per_page}]}))
+
+    if archives:
+        per_page = time_per_op(lambda i: downloader.extract_archive_links(archives[i % len(archives)]),
+                               len(archives) * args.repeat)
+        print(f"    extract_archive_links ({len(archives)} saved/sample pages): {per_page * 1e6:.1f} µs/page")
+
+    curve = Curve('extract_archive_links', 'thumbs', expected=1.0)
+    for thumbs in args.sizes(50, 500, 5000, 50000):
+        content = archive_page([(2024, slug_name(n)) for n in range(thumbs)], 'page1.html').encode('latin-1')
+        curve.add(thumbs, time_per_op(lambda i: downloader.extract_archive_links(content), max(1, args.repeat // 4)))
+    return curves + [(curve.name, curve)]
+
+
+def _store_entry(n):
+    return {
+        'movie_id': f"2024_{slug_name(n)}", 'movie_title': slug_name(n).replace('_', ' ').title(),
+        'movie_slug': slug_name(n), 'year': '2024', 'release_date': '2024-01-01',
+        'genres': ['Drama'], 'imdb_id': f"tt{1000000 + n}", 'tmdb_id': n + 1,
+        'posters': [{'local_path': f"downloads/2024_{slug_name(n)}_XLG_1013x1500.jpg", 'size': 'XLG'}],
+        'source_urls': [f"http://www.impawards.com/2024/{slug_name(n)}.html"],
+        'last_updated': '2024-01-01T00:00:00+00:00'
+    }
+
+
+def bench_store(args, workdir):
+    from poster_downloader import MovieMetadataStore
+
+    # A backfill grows the store as it goes: per-update cost over a run of n
+    # updates must stay flat in n, or the run as a whole is superlinear
+    run = Curve('update_movie run (per update)', 'movies', expected=0.0)
+    pending = Curve('update_movie(save=False)', 'movies', expected=0.0)
+    flush = Curve('save() (one flush)', 'movies', expected=1.0)
+    for size in args.sizes(1000, 10000, 100000):
+        path = os.path.join(workdir, f"store_{size}.json")
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump({f"2024_{slug_name(n)}": _store_entry(n) for n in range(size)}, fh, indent=2)
+
+        def update(store, i, save):
+            n = (i * 7919) % size
+            store.update_movie(f"2024_{slug_name(n)}", {'genres': ['Drama', 'Thriller']},
+                               poster_info={'local_path': f"downloads/extra_{i}.jpg", 'size': 'XXLG'},
+                               source_url=f"http://www.impawards.com/2024/{slug_name(n)}_ver2.html", save=save)
+
+        start = time.perf_counter()
+        store = MovieMetadataStore(path)
+        for i in range(size):
+            update(store, i, True)
+        store.save()
+        run.add(size, (time.perf_counter() - start) / size)
+        pending.add(size, time_per_op(lambda i: update(store, size + i, False), 1000))
+        flush.add(size, time_per_op(lambda i: (update(store, 2 * size + i, False), store.save()), 1, rounds=3))
+    return [(run.name, run), (pending.name, pending), (flush.name, flush)]
+
+
+def bench_tracker(args, workdir):
+    from digest_tracker import DigestTracker
+
+    sent = Curve('record_sent(100 ids)', 'history', expected=1.0)
+    # get_known_ids() builds a set over the whole history, so its per-op
+    # time steps up as the history outgrows the CPU caches: sizes are a
+    # decade apart to average that step out, and the minimum of several
+    # rounds is used
+    known = Curve('get_known_ids()', 'history', expected=1.0, tolerance=0.75)
+    for size in args.sizes(10000, 100000, 1000000):
+        tracker = DigestTracker(state_file=os.path.join(workdir, f"digest_{size}.json"), history_limit=size)
+        tracker.state['sent_ids'] = [f"http://www.impawards.com/2024/{slug_name(n)}.html" for n in range(size)]
+        tracker.state['ignored_ids'] = [f"http://www.impawards.com/2023/{slug_name(n)}.html" for n in range(size // 10)]
+        # Half of each batch is already in the history (re-sent posters)
+        batches = [[f"http://www.impawards.com/2024/{slug_name((b * 100 + k) * 3 % size if k % 2 else size + b * 100 + k)}.html"
+                    for k in range(100)] for b in range(20)]
+        sent.add(size, time_per_op(lambda i: tracker.record_sent(batches[i % len(batches)]), 5, rounds=1))
+        known.add(size, time_per_op(lambda i: tracker.get_known_ids(), 5, rounds=5))
+    return [(sent.name, sent), (known.name, known)]
+
+
+def bench_thumbnail(args, workdir):
+    from PIL import Image
+
+    from email_sender import EmailSender
+
+    # create_thumbnail only needs the module settings, not SMTP credentials
+    sender = EmailSender.__new__(EmailSender)
+    # Images narrower than email.thumbnail_max_width are not resized, so the
+    # curve is not expected to be smooth across classes
+    curve = Curve('create_thumbnail', 'pixels', expected=None)
+    for size_class, dims in SIZE_DIMENSIONS.items():
+        width, height = (int(value) for value in dims.split('x'))
+        path = os.path.join(workdir, f"poster_{size_class}.jpg")
+        image = Image.effect_noise((width // 8, height // 8), 64).convert('RGB').resize((width, height))
+        image.save(path, format='JPEG', quality=90)
+        seconds = time_per_op(lambda i: sender.create_thumbnail(path), max(2, args.repeat // 4))
+        print(f"    {size_class.upper():<6} {dims:<10} {os.path.getsize(path) // 1024:>6} KiB")
+        curve.add(width * height, seconds)
+    return [(curve.name, curve)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scaling microbenchmarks')
+    parser.add_argument('benchmarks', nargs='*', metavar='BENCHMARK',
+                        help=f"Any of {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument('--pages', metavar='DIR', help='Saved pages for the parse benchmark (default: built-in samples)')
+    parser.add_argument('--repeat', type=int, default=20, help='Iterations per page/image (default: 20)')
+    parser.add_argument('--quick', action='store_true', help='Skip the largest size of each curve')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='Exponent above the expected one that is flagged (default: 0.5)')
+    parser.add_argument('--json', metavar='FILE', help='Also write the curves as JSON')
+    args = parser.parse_args()
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+    args.sizes = lambda *sizes: sizes[:-1] if args.quick else sizes
+
+    runners = {'parse': bench_parse, 'store': bench_store, 'tracker': bench_tracker, 'thumbnail': bench_thumbnail}
+    workdir = tempfile.mkdtemp(prefix='imp-micro-')
+    results = {}
+    flagged = []
+    try:
+        for name in args.benchmarks or BENCHMARKS:
+            print(f"\n{name}")
+            for curve_name, curve in runners[name](args, workdir):
+                if isinstance(curve, Curve):
+                    if curve.report(args.tolerance):
+                        flagged.append(curve_name)
+                    curve = curve.as_dict(args.tolerance)
+                results[curve_name] = curve
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump(results, fh, indent=2)
+        print(f"\n✓ Results written to {args.json}")
+    if flagged:
+        print(f"\n⚠ Superlinear scaling: {', '.join(flagged)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Parser conformance check and benchmark: lxml fast paths vs BeautifulSoup.
+
+Every page is parsed both ways; the run fails (exit status 1) if the two
+paths disagree on any page, then reports the per-page parse time of each.
+
+The default corpus is the checked-in ``benchmarks/pages/`` directory (an
+archive page, a ``std.html`` year index and poster pages with the site's
+quirks: unquoted attributes, upper-case tags, Latin-1 titles, scripts and
+comments containing anchors, pages without sizes or IMDb links), plus the
+synthetic fixture-server pages as a supplement. ``--refresh`` downloads
+current copies of the same pages from the live site over the corpus.
+
+Usage:
+    python benchmarks/bench_parser.py                   # pages/ + synthetic pages
+    python benchmarks/bench_parser.py --pages saved/    # other saved pages
+    python benchmarks/bench_parser.py --no-synthetic    # saved pages only
+    python benchmarks/bench_parser.py --refresh         # re-download pages/
+
+Saved pages are ``*.html`` files laid out like the site (``2025/tron_ares.html``,
+``archives/latest.html``, ``2025/std.html``) so poster URLs can be rebuilt.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+import page_parser  # noqa: E402
+from poster_downloader import PosterDownloader  # noqa: E402
+from stage_timings import StageTimings  # noqa: E402
+from tracing import NULL_TRACER  # noqa: E402
+from fixture_server import sample_corpus  # noqa: E402
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+SITE_URL = 'http://www.impawards.com/'
+
+
+def load_saved_pages(pages_dir):
+    corpus = []
+    for dirpath, _, filenames in os.walk(pages_dir):
+        for filename in sorted(filenames):
+            if not filename.endswith('.html'):
+                continue
+            path = os.path.join(dirpath, filename)
+            rel = os.path.relpath(path, pages_dir).replace(os.sep, '/')
+            with open(path, 'rb') as fh:
+                content = fh.read()
+            if b'minimal_thumb' in content:
+                kind = 'archive'
+            elif filename == 'std.html':
+                kind = 'index'
+            else:
+                kind = 'poster'
+            corpus.append((kind, f"http://www.impawards.com/{rel}", content))
+    return corpus
+
+
+def refresh_pages(pages_dir):
+    """Replace every saved page with the live site's current copy."""
+    import requests
+
+    pages = load_saved_pages(pages_dir)
+    if not pages:
+        print(f"✗ No pages found in {pages_dir}")
+        return 1
+    failed = 0
+    for _, url, _ in pages:
+        rel = url[len(SITE_URL):]
+        try:
+            response = requests.get(url, timeout=30, headers={'User-Agent': 'Mozilla/5.0'})
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            failed += 1
+            print(f"✗ {rel}: {exc}")
+            continue
+        with open(os.path.join(pages_dir, *rel.split('/')), 'wb') as fh:
+            fh.write(response.content)
+        print(f"✓ {rel} ({len(response.content) // 1024} KiB)")
+    return failed
+
+
+def make_parsers():
+    # Parsing helpers only use pure methods, so skip __init__ (no session,
+    # caches or metadata store in the working directory).
+    downloader = PosterDownloader.__new__(PosterDownloader)
+    downloader.timings = StageTimings()
+    downloader.tracer = NULL_TRACER
+
+    def fast(kind, url, content):
+        if kind == 'poster':
+            return downloader.parse_poster_content(url, content)
+        if kind == 'archive':
+            return downloader.extract_archive_links(content)
+        return downloader.extract_anchor_hrefs(content)
+
+    def soup(kind, url, content):
+        parsed = BeautifulSoup(content, 'lxml')
+        if kind == 'poster':
+            return downloader.parse_poster_soup(url, parsed), downloader.extract_imdb_url(parsed)
+        if kind == 'archive':
+            hrefs = []
+            for div in parsed.find_all('div', class_='minimal_thumb'):
+                link = div.find('a', href=True)
+                if link:
+                    hrefs.append(link['href'])
+            return hrefs, downloader.get_older_page_link(parsed)
+        return [link['href'] for link in parsed.find_all('a', href=True)]
+
+    return fast, soup
+
+
+def time_parser(parser, pages, repeat):
+    timings = {}
+    for kind, url, content in pages:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            parser(kind, url, content)
+        timings.setdefault(kind, []).append((time.perf_counter() - start) / repeat)
+    return {kind: sum(values) / len(values) for kind, values in timings.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare lxml fast-path parsing with BeautifulSoup')
+    parser.add_argument('--pages', metavar='DIR', default=PAGES_DIR,
+                        help='Directory of saved pages (default: benchmarks/pages)')
+    parser.add_argument('--no-synthetic', dest='synthetic', action='store_false',
+                        help='Skip the synthetic fixture-server pages')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Download current copies of the saved pages from the site and exit')
+    parser.add_argument('--repeat', type=int, default=20, help='Parses per page when timing (default: 20)')
+    args = parser.parse_args()
+
+    if args.refresh:
+        return 1 if refresh_pages(args.pages) else 0
+
+    pages = load_saved_pages(args.pages)
+    if not pages:
+        print(f"✗ No pages found in {args.pages}")
+        return 1
+    print(f"Saved pages: {len(pages)} from {args.pages}")
+    if args.synthetic:
+        synthetic = sample_corpus()
+        print(f"Synthetic pages: {len(synthetic)}")
+        pages += synthetic
+    fast, soup = make_parsers()
+
+    mismatches = 0
+    for kind, url, content in pages:
+        if fast(kind, url, content) != soup(kind, url, content):
+            mismatches += 1
+            print(f"✗ Mismatch ({kind}): {url}")
+    print(f"Conformance: {len(pages) - mismatches}/{len(pages)} pages identical")
+
+    fast_times = time_parser(fast, pages, args.repeat)
+    soup_times = time_parser(soup, pages, args.repeat)
+    print()
+    print(f"{'page type':<10} {'bs4 (ms)':>10} {'lxml (ms)':>10} {'speedup':>8}")
+    for kind in sorted(fast_times):
+        speedup = soup_times[kind] / fast_times[kind] if fast_times[kind] else float('inf')
+        print(f"{kind:<10} {soup_times[kind] * 1000:>10.2f} {fast_times[kind] * 1000:>10.2f} {speedup:>7.1f}x")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for cron runs that exit early.
+
+Runs poster_downloader.py in fresh interpreters from a scratch directory
+whose config.yaml disables the schedule, and reports the wall time of each
+scenario above bare interpreter startup (``python -c pass``, which includes
+site-packages .pth hooks this project cannot control):
+
+    import    import poster_downloader
+    skip      -m poster_downloader --email-digest on a disabled day (what
+              scripts/run_email_digest.sh runs; -m uses cached bytecode,
+              running the .py file directly recompiles it every time)
+    help      -m poster_downloader --help
+
+Each scenario also runs once under ``-X importtime``: the slowest modules
+are listed, and any heavy dependency that the scenario should never load
+(requests, bs4, lxml, PIL, smtplib) is flagged, as is a median above
+``--budget-ms``. The exit code is 1 when anything is flagged, so the
+benchmark can guard lazy imports in CI.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py skip --runs 20 --budget-ms 40
+    python benchmarks/bench_startup.py --json startup.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'import': ['-c', 'import poster_downloader'],
+    'skip': ['-m', 'poster_downloader', '--email-digest'],
+    'help': ['-m', 'poster_downloader', '--help'],
+}
+
+# Top-level packages none of the early-exit scenarios should import
+HEAVY_MODULES = ('requests', 'urllib3', 'bs4', 'lxml', 'PIL', 'smtplib', 'email_sender', 'digest_tracker')
+
+DISABLED_CONFIG = """\
+schedule:
+  enabled: false
+"""
+
+
+def run_once(argv, cwd, env, importtime=False):
+    """Wall-clock seconds of one fresh interpreter, plus its stderr."""
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + argv
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(argv)} exited with {result.returncode}:\n{result.stderr[-2000:]}")
+    return elapsed, result.stderr
+
+
+def median_seconds(argv, cwd, env, runs):
+    run_once(argv, cwd, env)  # warm the OS file cache and __pycache__
+    return statistics.median(run_once(argv, cwd, env)[0] for _ in range(runs))
+
+
+def parse_importtime(stderr):
+    """(module, self us, cumulative us, depth) rows of -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def heavy_imports(rows):
+    loaded = {name.split('.')[0] for name, _, _, _ in rows}
+    return sorted(loaded & set(HEAVY_MODULES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold-start benchmark for early-exit runs')
+    parser.add_argument('scenarios', nargs='*', metavar='SCENARIO',
+                        help=f"Any of {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument('--runs', type=int, default=10, help='Timed runs per scenario (default: 10)')
+    parser.add_argument('--budget-ms', type=float, default=100.0,
+                        help='Flag scenarios whose median exceeds interpreter startup by more than this (default: 100)')
+    parser.add_argument('--top', type=int, default=8, help='Slowest modules listed per scenario (default: 8)')
+    parser.add_argument('--json', metavar='FILE', help='Also write the results as JSON')
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    workdir = tempfile.mkdtemp(prefix='imp-startup-')
+    with open(os.path.join(workdir, 'config.yaml'), 'w', encoding='utf-8') as fh:
+        fh.write(DISABLED_CONFIG)
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    results = {}
+    flagged = []
+    try:
+        baseline = median_seconds(['-c', 'pass'], workdir, env, args.runs)
+        print(f"interpreter startup: {baseline * 1000:.1f} ms (median of {args.runs})")
+        results['baseline_ms'] = round(baseline * 1000, 2)
+        for name in args.scenarios or SCENARIOS:
+            argv = SCENARIOS[name]
+            seconds = median_seconds(argv, workdir, env, args.runs)
+            rows = parse_importtime(run_once(argv, workdir, env, importtime=True)[1])
+            overhead_ms = (seconds - baseline) * 1000
+            heavy = heavy_imports(rows)
+            print(f"\n{name}: {seconds * 1000:.1f} ms • +{overhead_ms:.1f} ms over startup • {len(rows)} modules")
+            for module, self_us, cumulative_us, depth in sorted(rows, key=lambda row: -row[1])[:args.top]:
+                print(f"  {self_us / 1000:>7.1f} ms self {cumulative_us / 1000:>7.1f} ms cumulative  {module}")
+            if heavy:
+                print(f"  ⚠ loads {', '.join(heavy)}")
+                flagged.append(f"{name} (imports {', '.join(heavy)})")
+            if overhead_ms > args.budget_ms:
+                print(f"  ⚠ over budget ({overhead_ms:.1f} ms > {args.budget_ms:.0f} ms)")
+                flagged.append(f"{name} (+{overhead_ms:.0f} ms)")
+            results[name] = {
+                'median_ms': round(seconds * 1000, 2),
+                'overhead_ms': round(overhead_ms, 2),
+                'modules': len(rows),
+                'heavy_imports': heavy,
+            }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump(results, fh, indent=2)
+        print(f"\n✓ Results written to {args.json}")
+    if flagged:
+        print(f"\n⚠ Startup regressions: {'; '.join(flagged)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+"""
+Synthetic IMP Awards and TMDb stand-in for parser benchmarks and load tests.
+
+The page builders mirror the structures the scraper reads on the real site
+(``div.minimal_thumb`` thumbnails, the ``p.small`` "other sizes" block with
+unquoted attributes, the IMDb anchor and the ``<title>`` format) padded with
+navigation and sidebar noise so page sizes are in the same range as the
+originals. ``bench_parser.py`` uses them directly.
+
+Run as a script, it serves a whole deterministic site over HTTP:
+
+    /archives/latest.html, /archives/pageNNNN.html   archive pages, newest first
+    /YEAR/std.html                                   year indexes
+    /YEAR/slug.html, /YEAR/slug_verN.html            poster pages
+    /YEAR/posters/slug_SIZE.jpg                      JPEGs (``--image-kb`` for xlg)
+    /3/find/ttNNNNNNN, /3/movie/N                    TMDb API JSON
+    /_stats                                          request counters (JSON)
+
+with optional latency, jitter, 5xx errors and 429s (with Retry-After), so
+``poster_downloader.py`` can be load-tested at 10k+ posters on one machine:
+
+    python benchmarks/fixture_server.py --posters 10000 --latency-ms 20 \\
+        --throttle-rate 0.01 --write-config /tmp/fixture-run
+    cd /tmp/fixture-run && TMDB_API_KEY=fixture python /path/to/poster_downloader.py --latest --pages 5
+
+``--write-config`` writes a ``config.yaml`` there pointing ``site.base_url``,
+``site.latest_url`` and ``tmdb.base_url`` at the server, with data files kept
+in that directory.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_NAV = ''.join(
+    f'<li><a href="../{year}/alpha1.html">{year}</a></li>' for year in range(1920, 2026)
+)
+_SIDEBAR = ''.join(
+    f'<div class="side"><a href="../2024/ad_{n}.html"><img src="../ads/{n}.gif"></a>'
+    f'<p>Sponsored link number {n} with some filler copy.</p></div>'
+    for n in range(40)
+)
+
+SIZE_DIMENSIONS = {'lg': '675x1000', 'xlg': '1013x1500', 'xxlg': '2025x3000', 'xxxlg': '3000x4500'}
+
+# Image size per resolution class, relative to --image-kb (the xlg size).
+SIZE_SCALE = {'tn': 0.05, 'lg': 0.5, 'xlg': 1.0, 'xxlg': 2.5, 'xxxlg': 4.0}
+
+SIZE_CHOICES = [('xlg',), ('xlg', 'xxlg'), ('lg', 'xlg', 'xxlg', 'xxxlg')]
+
+# TMDb genre IDs handed out to synthetic movies (27 is Horror).
+GENRE_POOL = [28, 12, 16, 35, 80, 18, 14, 27, 9648, 878, 53, 10749]
+GENRE_LABELS = {
+    28: 'Action', 12: 'Adventure', 16: 'Animation', 35: 'Comedy', 80: 'Crime',
+    18: 'Drama', 14: 'Fantasy', 27: 'Horror', 9648: 'Mystery',
+    878: 'Science Fiction', 53: 'Thriller', 10749: 'Romance'
+}
+
+
+def _wrap(title, body):
+    return (
+        '<!DOCTYPE html PUBLIC "-//W3C//DTD HTML 4.01 Transitional//EN">\n'
+        f'<html><head><title>{title}</title>'
+        '<meta http-equiv="Content-Type" content="text/html; charset=iso-8859-1">'
+        '<link rel="stylesheet" href="../imp.css"></head><body>'
+        f'<div id="nav"><ul>{_NAV}</ul></div>'
+        f'<div id="content">{body}</div>'
+        f'<div id="sidebar">{_SIDEBAR}</div>'
+        '</body></html>'
+    )
+
+
+def slug_name(n):
+    return f"movie_{n:05d}"
+
+
+def imdb_id_for(n):
+    return f"tt{1000000 + n:07d}"
+
+
+def poster_page(year, slug, variant=1, total=3, imdb_id='tt0000001', sizes=('xlg', 'xxlg')):
+    """A poster page with an IMDb link and an "other sizes" block."""
+    page = slug if variant == 1 else f"{slug}_ver{variant}"
+    size_links = ' / '.join(
+        f'<a href = {page}_{size}.html>{SIZE_DIMENSIONS[size]}</a>' for size in sizes
+    )
+    title = f"{slug.replace('_', ' ').title()} Movie Poster (#{variant} of {total}) - IMP Awards"
+    variants = ''.join(
+        f'<div class="thumb"><a href="{slug}_ver{n}.html"><img src="posters/{slug}_ver{n}_tn.jpg"></a></div>'
+        for n in range(2, total + 1)
+    )
+    body = (
+        f'<h1>{slug.replace("_", " ").title()}</h1>'
+        f'<img src="posters/{page}.jpg" width="400">'
+        f'<p class="small">other sizes: {size_links} <a href = {page}_{sizes[-1]}.html><img src="../images/zoom.gif"></a></p>'
+        f'<p>Release date: Friday, January 1, {year}</p>'
+        f'<a href = http://www.imdb.com/title/{imdb_id} target = _blank>IMDb</a>'
+        f'<div id="variants">{variants}</div>'
+    )
+    return _wrap(title, body)
+
+
+def archive_page(entries, older_page=None):
+    """A latest/archive page listing (year, page_name) thumbnails."""
+    thumbs = ''.join(
+        f'<div class="minimal_thumb"><a href="../{year}/{name}.html">'
+        f'<img src="../{year}/posters/{name}_tn.jpg"></a></div>'
+        for year, name in entries
+    )
+    older = f'<a href=" {older_page}">older</a>' if older_page else ''
+    return _wrap('Latest Movie Posters - IMP Awards', f'{thumbs}<p>{older}</p>')
+
+
+def year_index(year, page_names):
+    """A YEAR/std.html index: every poster is linked twice (image and text)."""
+    rows = ''.join(
+        f'<td><a href="{name}.html"><img src="posters/{name}_tn.jpg"></a><br>'
+        f'<a href="{name}.html">{name.replace("_", " ").title()}</a></td>'
+        for name in page_names
+    )
+    nav = ''.join(f'<a href="alpha{n}.html">{n}</a> ' for n in range(1, 10))
+    return _wrap(f'{year} Movie Posters - IMP Awards', f'<p>{nav}<a href="std.html">all</a></p><table><tr>{rows}</tr></table>')
+
+
+def sample_corpus(seed=1):
+    """Return a list of (kind, url, html bytes) covering each page type."""
+    rng = random.Random(seed)
+    corpus = []
+    for n in range(20):
+        slug = slug_name(n)
+        variant = rng.randint(1, 4)
+        sizes = rng.choice(SIZE_CHOICES)
+        page = slug if variant == 1 else f"{slug}_ver{variant}"
+        url = f"http://www.impawards.com/2024/{page}.html"
+        html = poster_page(2024, slug, variant, total=4, imdb_id=imdb_id_for(n), sizes=sizes)
+        corpus.append(('poster', url, html.encode('latin-1')))
+    entries = [(2024, slug_name(n)) for n in range(50)]
+    corpus.append(('archive', 'http://www.impawards.com/archives/latest.html',
+                   archive_page(entries, 'page1637.html').encode('latin-1')))
+    names = [slug_name(n) for n in range(3000)]
+    corpus.append(('index', 'http://www.impawards.com/2024/std.html',
+                   year_index(2024, names).encode('latin-1')))
+    return corpus
+
+
+def jpeg_bytes(target_bytes, width=600, height=900):
+    """
+    A decodable JPEG of roughly ``target_bytes``.
+
+    A small gradient image is encoded once and padded with COM segments,
+    which decoders skip, so large images cost no encoding time.
+    """
+    from PIL import Image
+
+    image = Image.new('RGB', (width, height))
+    image.putdata([((x * 255) // width, (y * 255) // height, 128)
+                   for y in range(height) for x in range(width)])
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=80)
+    encoded = buffer.getvalue()
+    padding = []
+    remaining = target_bytes - len(encoded)
+    while remaining > 4:
+        chunk = min(remaining - 4, 65533)
+        padding.append(b'\xff\xfe' + (chunk + 2).to_bytes(2, 'big') + b'\0' * chunk)
+        remaining -= chunk + 4
+    # Comments go right after the SOI marker
+    return encoded[:2] + b''.join(padding) + encoded[2:]
+
+
+class FixtureSite:
+    """
+    Deterministic catalog of movies, poster pages and TMDb records.
+
+    Movies get 1-``max_variants`` poster pages each and are spread over
+    ``first_year``..``last_year``; the archive lists every poster page
+    newest first, ``per_page`` to a page. Every ``missing_every``-th movie
+    is unknown to TMDb.
+    """
+
+    def __init__(self, posters=1000, first_year=2015, last_year=2025, per_page=50,
+                 max_variants=4, image_kb=200, missing_every=50, seed=1):
+        rng = random.Random(seed)
+        self.per_page = per_page
+        self.image_kb = image_kb
+        self.movies = []
+        self.pages = {}
+        self.by_year = {year: [] for year in range(first_year, last_year + 1)}
+        order = []
+        years = list(self.by_year)
+        n = 0
+        while len(order) < posters:
+            year = years[n % len(years)]
+            total = min(rng.randint(1, max_variants), posters - len(order))
+            movie = {
+                'n': n,
+                'year': year,
+                'slug': slug_name(n),
+                'total': total,
+                'sizes': rng.choice(SIZE_CHOICES),
+                'imdb_id': imdb_id_for(n),
+                'tmdb_id': None if missing_every and n % missing_every == missing_every - 1 else n + 1,
+                'release_date': f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                'genre_ids': rng.sample(GENRE_POOL, rng.randint(1, 3))
+            }
+            self.movies.append(movie)
+            for variant in range(1, total + 1):
+                name = movie['slug'] if variant == 1 else f"{movie['slug']}_ver{variant}"
+                self.pages[(year, name)] = (movie, variant)
+                self.by_year[year].append(name)
+                order.append((year, name))
+            n += 1
+        self.archive = list(reversed(order))
+        self.last_page = max(1, -(-len(self.archive) // per_page))
+        self.by_imdb = {movie['imdb_id']: movie for movie in self.movies}
+        self._images = {}
+        self._images_lock = threading.Lock()
+
+    def archive_html(self, number):
+        """Archive page ``number`` (the newest page is ``last_page``)."""
+        if not 1 <= number <= self.last_page:
+            return None
+        start = (self.last_page - number) * self.per_page
+        older = f"page{number - 1}.html" if number > 1 else None
+        return archive_page(self.archive[start:start + self.per_page], older)
+
+    def year_html(self, year):
+        names = self.by_year.get(year)
+        return year_index(year, names) if names else None
+
+    def poster_html(self, year, name):
+        found = self.pages.get((year, name))
+        if found is None:
+            return None
+        movie, variant = found
+        return poster_page(year, movie['slug'], variant, movie['total'], movie['imdb_id'], movie['sizes'])
+
+    def image(self, size):
+        with self._images_lock:
+            if size not in self._images:
+                self._images[size] = jpeg_bytes(int(self.image_kb * 1024 * SIZE_SCALE[size]))
+            return self._images[size]
+
+    def tmdb_find(self, imdb_id):
+        movie = self.by_imdb.get(imdb_id)
+        results = []
+        if movie and movie['tmdb_id']:
+            results.append({'id': movie['tmdb_id'], 'title': movie['slug'].replace('_', ' ').title(),
+                            'release_date': movie['release_date'], 'genre_ids': movie['genre_ids']})
+        return {'movie_results': results, 'tv_results': [], 'person_results': []}
+
+    def tmdb_movie(self, tmdb_id):
+        if not 1 <= tmdb_id <= len(self.movies):
+            return None
+        movie = self.movies[tmdb_id - 1]
+        if movie['tmdb_id'] != tmdb_id:
+            return None
+        return {'id': tmdb_id, 'imdb_id': movie['imdb_id'],
+                'title': movie['slug'].replace('_', ' ').title(),
+                'release_date': movie['release_date'],
+                'genres': [{'id': gid, 'name': GENRE_LABELS[gid]} for gid in movie['genre_ids']]}
+
+
+ARCHIVE_RE = re.compile(r'^/archives/(?:latest|page(\d+))\.html$')
+YEAR_INDEX_RE = re.compile(r'^/(\d{4})/std\.html$')
+IMAGE_RE = re.compile(r'^/(\d{4})/posters/[\w-]+?_(tn|lg|xlg|xxlg|xxxlg)\.jpg$')
+POSTER_RE = re.compile(r'^/(\d{4})/([\w-]+)\.html$')
+TMDB_FIND_RE = re.compile(r'^/3/find/(tt\d+)$')
+TMDB_MOVIE_RE = re.compile(r'^/3/movie/(\d+)$')
+
+
+class Faults:
+    """Latency, jitter, 5xx and 429 injection shared by all handler threads."""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, throttle_rate=0.0,
+                 retry_after=1, seed=1):
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self):
+        if not (self.latency or self.jitter):
+            return 0.0
+        with self._lock:
+            return max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+    def injected_status(self):
+        """503, 429 or None for the next request."""
+        if not (self.error_rate or self.throttle_rate):
+            return None
+        with self._lock:
+            roll = self._rng.random()
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 503
+        return None
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'ImpFixture/1.0'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        self._started = time.time()
+        path = self.path.split('?', 1)[0]
+        kind = 'tmdb' if path.startswith('/3/') else 'site'
+        if path == '/_stats':
+            self._send(200, json.dumps(server.snapshot()).encode('utf-8'), 'application/json', count=False)
+            return
+        delay = server.faults.delay()
+        if delay:
+            time.sleep(delay)
+        status = server.faults.injected_status()
+        if status == 429:
+            self._send(429, b'Too Many Requests', 'text/plain', kind=kind,
+                       headers={'Retry-After': str(server.faults.retry_after)})
+            return
+        if status:
+            self._send(status, b'Service Unavailable', 'text/plain', kind=kind)
+            return
+
+        kind, body, content_type = self._route(server.site, path)
+        if body is None:
+            self._send(404, b'Not Found', 'text/plain', kind=kind)
+            return
+        etag = None
+        if kind in ('archive', 'index'):
+            etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+            if self.headers.get('If-None-Match') == etag:
+                self._send(304, b'', content_type, kind=kind, headers={'ETag': etag})
+                return
+        self._send(200, body, content_type, kind=kind, headers={'ETag': etag} if etag else None)
+
+    def _route(self, site, path):
+        """Return (kind, body bytes or None, content type) for a path."""
+        match = ARCHIVE_RE.match(path)
+        if match:
+            html = site.archive_html(int(match.group(1)) if match.group(1) else site.last_page)
+            return 'archive', html and html.encode('latin-1'), 'text/html; charset=iso-8859-1'
+        match = YEAR_INDEX_RE.match(path)
+        if match:
+            html = site.year_html(int(match.group(1)))
+            return 'index', html and html.encode('latin-1'), 'text/html; charset=iso-8859-1'
+        match = IMAGE_RE.match(path)
+        if match:
+            return 'image', site.image(match.group(2)), 'image/jpeg'
+        match = POSTER_RE.match(path)
+        if match:
+            html = site.poster_html(int(match.group(1)), match.group(2))
+            return 'poster', html and html.encode('latin-1'), 'text/html; charset=iso-8859-1'
+        match = TMDB_FIND_RE.match(path)
+        if match:
+            return 'tmdb', json.dumps(site.tmdb_find(match.group(1))).encode('utf-8'), 'application/json'
+        match = TMDB_MOVIE_RE.match(path)
+        if match:
+            data = site.tmdb_movie(int(match.group(1)))
+            return 'tmdb', data and json.dumps(data).encode('utf-8'), 'application/json'
+        return 'other', None, 'text/plain'
+
+    def _send(self, status, body, content_type, kind='other', headers=None, count=True):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+        if count:
+            self.server.count(kind, status, len(body), self.path.split('?', 1)[0], self._started)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """Threaded HTTP server for a FixtureSite; usable in-process by benchmarks."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, site, faults=None, host='127.0.0.1', port=0, record_timeline=False):
+        super().__init__((host, port), FixtureHandler)
+        self.site = site
+        self.faults = faults or Faults()
+        self.requests = Counter()
+        self.statuses = Counter()
+        self.bytes_sent = 0
+        # path -> [first request start, last response end] (wall clock)
+        self.timeline = {} if record_timeline else None
+        self._stats_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, kind, status, size, path=None, started=None):
+        finished = time.time()
+        with self._stats_lock:
+            self.requests[kind] += 1
+            self.statuses[str(status)] += 1
+            self.bytes_sent += size
+            if self.timeline is not None and path:
+                self.timeline.setdefault(path, [started, finished])[1] = finished
+
+    def snapshot(self):
+        with self._stats_lock:
+            return {'requests': dict(self.requests), 'statuses': dict(self.statuses),
+                    'bytes_sent': self.bytes_sent}
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.requests.clear()
+            self.statuses.clear()
+            self.bytes_sent = 0
+            if self.timeline is not None:
+                self.timeline = {}
+
+    def start(self):
+        """Serve on a background thread; returns self."""
+        self._thread = threading.Thread(target=self.serve_forever, name='fixture-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def fixture_config(base_url, data_dir='.'):
+    """config.yaml overrides pointing poster_downloader.py at a fixture server."""
+    return {
+        'site': {'base_url': base_url, 'latest_url': f"{base_url}/archives/latest.html"},
+        'tmdb': {'base_url': f"{base_url}/3", 'requests_per_second': 1000},
+        'http': {'requests_per_second': 1000, 'retry_delay_seconds': 0.2},
+        'files': {
+            'movie_metadata': os.path.join(data_dir, 'movie_metadata.json'),
+            'email_tracking': os.path.join(data_dir, 'email_tracking.json'),
+            'digest_state': os.path.join(data_dir, 'digest_state.json'),
+            'failed_jobs': os.path.join(data_dir, 'failed_jobs.json'),
+            'downloads_dir': os.path.join(data_dir, 'downloads')
+        },
+        'cache': {'dir': os.path.join(data_dir, 'cache')},
+        'queue': {'dir': os.path.join(data_dir, 'job_queue')}
+    }
+
+
+def write_config(directory, base_url):
+    """Write ``config.yaml`` for a fixture run into ``directory``; returns its path."""
+    import yaml
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, 'config.yaml')
+    with open(path, 'w', encoding='utf-8') as fh:
+        yaml.safe_dump(fixture_config(base_url, os.path.abspath(directory)), fh, sort_keys=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a synthetic IMP Awards site and TMDb API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--posters', type=int, default=10000, help='Poster pages in the archive (default: 10000)')
+    parser.add_argument('--first-year', type=int, default=2015)
+    parser.add_argument('--last-year', type=int, default=2025)
+    parser.add_argument('--per-page', type=int, default=50, help='Thumbnails per archive page (default: 50)')
+    parser.add_argument('--image-kb', type=float, default=200, help='Size of xlg images in KiB; other sizes scale (default: 200)')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Delay added to every response')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='Random +/- variation on the delay')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 503')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with 429s (default: 1)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--write-config', metavar='DIR',
+                        help='Write a config.yaml pointing poster_downloader.py at this server into DIR')
+    args = parser.parse_args()
+
+    site = FixtureSite(args.posters, args.first_year, args.last_year, args.per_page,
+                       image_kb=args.image_kb, seed=args.seed)
+    faults = Faults(args.latency_ms, args.jitter_ms, args.error_rate, args.throttle_rate,
+                    args.retry_after, seed=args.seed)
+    server = FixtureServer(site, faults, args.host, args.port)
+    print(f"✓ Serving {len(site.archive)} poster pages ({len(site.movies)} movies, "
+          f"{site.last_page} archive pages) at {server.base_url}")
+    if args.write_config:
+        print(f"✓ Wrote {write_config(args.write_config, server.base_url)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\nℹ️  {json.dumps(server.snapshot())}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
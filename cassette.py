@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Record/replay HTTP cassettes for offline runs and repeatable benchmarks.
+
+``--record DIR`` mounts ``RecordingAdapter`` on the downloader's session, so
+every impawards.com and TMDb response (pages, indexes, images, API JSON) is
+written to DIR while the run proceeds normally. ``--replay DIR`` mounts
+``ReplayAdapter`` instead: the same crawl is served entirely from DIR with no
+network access, optionally with injected latency to mimic a real link.
+
+Layout of a cassette directory::
+
+    index.jsonl              one line per response: key, status, headers, body digest
+    bodies/ab/abcdef...      content-addressed bodies (text compressed with zlib)
+
+Responses are keyed by method and URL with the query string sorted and the
+TMDb ``api_key`` removed, so cassettes hold no secrets and replay works with
+any key.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from http.client import responses as HTTP_REASONS
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+INDEX_FILE = 'index.jsonl'
+BODIES_DIR = 'bodies'
+
+# Query parameters never written to a cassette.
+REDACTED_PARAMS = {'api_key'}
+
+# Response headers worth keeping (validators and content metadata).
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Retry-After')
+
+
+def request_key(method: str, url: str) -> str:
+    """Stable cassette key: method plus URL with a sorted, redacted query."""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in REDACTED_PARAMS)
+    return f"{method.upper()} {urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))}"
+
+
+def _is_text(content_type: Optional[str]) -> bool:
+    content_type = (content_type or '').lower()
+    return content_type.startswith('text/') or 'json' in content_type or 'xml' in content_type
+
+
+class Cassette:
+    """On-disk archive of responses; safe to use from several threads."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        entries: Dict[str, Dict] = {}
+        if not os.path.exists(self.index_path):
+            return entries
+        with open(self.index_path, 'r', encoding='utf-8') as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                previous = entries.get(entry['key'])
+                # Keep a full response over a later 304 so replay can serve both
+                if previous and previous['status'] == 200 and entry['status'] == 304:
+                    continue
+                entries[entry['key']] = entry
+        return entries
+
+    def _body_path(self, digest: str) -> str:
+        return os.path.join(self.directory, BODIES_DIR, digest[:2], digest)
+
+    def record(self, key: str, status: int, headers, body: bytes) -> None:
+        kept = {name: headers[name] for name in KEPT_HEADERS if name in headers}
+        digest = hashlib.sha1(body).hexdigest()
+        compressed = _is_text(kept.get('Content-Type'))
+        entry = {'key': key, 'status': status, 'headers': kept, 'body': digest, 'zlib': compressed}
+        path = self._body_path(digest)
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as fh:
+                    fh.write(zlib.compress(body) if compressed else body)
+            with open(self.index_path, 'a', encoding='utf-8') as fh:
+                fh.write(json.dumps(entry) + '\n')
+            previous = self.entries.get(key)
+            if not (previous and previous['status'] == 200 and status == 304):
+                self.entries[key] = entry
+
+    def lookup(self, key: str) -> Optional[Tuple[Dict, bytes]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        with open(self._body_path(entry['body']), 'rb') as fh:
+            body = fh.read()
+        return entry, (zlib.decompress(body) if entry.get('zlib') else body)
+
+
+def _build_response(request, status: int, headers: Dict, body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response.headers['Content-Length'] = str(len(body))
+    response.raw = io.BytesIO(body)
+    response.url = request.url
+    response.request = request
+    response.reason = HTTP_REASONS.get(status, '')
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter that performs real requests and records each response."""
+
+    def __init__(self, cassette: Cassette, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        # Reading the body here leaves it cached on the response, so
+        # streaming callers can still iterate over it afterwards.
+        body = response.content
+        self.cassette.record(request_key(request.method, request.url), response.status_code, response.headers, body)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter that serves responses from a cassette, never the network."""
+
+    def __init__(self, cassette: Cassette, latency_ms: float = 0, jitter_ms: float = 0) -> None:
+        super().__init__()
+        self.cassette = cassette
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.served = 0
+        self.missing = 0
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        if self.latency or self.jitter:
+            time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+        found = self.cassette.lookup(request_key(request.method, request.url))
+        if found is None:
+            with self._lock:
+                self.missing += 1
+            raise requests.ConnectionError(f"Not in cassette: {request_key(request.method, request.url)}", request=request)
+        entry, body = found
+        with self._lock:
+            self.served += 1
+        etag = entry['headers'].get('ETag')
+        if entry['status'] == 200 and etag and request.headers.get('If-None-Match') == etag:
+            return _build_response(request, 304, entry['headers'], b'')
+        return _build_response(request, entry['status'], entry['headers'], body)
+
+    def close(self) -> None:
+        pass
+
+
+def mount_cassette(session: requests.Session, mode: str, directory: str, latency_ms: float = 0,
+                   jitter_ms: float = 0, pool_maxsize: int = 10):
+    """
+    Mount a recording or replaying adapter for http:// and https:// on a session.
+
+    Args:
+        session: requests.Session to patch
+        mode: 'record' or 'replay'
+        directory: Cassette directory (created when recording)
+        latency_ms: Replay only: fixed delay added to every response
+        jitter_ms: Replay only: random +/- variation on that delay
+        pool_maxsize: Connection pool size for the recording adapter
+
+    Returns:
+        The mounted adapter
+    """
+    if mode == 'record':
+        os.makedirs(directory, exist_ok=True)
+        adapter = RecordingAdapter(Cassette(directory), pool_connections=4, pool_maxsize=pool_maxsize)
+    elif mode == 'replay':
+        if not os.path.exists(os.path.join(directory, INDEX_FILE)):
+            raise FileNotFoundError(f"No cassette found in {directory}")
+        adapter = ReplayAdapter(Cassette(directory), latency_ms=latency_ms, jitter_ms=jitter_ms)
+    else:
+        raise ValueError(f"Unknown cassette mode: {mode}")
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return adapter
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Concurrent streaming pipeline for poster processing.
+
+Poster URLs are streamed from a discovery generator through a chain of
+stages (fetch -> enrich -> download) connected by bounded queues. Large runs
+start downloading as soon as the first archive page is parsed, and memory
+stays constant however many pages or years are crawled.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import events
+from tracing import NULL_TRACER
+
+# Outcome keys shared with the batch summaries.
+OUTCOMES = ('downloaded', 'already_downloaded', 'skipped', 'errors')
+
+# Sentinel telling a stage worker that its input is exhausted.
+_DONE = object()
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration in seconds as a compact ``1h02m`` / ``3m05s`` string."""
+    seconds = int(max(0, seconds))
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{secs}s"
+
+
+class ProgressReporter:
+    """Thread-safe throughput (posters/sec) and ETA tracking."""
+
+    def __init__(self, expected: int = 0, report_interval: float = 10.0) -> None:
+        self.expected = expected
+        self.discovered = 0
+        self.completed = 0
+        self.report_interval = report_interval
+        self.started_at = time.monotonic()
+        self._last_report = self.started_at
+        self._lock = threading.Lock()
+
+    @property
+    def total(self) -> int:
+        """Best known total: announced up front or discovered so far."""
+        return max(self.expected, self.discovered)
+
+    def add_expected(self, count: int) -> None:
+        """Announce items that are known to be coming (e.g. a loaded index)."""
+        with self._lock:
+            self.expected += count
+
+    def add_discovered(self, count: int = 1) -> None:
+        with self._lock:
+            self.discovered += count
+
+    def advance(self, count: int = 1) -> None:
+        with self._lock:
+            self.completed += count
+
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def eta_seconds(self) -> Optional[float]:
+        rate = self.rate()
+        if rate <= 0:
+            return None
+        return max(0, self.total - self.completed) / rate
+
+    def summary(self) -> str:
+        eta = self.eta_seconds()
+        eta_text = format_duration(eta) if eta is not None else '--'
+        return (f"{self.completed}/{self.total} posters • "
+                f"{self.rate():.2f} posters/sec • ETA {eta_text}")
+
+    def maybe_report(self) -> None:
+        """Redraw the live progress line, or emit a progress event at most once per report interval."""
+        if events.progress(f"⏱  {self.summary()}"):
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_report < self.report_interval:
+                return
+            self._last_report = now
+        eta = self.eta_seconds()
+        events.notice('progress', f"\n⏱  Progress: {self.summary()}", completed=self.completed, total=self.total,
+                      rate=round(self.rate(), 3), eta_seconds=round(eta) if eta is not None else None)
+
+
+class Stage:
+    """One pipeline stage: a function applied to each job by a pool of threads."""
+
+    def __init__(self, name: str, func: Callable[[Dict], bool], workers: int = 1) -> None:
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+
+
+def run_pipeline(
+    source: Iterable,
+    stages: List[Stage],
+    queue_size: int = 8,
+    progress: Optional[ProgressReporter] = None,
+    on_complete: Optional[Callable[[Dict], None]] = None,
+    tracer=None
+) -> Dict[str, int]:
+    """
+    Stream URLs from ``source`` through a chain of stages.
+
+    Each URL becomes a job dict (``{'index': n, 'url': url}``) that flows
+    through the stages over bounded queues, so discovery, fetching and
+    downloading overlap and memory stays constant regardless of how many
+    URLs the source yields. A stage function returns True to pass the job on;
+    returning False (or reaching the last stage) completes the job, which
+    should then carry an ``'outcome'`` from OUTCOMES. Exceptions complete the
+    job with outcome ``'errors'``.
+
+    The source may also yield partially processed job dicts (for example pages
+    fetched ahead of time); they enter the first stage as they are, and jobs
+    that already carry an outcome complete without running any stage.
+
+    Args:
+        source: Iterable (usually a lazy generator) of poster URLs or job dicts
+        stages: Ordered list of Stage objects
+        queue_size: Capacity of each inter-stage queue
+        progress: Optional ProgressReporter updated as jobs finish
+        on_complete: Optional callback(job) run for every completed job
+        tracer: Optional Tracer; each job gets a poster span with one child
+            span per stage
+
+    Returns:
+        dict: Count per outcome plus 'total'
+    """
+    tracer = tracer or NULL_TRACER
+    stats = {outcome: 0 for outcome in OUTCOMES}
+    stats['total'] = 0
+    lock = threading.Lock()
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize=max(1, queue_size)) for _ in stages]
+    remaining = [stage.workers for stage in stages]
+
+    def finish(job: Dict) -> None:
+        outcome = job.get('outcome')
+        with lock:
+            stats[outcome if outcome in stats else 'skipped'] += 1
+        tracer.end_job(job)
+        if on_complete:
+            on_complete(job)
+        if progress:
+            progress.advance()
+            progress.maybe_report()
+
+    def feed() -> None:
+        try:
+            for index, item in enumerate(source):
+                if stop.is_set():
+                    break
+                with lock:
+                    stats['total'] += 1
+                if progress:
+                    progress.add_discovered()
+                job = dict(item) if isinstance(item, dict) else {'url': item}
+                job['index'] = index
+                tracer.begin_job(job)
+                if 'outcome' in job:
+                    finish(job)
+                else:
+                    queues[0].put(job)
+        except Exception as exc:
+            events.error('discovery_failed', f"✗ Error discovering posters: {exc}", error=str(exc))
+        finally:
+            for _ in range(stages[0].workers):
+                queues[0].put(_DONE)
+
+    def work(position: int) -> None:
+        stage = stages[position]
+        inbox = queues[position]
+        is_last = position == len(stages) - 1
+        while True:
+            job = inbox.get()
+            if job is _DONE:
+                break
+            if stop.is_set():
+                continue  # Drain without processing after an interrupt
+            try:
+                with tracer.span(f"stage:{stage.name}", poster=job['url'], parent=job.get('trace_id')) as span:
+                    forward = stage.func(job)
+                    span.set(outcome=job.get('outcome', 'ok'))
+            except Exception as exc:
+                events.error('poster_failed', f"✗ Error processing poster ({stage.name}): {exc}",
+                             url=job['url'], stage=stage.name, error=str(exc))
+                job['outcome'] = 'errors'
+                job['error'] = str(exc)
+                job['exception'] = exc
+                forward = False
+            if forward and not is_last:
+                queues[position + 1].put(job)
+            else:
+                finish(job)
+        with lock:
+            remaining[position] -= 1
+            last_worker = remaining[position] == 0
+        if last_worker and not is_last:
+            for _ in range(stages[position + 1].workers):
+                queues[position + 1].put(_DONE)
+
+    threads = [threading.Thread(target=feed, name='pipeline-feed', daemon=True)]
+    for position, stage in enumerate(stages):
+        for n in range(stage.workers):
+            threads.append(threading.Thread(
+                target=work, args=(position,), name=f"pipeline-{stage.name}-{n}", daemon=True
+            ))
+    for thread in threads:
+        thread.start()
+
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.2)
+    except KeyboardInterrupt:
+        events.warning('interrupted', "\n\n✗ Interrupted by user; finishing in-flight posters")
+        stop.set()
+        for thread in threads:
+            thread.join()
+    if progress:
+        events.end_progress()
+    return stats
@@ -19,9 +19,11 @@ from pathlib import Path
 from dotenv import load_dotenv
 from PIL import Image
 import io
-import yaml
 from typing import List, Dict, Optional, Tuple, Any
 
+from settings import get_config
+from tracing import NULL_TRACER
+
 # Load environment variables
 load_dotenv()
 
@@ -29,55 +31,23 @@ load_dotenv()
 # CONFIGURATION LOADING
 # ============================================================
 
-CONFIG_FILE = 'config.yaml'
-
-def load_config():
-    """Load unified configuration from config.yaml"""
-    default_config = {
-        'files': {
-            'email_tracking': 'email_tracking.json'
-        },
-        'email': {
-            'max_size_mb': 40,
-            'thumbnail_max_width': 800,
-            'jpeg_quality': 85,
-            'max_retries': 3,
-            'retry_delay_seconds': 5
-        }
-    }
-    
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, 'r') as f:
-                user_config = yaml.safe_load(f) or {}
-                # Merge with defaults
-                for key, value in user_config.items():
-                    if isinstance(value, dict) and key in default_config:
-                        default_config[key].update(value)
-                    else:
-                        default_config[key] = value
-        except Exception as e:
-            print(f"Warning: Could not load {CONFIG_FILE}: {e}, using defaults")
-    
-    return default_config
-
-CONFIG = load_config()
+CONFIG = get_config()
 
 # Email tracking file
-EMAIL_TRACKING_FILE = CONFIG['files']['email_tracking']
+EMAIL_TRACKING_FILE = CONFIG.files.email_tracking
 
 # Email configuration (from config.yaml, env vars used for secrets)
 DEFAULT_SMTP_SERVER = 'smtp.gmail.com'
 DEFAULT_SMTP_PORT = 587
-DEFAULT_MAX_SIZE_MB = CONFIG['email']['max_size_mb']
+DEFAULT_MAX_SIZE_MB = CONFIG.email.max_size_mb
 
 # Image settings (from config.yaml)
-THUMBNAIL_MAX_WIDTH = CONFIG['email']['thumbnail_max_width']
-JPEG_QUALITY = CONFIG['email']['jpeg_quality']
+THUMBNAIL_MAX_WIDTH = CONFIG.email.thumbnail_max_width
+JPEG_QUALITY = CONFIG.email.jpeg_quality
 
 # Retry settings (from config.yaml)
-MAX_EMAIL_RETRIES = CONFIG['email']['max_retries']
-EMAIL_RETRY_DELAY = CONFIG['email']['retry_delay_seconds']
+MAX_EMAIL_RETRIES = CONFIG.email.max_retries
+EMAIL_RETRY_DELAY = CONFIG.email.retry_delay_seconds
 
 # ============================================================
 # LOGGING
@@ -96,8 +66,20 @@ logger = logging.getLogger(__name__)
 class EmailSender:
     """Handles email notifications for newly downloaded posters."""
     
-    def __init__(self):
-        """Initialize email sender with configuration from environment variables."""
+    def __init__(self, timings=None, tracer=None):
+        """
+        Initialize email sender with configuration from environment variables.
+        
+        Args:
+            timings: Optional StageTimings; SMTP attempts (failed ones included)
+                are recorded under 'smtp'
+            tracer: Optional Tracer; each SMTP attempt is written as an 'email' span
+        """
+        self.timings = timings
+        self.tracer = tracer or NULL_TRACER
+        self.batches_sent = 0
+        self.batches_failed = 0
+        self.attempts_failed = 0
         self.smtp_server = os.getenv('SMTP_SERVER', DEFAULT_SMTP_SERVER)
         self.smtp_port = int(os.getenv('SMTP_PORT', str(DEFAULT_SMTP_PORT)))
         self.username = os.getenv('SMTP_USERNAME', '')
@@ -406,9 +388,11 @@ class EmailSender:
                 msg.attach(MIMEText(html_body, 'html'))
                 
                 # Attach thumbnails as inline images
+                payload_bytes = len(html_body)
                 for i, poster_file in enumerate(poster_files):
                     thumbnail_data = self.create_thumbnail(poster_file)
                     if thumbnail_data:
+                        payload_bytes += len(thumbnail_data)
                         image = MIMEImage(thumbnail_data)
                         image.add_header('Content-ID', f'<poster{i}>')
                         image.add_header('Content-Disposition', 'inline')
@@ -419,10 +403,23 @@ class EmailSender:
                 logger.info(f"  To: {self.email_to}")
                 logger.info(f"  Subject: {subject}")
                 
-                with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30) as server:
-                    server.starttls()
-                    server.login(self.username, self.password)
-                    server.send_message(msg)
+                # Failed and timed-out attempts are timed too: they are the
+                # outliers the 'smtp' histogram is there to show
+                started = time.perf_counter()
+                try:
+                    with self.tracer.span('email', batch=batch_num, posters=poster_count,
+                                          attempt=attempt, bytes=payload_bytes):
+                        with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30) as server:
+                            server.starttls()
+                            server.login(self.username, self.password)
+                            server.send_message(msg)
+                except Exception:
+                    self.attempts_failed += 1
+                    raise
+                finally:
+                    if self.timings is not None:
+                        self.timings.record('smtp', time.perf_counter() - started)
+                self.batches_sent += 1
                 
                 logger.info(f"  ✓ Email sent successfully!")
                 return True
@@ -440,6 +437,7 @@ class EmailSender:
                     logger.error("  2. For Gmail, use an App Password (not your regular password)")
                     logger.error("  3. Verify SMTP_SERVER and SMTP_PORT are correct")
                     logger.error("  4. Check your internet connection")
+                    self.batches_failed += 1
                     return False
         
         return False
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Background TMDb enrichment for downloaded posters.
+
+When no genre is blocked in ``config.yaml`` and no ``--genre`` filter is
+given, genres are only descriptive metadata, so the download path skips the
+two TMDb round trips per poster. Such movies are queued here instead and
+resolved off the critical path by a single background thread; results are
+merged into the movie metadata store as they arrive.
+
+``--enrich`` (``enrich_store``) catches up on everything else: store entries
+still missing a release date, TMDb ID or genres because TMDb failed or no API
+key was set at download time.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Set
+
+import events
+
+# Sentinel telling the worker thread to exit.
+_STOP = object()
+
+
+class BackgroundEnricher:
+    """Resolves TMDb metadata for queued movies on a daemon thread."""
+
+    def __init__(self, fetch_metadata: Callable[[str], Dict], store) -> None:
+        self.fetch_metadata = fetch_metadata
+        self.store = store
+        self.enriched = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._seen: Set[str] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, movie_key: str, imdb_id: str) -> None:
+        """Queue a stored movie for enrichment (once per IMDb ID per run)."""
+        with self._lock:
+            if imdb_id in self._seen:
+                return
+            self._seen.add(imdb_id)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='tmdb-enricher', daemon=True)
+                self._thread.start()
+        self._queue.put((movie_key, imdb_id))
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            movie_key, imdb_id = item
+            try:
+                metadata = self.fetch_metadata(imdb_id)
+            except Exception as exc:
+                events.warning('enrich_failed', f"  Warning: Background enrichment failed for {imdb_id}: {exc}", imdb_id=imdb_id, error=str(exc))
+                continue
+            if not metadata.get('tmdb_id'):
+                continue
+            self.store.update_movie(movie_key, {
+                'movie_title': metadata.get('title'),
+                'release_date': metadata.get('release_date'),
+                'genres': metadata.get('genres') or [],
+                'imdb_id': imdb_id,
+                'tmdb_id': metadata.get('tmdb_id')
+            })
+            self.enriched += 1
+
+    def close(self) -> None:
+        """Finish every queued lookup, then stop the worker thread."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        remaining = self.pending()
+        if remaining:
+            events.info('enrich_draining', f"\nℹ️  Finishing background TMDb enrichment ({remaining} movie(s) queued)...", queued=remaining)
+        self._queue.put(_STOP)
+        thread.join()
+        if self.enriched:
+            events.notice('enrich_finished', f"✓ Enriched {self.enriched} movie(s) with TMDb metadata", enriched=self.enriched)
+
+
+# Store fields that --enrich fills in from TMDb.
+ENRICH_FIELDS = ('release_date', 'tmdb_id', 'genres')
+
+
+def find_incomplete(data: Dict[str, Dict]) -> Dict[str, List[str]]:
+    """
+    Group store entries missing any ENRICH_FIELDS by IMDb ID.
+
+    Returns:
+        dict: imdb_id -> list of movie keys (entries without an IMDb ID are
+        left out; TMDb lookups need one)
+    """
+    pending: Dict[str, List[str]] = {}
+    for movie_key, entry in data.items():
+        if all(entry.get(field) for field in ENRICH_FIELDS):
+            continue
+        imdb_id = entry.get('imdb_id')
+        if imdb_id:
+            pending.setdefault(imdb_id, []).append(movie_key)
+    return pending
+
+
+def enrich_store(store, client, workers: int = 4, checkpoint_every: int = 50) -> Dict[str, int]:
+    """
+    Fill in missing TMDb metadata for every incomplete store entry.
+
+    Lookups run concurrently through the client's rate limit and cache; the
+    cache is checkpointed as results arrive so an interrupted run resumes
+    where it stopped, and the store is written back in a single flush.
+    Running it again is a no-op apart from entries TMDb cannot resolve,
+    which are answered from the cache.
+
+    Args:
+        store: MovieMetadataStore
+        client: TmdbClient
+        workers: Concurrent lookups
+        checkpoint_every: Save the TMDb cache after this many lookups
+
+    Returns:
+        dict: Counts for 'incomplete', 'resolved', 'not_found', 'errors'
+    """
+    pending = find_incomplete(store.data)
+    stats = {'incomplete': sum(len(keys) for keys in pending.values()),
+             'resolved': 0, 'not_found': 0, 'errors': 0}
+    if not pending:
+        return stats
+
+    def resolve(imdb_id):
+        try:
+            return imdb_id, client.lookup(imdb_id), None
+        except Exception as exc:
+            return imdb_id, None, exc
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(resolve, imdb_id) for imdb_id in pending]
+        for done, future in enumerate(as_completed(futures), 1):
+            imdb_id, metadata, error = future.result()
+            if error is not None:
+                stats['errors'] += 1
+                events.warning('tmdb_lookup_failed', f"  Warning: TMDb lookup failed for {imdb_id}: {error}", imdb_id=imdb_id, error=str(error))
+            elif not metadata.get('tmdb_id'):
+                stats['not_found'] += 1
+            else:
+                for movie_key in pending[imdb_id]:
+                    store.update_movie(movie_key, {
+                        'release_date': metadata.get('release_date'),
+                        'genres': metadata.get('genres') or [],
+                        'imdb_id': imdb_id,
+                        'tmdb_id': metadata.get('tmdb_id')
+                    }, save=False)
+                    stats['resolved'] += 1
+            if client.cache is not None and done % checkpoint_every == 0:
+                client.cache.save()
+
+    if client.cache is not None:
+        client.cache.save()
+    if stats['resolved']:
+        store.save()
+    return stats
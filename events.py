@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Leveled, thread-safe console events for the downloader.
+
+Every message is emitted as an event with a level, a name and structured
+fields, and rendered in one of two ways:
+
+- text (default): the familiar emoji lines. ``--quiet`` hides per-poster
+  detail and run chatter, keeping notices (summaries, progress), warnings
+  and errors.
+- JSON (``--json-events``): one object per line, e.g.
+  ``{"ts": 1760000000.1, "level": "detail", "event": "image_saved",
+  "msg": "✓ Saved to: ...", "path": "...", "bytes": 123456}``.
+
+Batch progress is a single live line (redrawn in place, kept below other
+output) when text goes to a terminal, and a periodic progress event when
+it is piped to CI or a file. All writes go through one lock, so lines from
+concurrent pipeline workers never interleave.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import threading
+import time
+from typing import List, Optional
+
+DETAIL = 10   # Per-poster steps (fetching, parsing, saved to ...)
+INFO = 20     # Run milestones (pages crawled, batch started, ...)
+NOTICE = 25   # Summaries and progress; still shown with --quiet
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DETAIL: 'detail', INFO: 'info', NOTICE: 'notice', WARNING: 'warning', ERROR: 'error'}
+
+# Minimum seconds between redraws of the live progress line
+LIVE_REFRESH = 0.2
+
+
+class EventStream:
+    """
+    Renders events as text or JSON lines on one output stream.
+
+    Args:
+        stream: Output stream (default: sys.stdout at write time)
+        level: Lowest level written
+        json_events: Write JSON lines instead of text
+        live: Redraw progress in place (default: text output to a terminal)
+    """
+
+    def __init__(self, stream=None, level: int = DETAIL, json_events: bool = False,
+                 live: Optional[bool] = None) -> None:
+        self._stream = stream
+        self.level = level
+        self.json_events = json_events
+        if live is None:
+            isatty = getattr(self.stream, 'isatty', None)
+            live = bool(isatty and isatty()) and not json_events
+        self.live = live
+        self._lock = threading.Lock()
+        self._progress_line = ''
+        self._last_draw = 0.0
+
+    @property
+    def stream(self):
+        return self._stream or sys.stdout
+
+    def enabled(self, level: int) -> bool:
+        return level >= self.level
+
+    def _clear_progress(self) -> None:
+        if self._progress_line:
+            self.stream.write('\r\x1b[K')
+
+    def _draw_progress(self) -> None:
+        if self._progress_line:
+            self.stream.write(f"\r{self._progress_line}\x1b[K")
+            self.stream.flush()
+
+    def emit(self, level: int, event: str, message: str = '', **fields) -> None:
+        """Write one event if its level is enabled."""
+        if level < self.level:
+            return
+        if self.json_events:
+            record = {'ts': round(time.time(), 3), 'level': LEVEL_NAMES.get(level, str(level)), 'event': event}
+            if message:
+                record['msg'] = message.strip()
+            record.update(fields)
+            text = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+        else:
+            text = message + '\n'
+        with self._lock:
+            self._clear_progress()
+            self.stream.write(text)
+            self._draw_progress()
+
+    def progress(self, line: str) -> bool:
+        """
+        Show the live progress line (terminal text output only).
+
+        Returns:
+            bool: False when there is no live line; callers then emit a
+            periodic 'progress' event instead
+        """
+        if not self.live:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_draw < LIVE_REFRESH and self._progress_line:
+                self._progress_line = line
+                return True
+            self._last_draw = now
+            self._progress_line = line
+            self._draw_progress()
+        return True
+
+    def end_progress(self) -> None:
+        """Remove the live progress line (the final summary replaces it)."""
+        with self._lock:
+            self._clear_progress()
+            self._progress_line = ''
+            self.stream.flush()
+
+
+class EventLogHandler(logging.Handler):
+    """Routes stdlib logging records (e.g. email_sender) into the event stream."""
+
+    LEVELS = {logging.DEBUG: DETAIL, logging.INFO: INFO, logging.WARNING: WARNING,
+              logging.ERROR: ERROR, logging.CRITICAL: ERROR}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = record.getMessage()
+        except Exception:
+            self.handleError(record)
+            return
+        level = self.LEVELS.get(record.levelno, INFO)
+        _stream.emit(level, 'log', message, logger=record.name)
+
+
+_stream = EventStream()
+
+
+def configure(quiet: bool = False, json_events: bool = False, stream=None) -> EventStream:
+    """
+    Select the output mode for this process.
+
+    Args:
+        quiet: Only notices (summaries, progress), warnings and errors
+        json_events: One JSON object per line instead of text
+        stream: Output stream (default: sys.stdout)
+
+    Returns:
+        EventStream: The active stream
+    """
+    global _stream
+    _stream = EventStream(stream=stream, level=NOTICE if quiet else DETAIL, json_events=json_events)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(EventLogHandler())
+    root.setLevel(logging.WARNING if quiet else logging.INFO)
+    return _stream
+
+
+def get_stream() -> EventStream:
+    return _stream
+
+
+def emit(level: int, event: str, message: str = '', **fields) -> None:
+    _stream.emit(level, event, message, **fields)
+
+
+def detail(event: str, message: str = '', **fields) -> None:
+    _stream.emit(DETAIL, event, message, **fields)
+
+
+def info(event: str, message: str = '', **fields) -> None:
+    _stream.emit(INFO, event, message, **fields)
+
+
+def notice(event: str, message: str = '', **fields) -> None:
+    _stream.emit(NOTICE, event, message, **fields)
+
+
+def warning(event: str, message: str = '', **fields) -> None:
+    _stream.emit(WARNING, event, message, **fields)
+
+
+def error(event: str, message: str = '', **fields) -> None:
+    _stream.emit(ERROR, event, message, **fields)
+
+
+def block(level: int, event: str, lines: List[str], **fields) -> None:
+    """Emit a multi-line block (a summary) as one event, so it is never split by other output."""
+    _stream.emit(level, event, '\n'.join(lines), **fields)
+
+
+def progress(line: str) -> bool:
+    return _stream.progress(line)
+
+
+def end_progress() -> None:
+    _stream.end_progress()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Persisted queue of posters that failed after all in-run retries.
+
+Batch runs record every poster that ends in an error here. The next batch
+run drains the posters that are due before crawling anything new, so a
+transient site hiccup no longer means re-crawling a whole year to pick up a
+handful of missing posters. Each further failure pushes the next attempt
+back exponentially (with jitter); posters that keep failing are dropped
+after ``max_attempts`` runs.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, List
+
+import events
+
+
+class FailedJobStore:
+    """JSON file mapping poster URL -> failure record."""
+
+    def __init__(self, path: str, retry_delay_minutes: float = 15, max_attempts: int = 8,
+                 max_delay_hours: float = 24) -> None:
+        self.path = path
+        self.retry_delay = retry_delay_minutes * 60
+        self.max_delay = max_delay_hours * 3600
+        self.max_attempts = max(1, max_attempts)
+        self._lock = threading.Lock()
+        self.data: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self.data)
+
+    def due(self, now: float = None) -> List[str]:
+        """URLs whose next attempt time has passed, oldest failure first."""
+        now = time.time() if now is None else now
+        with self._lock:
+            ready = [(record.get('first_failed_at', 0), url) for url, record in self.data.items()
+                     if record.get('next_attempt_at', 0) <= now]
+        return [url for _, url in sorted(ready)]
+
+    def record_failure(self, url: str, error: str) -> bool:
+        """
+        Record a failed poster and schedule its next attempt.
+
+        Returns:
+            bool: False if the poster ran out of attempts and was dropped
+        """
+        now = time.time()
+        with self._lock:
+            record = self.data.get(url) or {'first_failed_at': now, 'attempts': 0}
+            record['attempts'] += 1
+            record['last_error'] = error
+            record['last_failed_at'] = now
+            if record['attempts'] >= self.max_attempts:
+                self.data.pop(url, None)
+                return False
+            step = min(self.max_delay, self.retry_delay * (2 ** (record['attempts'] - 1)))
+            record['next_attempt_at'] = now + random.uniform(step / 2, step)
+            self.data[url] = record
+            return True
+
+    def resolve(self, url: str) -> bool:
+        """Forget a poster that has now been processed; True if it was queued."""
+        with self._lock:
+            return self.data.pop(url, None) is not None
+
+    def save(self) -> None:
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as fh:
+                    json.dump(self.data, fh, indent=2)
+                os.replace(tmp_path, self.path)
+            except OSError as exc:
+                events.warning('save_failed', f"  Warning: Could not save {self.path}: {exc}", path=self.path, error=str(exc))
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Persisted negative cache of genre decisions.
+
+When the genre blocklist or a ``--genre`` filter rejects a movie, the
+decision is recorded per movie (``YEAR/slug``, shared by every ``_verN``
+variant) so later runs can skip its posters before fetching the page or
+calling TMDb.
+
+Decisions are grouped under a fingerprint of the settings that produced
+them: the blocked genres from ``config.yaml`` plus the ``--genre`` filter.
+Blocklist rejections apply whatever the filter, so they are shared by every
+run; filter rejections only apply to runs with the same filter. Every group
+recorded under an older blocklist is discarded as soon as the ``genres:``
+section changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import events
+
+
+def blocklist_fingerprint(genre_config: Dict) -> str:
+    """Digest of the blocked genre names in a ``genres:`` config section."""
+    blocked = sorted(
+        name for name, setting in (genre_config or {}).items()
+        if isinstance(setting, dict) and not setting.get('allow', True)
+    )
+    return hashlib.sha1(json.dumps(blocked).encode('utf-8')).hexdigest()[:12]
+
+
+def filter_key(required_genres: Optional[Iterable[str]]) -> str:
+    """Order- and case-insensitive key for a ``--genre`` filter."""
+    return ','.join(sorted({genre.lower() for genre in required_genres or []}))
+
+
+class GenreDecisionCache:
+    """
+    Records movies rejected by genre rules, per settings fingerprint.
+
+    New decisions are written every ``save_every`` rejections or
+    ``save_interval`` seconds, whichever comes first, and by save() at the
+    end of the run; each write merges and rewrites the whole file.
+    """
+
+    def __init__(self, path: str, genre_config: Dict, save_every: int = 50, save_interval: float = 30.0) -> None:
+        self.path = path
+        self.blocklist = blocklist_fingerprint(genre_config)
+        self.save_every = max(1, save_every)
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self.data: Dict[str, Dict[str, Dict]] = self._load()
+        self.hits = 0
+        self.misses = 0
+        self._unsaved = 0
+        self._last_save = time.monotonic()
+
+    def _load(self) -> Dict[str, Dict[str, Dict]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        # Drop decisions made under a different blocklist
+        return {
+            key: movies for key, movies in data.items()
+            if key.split('|', 1)[0] == self.blocklist and isinstance(movies, dict)
+        }
+
+    def _key(self, required_genres) -> str:
+        return f"{self.blocklist}|{filter_key(required_genres)}"
+
+    @staticmethod
+    def movie_key(year, slug) -> str:
+        return f"{year}/{slug}"
+
+    def get(self, year, slug, required_genres=None) -> Optional[Dict]:
+        """Return the recorded rejection for a movie under the current settings."""
+        movie = self.movie_key(year, slug)
+        with self._lock:
+            decision = self.data.get(self._key(None), {}).get(movie)
+            if decision is None and required_genres:
+                decision = self.data.get(self._key(required_genres), {}).get(movie)
+            if decision is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return decision
+
+    def record(self, year, slug, required_genres, reason: str, genres: List[str]) -> None:
+        """Remember that a movie was rejected ('blocked' or 'filtered')."""
+        if reason == 'blocked':
+            required_genres = None
+        decision = {
+            'reason': reason,
+            'genres': list(genres),
+            'decided_at': time.time()
+        }
+        with self._lock:
+            self.data.setdefault(self._key(required_genres), {})[self.movie_key(year, slug)] = decision
+            self._unsaved += 1
+            if (self._unsaved >= self.save_every
+                    or time.monotonic() - self._last_save >= self.save_interval):
+                self._save()
+
+    def save(self) -> None:
+        """Write decisions recorded since the last save."""
+        with self._lock:
+            if self._unsaved:
+                self._save()
+
+    def _save(self) -> None:
+        self._unsaved = 0
+        self._last_save = time.monotonic()
+        # Merge with decisions other processes wrote since we loaded
+        merged = self._load()
+        for key, movies in self.data.items():
+            merged.setdefault(key, {}).update(movies)
+        self.data = merged
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as fh:
+                json.dump(self.data, fh)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            events.warning('save_failed', f"  Warning: Could not save {self.path}: {exc}", path=self.path, error=str(exc))
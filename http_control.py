@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Per-host request governance: rate limits, adaptive concurrency and retries.
+
+Every outgoing request goes through ``HttpGovernor``, which keeps one
+``HostLimiter`` per host (impawards.com, api.themoviedb.org, ...). A limiter
+combines:
+
+- a token bucket capping the request rate for that host, and
+- an AIMD concurrency window: the number of requests allowed in flight grows
+  additively while latency stays near its baseline and is halved on 429s,
+  5xx responses or timeouts, which also pause the host for a cooldown.
+
+Throttled and failed requests are retried according to a ``RetryPolicy``
+for their request class (archive/index pages, poster pages, images, TMDb):
+jittered exponential delays starting at ``http.retry_delay_seconds`` for up
+to ``http.max_retries`` retries, with per-class overrides. The retry delay
+doubles as the host cooldown, so other threads hold off too.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from rate_limiter import TokenBucket
+from tracing import NULL_TRACER
+
+OK = 'ok'
+THROTTLED = 'throttled'
+SERVER_ERROR = 'server_error'
+TIMEOUT = 'timeout'
+
+# Outcomes that trigger a backoff (and a retry).
+BACKOFF_OUTCOMES = (THROTTLED, SERVER_ERROR, TIMEOUT)
+
+MAX_COOLDOWN_SECONDS = 60.0
+
+# Request classes with their own retry policy.
+REQUEST_CLASSES = ('index', 'page', 'image', 'tmdb')
+
+
+def classify(response) -> str:
+    """Controller outcome for a completed response."""
+    if response.status_code == 429:
+        return THROTTLED
+    if response.status_code >= 500:
+        return SERVER_ERROR
+    return OK
+
+
+def retry_after_seconds(response) -> Optional[float]:
+    """Numeric Retry-After header value, if any."""
+    if response is None:
+        return None
+    value = response.headers.get('Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RetryPolicy:
+    """Jittered exponential backoff for one request class."""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 2.0,
+                 max_delay: float = MAX_COOLDOWN_SECONDS, jitter: bool = True) -> None:
+        self.max_retries = max(0, int(max_retries))
+        self.base_delay = max(0.0, float(base_delay))
+        self.max_delay = float(max_delay)
+        self.jitter = jitter
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait before retry number ``attempt + 1``.
+
+        A server-provided Retry-After wins; otherwise the delay doubles per
+        attempt up to max_delay, with "equal jitter" (50-100% of the step)
+        so concurrent workers do not retry in lockstep.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        step = min(self.max_delay, self.base_delay * (2 ** attempt))
+        if self.jitter:
+            return random.uniform(step / 2, step)
+        return step
+
+
+class HostLimiter:
+    """Token bucket plus AIMD concurrency window for a single host."""
+
+    def __init__(
+        self,
+        host: str,
+        requests_per_second: float,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        retry_delay: float = 2.0,
+        adaptive: bool = True
+    ) -> None:
+        self.host = host
+        self.bucket = TokenBucket(requests_per_second)
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.retry_delay = retry_delay
+        self.adaptive = adaptive
+        # Start in the middle of the window and let AIMD find the level
+        self.limit = float(self.max_concurrency if not adaptive else max(self.min_concurrency, self.max_concurrency // 2))
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.backoffs = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self.timeouts = 0
+        self.fast_latency: Optional[float] = None
+        self.slow_latency: Optional[float] = None
+        self.cooldown_until = 0.0
+        self._consecutive_backoffs = 0
+        self._first_request: Optional[float] = None
+        self._cond = threading.Condition()
+
+    def acquire(self) -> float:
+        """Wait for a concurrency slot and a rate token; returns the start time."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if now < self.cooldown_until:
+                    self._cond.wait(self.cooldown_until - now)
+                elif self.in_flight >= int(self.limit):
+                    self._cond.wait(0.5)
+                else:
+                    break
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            if self._first_request is None:
+                self._first_request = now
+        self.bucket.acquire()
+        return time.monotonic()
+
+    def release(self, started: float, outcome: str, retry_after: Optional[float] = None) -> None:
+        latency = time.monotonic() - started
+        with self._cond:
+            self.in_flight -= 1
+            self.requests += 1
+            if outcome in BACKOFF_OUTCOMES:
+                self._back_off(outcome, retry_after)
+            else:
+                self._consecutive_backoffs = 0
+                self._observe(latency)
+            self._cond.notify_all()
+
+    def _back_off(self, outcome: str, retry_after: Optional[float]) -> None:
+        self.backoffs += 1
+        if outcome == THROTTLED:
+            self.throttled += 1
+        elif outcome == SERVER_ERROR:
+            self.server_errors += 1
+        else:
+            self.timeouts += 1
+        if self.adaptive:
+            self.limit = max(float(self.min_concurrency), self.limit / 2)
+        delay = retry_after if retry_after is not None else min(
+            MAX_COOLDOWN_SECONDS, self.retry_delay * (2 ** self._consecutive_backoffs)
+        )
+        self._consecutive_backoffs += 1
+        self.cooldown_until = max(self.cooldown_until, time.monotonic() + delay)
+
+    def _observe(self, latency: float) -> None:
+        # Fast EWMA tracks current latency, slow EWMA is the baseline
+        self.fast_latency = latency if self.fast_latency is None else 0.7 * self.fast_latency + 0.3 * latency
+        self.slow_latency = latency if self.slow_latency is None else 0.95 * self.slow_latency + 0.05 * latency
+        if self.adaptive and self.fast_latency <= self.slow_latency * 1.5:
+            self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+
+    def rate(self) -> float:
+        if self._first_request is None:
+            return 0.0
+        elapsed = time.monotonic() - self._first_request
+        return self.requests / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        latency = f"{self.fast_latency * 1000:.0f}ms" if self.fast_latency is not None else '--'
+        return (f"{self.host}: {self.requests} req • {self.rate():.1f} req/s • "
+                f"in flight {self.in_flight} (peak {self.peak_in_flight}, limit {int(self.limit)}) • "
+                f"latency {latency} • backoffs {self.backoffs} "
+                f"(429: {self.throttled}, 5xx: {self.server_errors}, timeouts: {self.timeouts})")
+
+
+def bytes_read(response: requests.Response) -> Optional[int]:
+    """Body bytes read from the connection so far (None if the transport cannot tell)."""
+    try:
+        return response.raw.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+class HttpGovernor:
+    """Routes requests through per-host limiters with retries on backoff."""
+
+    def __init__(
+        self,
+        session: requests.Session,
+        timeout: float = 30,
+        max_retries: int = 3,
+        retry_delay: float = 2.0,
+        default_rate: float = 5.0,
+        host_rates: Optional[Dict[str, float]] = None,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        adaptive: bool = True,
+        policies: Optional[Dict[str, RetryPolicy]] = None,
+        tracer=None
+    ) -> None:
+        self.session = session
+        self.tracer = tracer or NULL_TRACER
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+        self.default_policy = RetryPolicy(max_retries, retry_delay)
+        self.policies = policies or {}
+        self.retries: Counter = Counter()
+        self.requests: Counter = Counter()
+        self.default_rate = default_rate
+        self.host_rates = host_rates or {}
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.adaptive = adaptive
+        self._limiters: Dict[str, HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, url: str) -> HostLimiter:
+        host = urlparse(url).hostname or ''
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = HostLimiter(
+                    host,
+                    self.host_rates.get(host, self.default_rate),
+                    max_concurrency=self.max_concurrency,
+                    min_concurrency=self.min_concurrency,
+                    retry_delay=self.retry_delay,
+                    adaptive=self.adaptive
+                )
+                self._limiters[host] = limiter
+            return limiter
+
+    def policy(self, request_class: str) -> RetryPolicy:
+        return self.policies.get(request_class, self.default_policy)
+
+    def _count(self, counter: Counter, request_class: str) -> None:
+        # Counter += is a read-modify-write; worker threads share the governor
+        with self._lock:
+            counter[request_class] += 1
+
+    @contextmanager
+    def stream(self, url: str, request_class: str = 'page', **kwargs):
+        """
+        Streaming GET; the host slot is held until the body has been consumed.
+
+        Args:
+            url: Request URL
+            request_class: One of REQUEST_CLASSES (selects the retry policy)
+            **kwargs: Passed to requests (headers, params, timeout)
+
+        Yields:
+            requests.Response (the last attempt when retries are exhausted)
+        """
+        limiter = self.limiter(url)
+        policy = self.policy(request_class)
+        timeout = kwargs.pop('timeout', self.timeout)
+        with self.tracer.span('http', url=url, host=limiter.host, request_class=request_class) as span:
+            for attempt in range(policy.max_retries + 1):
+                can_retry = attempt < policy.max_retries
+                started = limiter.acquire()
+                self._count(self.requests, request_class)
+                span.set(attempts=attempt + 1)
+                try:
+                    response = self.session.get(url, stream=True, timeout=timeout, **kwargs)
+                except (requests.Timeout, requests.ConnectionError):
+                    limiter.release(started, TIMEOUT, policy.delay(attempt))
+                    if can_retry:
+                        self._count(self.retries, request_class)
+                        continue
+                    raise
+                except Exception:
+                    limiter.release(started, OK)
+                    raise
+                outcome = classify(response)
+                delay = policy.delay(attempt, retry_after_seconds(response)) if outcome in BACKOFF_OUTCOMES else None
+                if delay is not None and can_retry:
+                    response.close()
+                    limiter.release(started, outcome, delay)
+                    self._count(self.retries, request_class)
+                    continue
+                try:
+                    yield response
+                finally:
+                    if span.id is not None:
+                        span.set(status=response.status_code, bytes=bytes_read(response),
+                                 outcome='ok' if response.status_code < 400 else 'error')
+                    response.close()
+                    limiter.release(started, outcome, delay)
+                return
+
+    def get(self, url: str, request_class: str = 'page', **kwargs) -> requests.Response:
+        """GET with the body read while the host slot is held."""
+        with self.stream(url, request_class=request_class, **kwargs) as response:
+            _ = response.content  # Read the body while the host slot is held
+            return response
+
+    def summary_lines(self) -> List[str]:
+        with self._lock:
+            limiters = list(self._limiters.values())
+            retry_counts = sorted(self.retries.items())
+        lines = [limiter.summary() for limiter in limiters if limiter.requests]
+        if retry_counts:
+            retries = ', '.join(f"{name} {count}" for name, count in retry_counts)
+            lines.append(f"retries: {retries}")
+        return lines
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Shared, filesystem-backed job queue for multi-process poster workers.
+
+Jobs are small JSON files that move between state directories with atomic
+renames, so several worker processes (possibly on different machines that
+share the queue directory) can pull work without a central server:
+
+    pending/  ->  leased/  ->  done/
+                     |
+                     +---->  failed/   (after max_attempts)
+
+A claimed job holds a time-limited lease. Workers refresh the lease while
+they work; if a worker dies, its lease expires and the job is returned to
+``pending/`` for another worker to pick up. Each lease carries a random
+token in its file name (``leased/<job>.<token>.json``), so a worker whose
+lease expired can never complete or fail the job after someone else has
+leased it again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import secrets
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+STATES = ('pending', 'leased', 'done', 'failed')
+
+
+def default_worker_id() -> str:
+    """Return an identifier that is unique per process across hosts."""
+    import socket
+
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class Job:
+    """
+    A single claimed job and the lease file backing it.
+
+    ``name`` is the job's file name outside leased/; ``path`` is this
+    worker's lease file, whose name includes the lease token.
+    """
+
+    def __init__(self, name: str, path: str, payload: Dict) -> None:
+        self.name = name
+        self.path = path
+        self.payload = payload
+
+    @property
+    def url(self) -> Optional[str]:
+        return self.payload.get('url')
+
+    @property
+    def attempts(self) -> int:
+        return int(self.payload.get('attempts', 0))
+
+
+class LeasedJobQueue:
+    """Directory-based job queue using atomic renames and mtime leases."""
+
+    def __init__(self, root: str, lease_seconds: int = 300, max_attempts: int = 3) -> None:
+        self.root = root
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        for state in STATES:
+            os.makedirs(self._dir(state), exist_ok=True)
+
+    # --------------------------------------------------------------------- #
+    # Path helpers
+    # --------------------------------------------------------------------- #
+
+    def _dir(self, state: str) -> str:
+        return os.path.join(self.root, state)
+
+    def _path(self, state: str, name: str) -> str:
+        return os.path.join(self._dir(state), name)
+
+    @staticmethod
+    def job_id(url: str) -> str:
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def _base_name(name: str) -> str:
+        """Job file name without the lease token: <seq>-<id>.<token>.json -> <seq>-<id>.json"""
+        return name[:-len('.json')].split('.', 1)[0] + '.json'
+
+    @classmethod
+    def _id_from_name(cls, name: str) -> str:
+        return cls._base_name(name).rsplit('-', 1)[-1][:-len('.json')]
+
+    def _names(self, state: str) -> List[str]:
+        try:
+            return sorted(n for n in os.listdir(self._dir(state)) if n.endswith('.json'))
+        except FileNotFoundError:
+            return []
+
+    @staticmethod
+    def _write_json(path: str, payload: Dict) -> None:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(payload, fh)
+        os.replace(tmp_path, path)
+
+    # --------------------------------------------------------------------- #
+    # Producer side
+    # --------------------------------------------------------------------- #
+
+    def enqueue(self, urls: Iterable[str], kind: str = 'poster') -> int:
+        """
+        Add poster URLs to the queue, skipping ones already known in any state.
+
+        Jobs are claimed in enqueue order.
+
+        Returns:
+            int: Number of newly queued jobs
+        """
+        known = set()
+        for state in STATES:
+            known.update(self._id_from_name(n) for n in self._names(state))
+
+        added = 0
+        base_seq = time.time_ns()
+        for offset, url in enumerate(urls):
+            job_id = self.job_id(url)
+            if job_id in known:
+                continue
+            known.add(job_id)
+            name = f"{base_seq + offset:020d}-{job_id}.json"
+            payload = {
+                'id': job_id,
+                'kind': kind,
+                'url': url,
+                'attempts': 0,
+                'enqueued_at': time.time(),
+                'last_error': None
+            }
+            self._write_json(self._path('pending', name), payload)
+            added += 1
+        return added
+
+    # --------------------------------------------------------------------- #
+    # Worker side
+    # --------------------------------------------------------------------- #
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        """Lease the oldest pending job, or return None when nothing is pending."""
+        self.reclaim_expired()
+        for name in self._names('pending'):
+            pending_path = self._path('pending', name)
+            leased_path = self._path('leased', f"{name[:-len('.json')]}.{secrets.token_hex(6)}.json")
+            try:
+                # Touch first so the lease clock starts before the job is
+                # visible in leased/; rename() is atomic, so exactly one
+                # worker wins each job.
+                os.utime(pending_path)
+                os.rename(pending_path, leased_path)
+            except (FileNotFoundError, FileExistsError):
+                continue
+            try:
+                with open(leased_path, 'r', encoding='utf-8') as fh:
+                    payload = json.load(fh)
+            except ValueError:
+                # Corrupt payload: no worker can ever process it
+                self._move(leased_path, self._path('failed', name))
+                continue
+            except OSError:
+                self._move(leased_path, pending_path)
+                continue
+            payload['worker'] = worker_id
+            payload['leased_at'] = time.time()
+            self._write_json(leased_path, payload)
+            return Job(name, leased_path, payload)
+        return None
+
+    def heartbeat(self, job: Job) -> bool:
+        """Extend the lease on a job. Returns False if the lease was lost."""
+        try:
+            os.utime(job.path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def _move(source: str, target: str) -> bool:
+        try:
+            os.rename(source, target)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def complete(self, job: Job) -> bool:
+        """
+        Move a job to done/.
+
+        Returns:
+            bool: False if the lease was lost (it expired and the job went
+            back to pending/, possibly leased again by another worker)
+        """
+        return self._move(job.path, self._path('done', job.name))
+
+    def release(self, job: Job) -> None:
+        """Give a job back without counting an attempt (e.g. on shutdown)."""
+        self._move(job.path, self._path('pending', job.name))
+
+    def fail(self, job: Job, error: str) -> bool:
+        """
+        Record a failed attempt and requeue the job if attempts remain.
+
+        Returns:
+            bool: True if the job was requeued, False if moved to failed/
+        """
+        payload = dict(job.payload)
+        payload['attempts'] = job.attempts + 1
+        payload['last_error'] = error
+        target_state = 'pending' if payload['attempts'] < self.max_attempts else 'failed'
+        # Take the lease file out of leased/ first: the rename only succeeds
+        # while we still own the lease, and reclaim_expired() ignores it
+        # while the payload is rewritten
+        failing_path = f"{job.path[:-len('.json')]}.failing"
+        if not self._move(job.path, failing_path):
+            return False
+        self._write_json(failing_path, payload)
+        os.rename(failing_path, self._path(target_state, job.name))
+        return target_state == 'pending'
+
+    def reclaim_expired(self) -> int:
+        """Return jobs whose lease has expired to the pending state."""
+        now = time.time()
+        reclaimed = 0
+        for name in self._names('leased'):
+            leased_path = self._path('leased', name)
+            try:
+                if os.path.getmtime(leased_path) + self.lease_seconds > now:
+                    continue
+                os.rename(leased_path, self._path('pending', self._base_name(name)))
+                reclaimed += 1
+            except FileNotFoundError:
+                continue
+        return reclaimed
+
+    # --------------------------------------------------------------------- #
+    # Introspection
+    # --------------------------------------------------------------------- #
+
+    def counts(self) -> Dict[str, int]:
+        return {state: len(self._names(state)) for state in STATES}
+
+    def is_drained(self) -> bool:
+        """True when no job is pending or currently leased."""
+        return not self._names('pending') and not self._names('leased')
+
+
+class LeaseKeeper:
+    """
+    Background thread that keeps job leases alive while a job is processed.
+
+    Extra jobs (finished ones waiting to be completed) are kept alive too.
+    """
+
+    def __init__(self, queue: LeasedJobQueue, job: Job, *held: Job) -> None:
+        self.queue = queue
+        self.job = job
+        self.jobs = (job,) + held
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        interval = max(1.0, self.queue.lease_seconds / 3.0)
+        while not self._stop.wait(interval):
+            alive = [job for job in self.jobs if self.queue.heartbeat(job)]
+            if not alive:
+                return
+
+    def __enter__(self) -> 'LeaseKeeper':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
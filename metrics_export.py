@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Prometheus exposition-format metrics for cron and CI runs.
+
+At the end of a batch or digest run the downloader's counters are rendered
+as Prometheus text and written to a node_exporter textfile-collector path
+(``metrics.textfile``) and/or PUT to a Pushgateway-style endpoint
+(``metrics.push_url``). Every sample carries a ``mode`` label (latest, year,
+digest, ...) so dashboards can track each cron job separately.
+
+Each mode writes its own file (``imp_awards.prom`` -> ``imp_awards_digest.prom``)
+and pushes to its own ``/mode/<mode>`` group, so a digest run never replaces
+the last ``latest`` run's metrics. Values describe the last run of that mode
+and are exported as gauges (``imp_run_*``); they start from zero every run,
+which Prometheus counters must not do.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+import events
+from stage_timings import BUCKET_BOUNDS, StageTimings
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Outcome keys of a batch stats dict, exported as imp_posters_total{outcome=...}.
+POSTER_OUTCOMES = ('downloaded', 'already_downloaded', 'skipped', 'errors')
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class MetricsText:
+    """Builder for one exposition-format document."""
+
+    def __init__(self, prefix: str = 'imp_', common: Optional[Dict[str, str]] = None) -> None:
+        self.prefix = prefix
+        self.common = common or {}
+        self._families: Dict[str, Tuple[str, str, List[str]]] = {}
+
+    def _family(self, name: str, kind: str, help_text: str) -> List[str]:
+        name = self.prefix + name
+        if name not in self._families:
+            self._families[name] = (kind, help_text, [])
+        return self._families[name][2]
+
+    def sample(self, name: str, kind: str, help_text: str, value: float, **labels) -> None:
+        self._family(name, kind, help_text).append(
+            f"{self.prefix}{name}{_labels({**self.common, **labels})} {_number(value)}"
+        )
+
+    def counter(self, name: str, help_text: str, value: float, **labels) -> None:
+        self.sample(name, 'counter', help_text, value, **labels)
+
+    def gauge(self, name: str, help_text: str, value: float, **labels) -> None:
+        self.sample(name, 'gauge', help_text, value, **labels)
+
+    def gauge_histogram(self, name: str, help_text: str, buckets: List[Tuple[float, int]],
+                        total: float, count: int, **labels) -> None:
+        """
+        Add a histogram of one run from (upper bound, per-bucket count) pairs.
+
+        The cumulative ``_bucket``/``_sum``/``_count`` series are gauges (a
+        histogram's series are counters), so histogram_quantile() still works
+        on the ``le`` buckets.
+        """
+        cumulative = 0
+        for bound, bucket_count in buckets:
+            cumulative += bucket_count
+            self.gauge(f"{name}_bucket", f"{help_text} Cumulative bucket counts.", cumulative,
+                       **labels, le=_number(float(bound)))
+        self.gauge(f"{name}_sum", f"{help_text} Sum of observations.", total, **labels)
+        self.gauge(f"{name}_count", f"{help_text} Number of observations.", count, **labels)
+
+    def render(self) -> str:
+        out = []
+        for name, (kind, help_text, lines) in self._families.items():
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(lines)
+        return '\n'.join(out) + '\n'
+
+
+def add_stage_histograms(metrics: MetricsText, timings: StageTimings) -> None:
+    bounds = list(BUCKET_BOUNDS) + [float('inf')]
+    for stage, data in timings.stages.items():
+        metrics.gauge_histogram('run_stage_duration_seconds',
+                                'Time spent per pipeline stage in the last run (one observation per poster).',
+                                list(zip(bounds, data.buckets)), data.total, data.count, stage=stage)
+
+
+def add_cache_ratio(metrics: MetricsText, cache: str, hits: int, misses: int) -> None:
+    metrics.gauge('run_cache_hits', 'Lookups answered from a local cache in the last run.', hits, cache=cache)
+    metrics.gauge('run_cache_misses', 'Lookups that needed the network or a fresh parse in the last run.', misses, cache=cache)
+    if hits + misses:
+        metrics.gauge('cache_hit_ratio', 'Cache hits / (hits + misses) for the run.', hits / (hits + misses), cache=cache)
+
+
+def build_run_metrics(downloader, mode: str, duration: float, succeeded: bool = True) -> str:
+    """
+    Render the counters of a finished run.
+
+    Args:
+        downloader: PosterDownloader whose run_stats, http, tmdb, caches and
+            timings are exported
+        mode: Run mode label (latest, year, movie, backfill, digest, ...)
+        duration: Wall-clock seconds of the run
+        succeeded: False if the run raised
+
+    Returns:
+        str: Prometheus exposition-format text
+    """
+    metrics = MetricsText(common={'mode': mode})
+    stats = downloader.run_stats
+    now = time.time()
+
+    metrics.gauge('run_duration_seconds', 'Wall-clock duration of the last run.', duration)
+    metrics.gauge('run_last_timestamp_seconds', 'Unix time the last run finished.', now)
+    metrics.gauge('run_success', '1 if the last run completed without an exception.', 1 if succeeded else 0)
+    if succeeded:
+        metrics.gauge('run_last_success_timestamp_seconds', 'Unix time of the last successful run.', now)
+
+    for outcome in POSTER_OUTCOMES:
+        metrics.gauge('run_posters', 'Posters processed in the last run by outcome.', stats.get(outcome, 0), outcome=outcome)
+    metrics.gauge('run_bytes_downloaded', 'Image bytes written to disk in the last run.', stats.get('bytes_downloaded', 0))
+
+    for request_class, count in sorted(downloader.http.requests.items()):
+        metrics.gauge('run_http_requests', 'HTTP attempts in the last run by request class (retries included).',
+                      count, request_class=request_class)
+    pages = downloader.http.requests.get('index', 0) + downloader.http.requests.get('page', 0)
+    metrics.gauge('run_pages_fetched', 'Archive, year-index and poster page requests in the last run.', pages)
+    for request_class, count in sorted(downloader.http.retries.items()):
+        metrics.gauge('run_http_retries', 'Retried HTTP requests in the last run by request class.',
+                      count, request_class=request_class)
+
+    for endpoint, count in sorted(downloader.tmdb.endpoint_requests.items()):
+        metrics.gauge('run_tmdb_requests', 'TMDb API requests in the last run by endpoint.', count, endpoint=endpoint)
+
+    finds = downloader.tmdb.endpoint_requests.get('find', 0)
+    demands = stats.get('tmdb_lookups', 0)
+    add_cache_ratio(metrics, 'tmdb', max(0, demands - finds), finds)
+    if downloader.parse_cache is not None:
+        add_cache_ratio(metrics, 'parse', downloader.parse_cache.hits, downloader.parse_cache.misses)
+    add_cache_ratio(metrics, 'genre_decisions', downloader.genre_decisions.hits, downloader.genre_decisions.misses)
+
+    if 'email_batches_sent' in stats or 'email_batches_failed' in stats:
+        metrics.gauge('run_email_batches', 'Digest email batches in the last run by result.',
+                      stats.get('email_batches_sent', 0), result='sent')
+        metrics.gauge('run_email_batches', 'Digest email batches in the last run by result.',
+                      stats.get('email_batches_failed', 0), result='failed')
+        metrics.gauge('run_smtp_attempts_failed',
+                      'Failed or timed-out SMTP send attempts in the last run (retried ones included).',
+                      stats.get('email_attempts_failed', 0))
+
+    add_stage_histograms(metrics, downloader.timings)
+    return metrics.render()
+
+
+def textfile_for_mode(path: str, mode: str) -> str:
+    """Per-mode textfile path: /dir/imp_awards.prom -> /dir/imp_awards_<mode>.prom"""
+    root, ext = os.path.splitext(path)
+    return f"{root}_{mode}{ext}"
+
+
+def push_url_for_mode(url: str, mode: str) -> str:
+    """Per-mode Pushgateway group: .../metrics/job/imp_awards -> .../metrics/job/imp_awards/mode/<mode>"""
+    return f"{url.rstrip('/')}/mode/{mode}"
+
+
+def write_textfile(path: str, text: str) -> None:
+    """Atomically replace a textfile-collector file (the collector must never see a partial file)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        fh.write(text)
+    os.replace(tmp_path, path)
+
+
+def push(url: str, text: str, timeout: float = 10) -> None:
+    """PUT the document to a Pushgateway-style endpoint (replaces the job's group)."""
+    response = requests.put(url, data=text.encode('utf-8'), headers={'Content-Type': CONTENT_TYPE}, timeout=timeout)
+    response.raise_for_status()
+
+
+def export_run_metrics(downloader, mode: str, duration: float, textfile: str = '', push_url: str = '',
+                       succeeded: bool = True) -> bool:
+    """
+    Write and/or push the run's metrics; failures are reported, never raised.
+
+    Args:
+        textfile: Configured textfile path; the mode is appended to its name
+        push_url: Configured Pushgateway URL; a ``mode`` grouping key is appended
+
+    Returns:
+        bool: True if every configured sink succeeded
+    """
+    if not (textfile or push_url):
+        return True
+    text = build_run_metrics(downloader, mode, duration, succeeded)
+    textfile = textfile and textfile_for_mode(textfile, mode)
+    push_url = push_url and push_url_for_mode(push_url, mode)
+    ok = True
+    if textfile:
+        try:
+            write_textfile(textfile, text)
+            events.notice('metrics_written', f"✓ Metrics written to {textfile}", path=textfile)
+        except OSError as exc:
+            ok = False
+            events.warning('metrics_failed', f"  Warning: Could not write metrics to {textfile}: {exc}", path=textfile, error=str(exc))
+    if push_url:
+        try:
+            push(push_url, text)
+            events.notice('metrics_pushed', f"✓ Metrics pushed to {push_url}", url=push_url)
+        except requests.RequestException as exc:
+            ok = False
+            events.warning('metrics_failed', f"  Warning: Could not push metrics to {push_url}: {exc}", url=push_url, error=str(exc))
+    return ok
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Local slug catalog for resolving every poster variant of a movie offline.
+
+Poster pages are named ``YEAR/<slug>.html`` with extra variants at
+``YEAR/<slug>_verN.html``. The catalog indexes the poster URLs already known
+locally (cached year indexes plus URLs seen on latest/archive pages) by
+``(year, slug)`` so ``--movie`` can list all variants without fetching the
+movie page, which does not always link every variant anyway.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from year_index_cache import YearIndexCache
+
+POSTER_URL_RE = re.compile(r'/(\d{4})/([^/]+?)(?:_ver(\d+))?\.html$')
+
+
+def split_poster_url(url: str) -> Optional[Tuple[str, str, int]]:
+    """
+    Split a poster page URL into (year, slug, variant number).
+
+    The base page is variant 1: ``2025/tron_ares_ver3.html`` -> ('2025', 'tron_ares', 3)
+    """
+    match = POSTER_URL_RE.search(url)
+    if not match:
+        return None
+    return match.group(1), match.group(2), int(match.group(3) or 1)
+
+
+class MovieCatalog:
+    """
+    In-memory (year, slug) -> variant URL index over locally cached pages.
+
+    URLs from archive pages are written to ``archive_path`` every
+    ``save_every`` pages that add something, and by save() at the end of the
+    run, rather than once per page.
+    """
+
+    def __init__(self, year_index_cache: YearIndexCache, archive_path: str, save_every: int = 25) -> None:
+        self.year_index_cache = year_index_cache
+        self.archive_path = archive_path
+        self.save_every = max(1, save_every)
+        self._archive: Dict[str, List[str]] = self._load_archive()
+        # Per-year membership sets alongside the ordered lists in _archive
+        self._archive_sets: Dict[str, Set[str]] = {year: set(urls) for year, urls in self._archive.items()}
+        self._unsaved_pages = 0
+        self._index: Dict[Tuple[str, str], Set[str]] = {}
+        self._loaded: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------------------------- #
+    # Persistence helpers
+    # --------------------------------------------------------------------- #
+
+    def _load_archive(self) -> Dict[str, List[str]]:
+        if os.path.exists(self.archive_path):
+            try:
+                with open(self.archive_path, 'r', encoding='utf-8') as fh:
+                    data = json.load(fh)
+                    if isinstance(data, dict):
+                        return data
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def _save_archive(self) -> None:
+        os.makedirs(os.path.dirname(self.archive_path) or '.', exist_ok=True)
+        tmp_path = f"{self.archive_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(self._archive, fh)
+        os.replace(tmp_path, self.archive_path)
+
+    # --------------------------------------------------------------------- #
+    # Indexing
+    # --------------------------------------------------------------------- #
+
+    def _index_urls(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            parts = split_poster_url(url)
+            if parts:
+                year, slug, _ = parts
+                self._index.setdefault((year, slug), set()).add(url)
+
+    def _ensure_year(self, year: str, base_url: Optional[str]) -> None:
+        """(Re)load a year's cached index into memory if it changed on disk."""
+        entry = self.year_index_cache.get(year, base_url=base_url)
+        fetched_at = entry.get('fetched_at', 0) if entry else 0
+        if year in self._loaded and self._loaded[year] >= fetched_at:
+            return
+        if entry:
+            self._index_urls(entry['urls'])
+        self._index_urls(self._archive.get(year, []))
+        self._loaded[year] = fetched_at
+
+    def add_archive_urls(self, urls: Iterable[str]) -> None:
+        """Record poster URLs discovered on one latest/archive page."""
+        added = []
+        with self._lock:
+            for url in urls:
+                parts = split_poster_url(url)
+                if not parts:
+                    continue
+                known = self._archive_sets.setdefault(parts[0], set())
+                if url not in known:
+                    known.add(url)
+                    self._archive.setdefault(parts[0], []).append(url)
+                    added.append(url)
+            if added:
+                self._index_urls(added)
+                self._unsaved_pages += 1
+                if self._unsaved_pages >= self.save_every:
+                    self._save_archive()
+                    self._unsaved_pages = 0
+
+    def save(self) -> None:
+        """Write archive URLs recorded since the last save."""
+        with self._lock:
+            if self._unsaved_pages:
+                self._save_archive()
+                self._unsaved_pages = 0
+
+    # --------------------------------------------------------------------- #
+    # Queries
+    # --------------------------------------------------------------------- #
+
+    def is_stale(self, year, base_url: Optional[str] = None) -> bool:
+        """True when the year's cached index is missing or past its TTL."""
+        entry = self.year_index_cache.get(year, base_url=base_url)
+        return entry is None or not self.year_index_cache.is_fresh(entry)
+
+    def variants(self, year, slug: str, base_url: Optional[str] = None) -> List[str]:
+        """Return every known variant page for a movie, base page first."""
+        year = str(year)
+        with self._lock:
+            self._ensure_year(year, base_url)
+            urls = self._index.get((year, slug), set())
+            if base_url:
+                urls = {url for url in urls if url.startswith(base_url)}
+        return sorted(urls, key=lambda url: split_poster_url(url)[2])
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Fast-path HTML extraction for IMP Awards pages using lxml.
+
+Building a BeautifulSoup tree and scanning it with ``find_all`` dominates CPU
+time on large pages. Callers fall back to BeautifulSoup whenever a fast-path
+lookup comes back empty, so unusual markup still works.
+
+Poster pages are small and need several lookups, so they are parsed with
+``lxml.html`` and queried with precompiled XPath expressions:
+
+- "other sizes" block: ``p.small`` containing "other sizes:" -> every ``a``
+- IMDb link:           first ``a`` whose href contains ``imdb.com/title/``
+- page title:          first ``<title>``
+
+Archive pages and ``YEAR/std.html`` indexes only need their anchors, and the
+year indexes grow to thousands of posters. Those are read with an
+incremental ``HTMLPullParser`` that only reports ``<a>``/``<div>`` events and
+drops each element once it has been handled, so no full DOM is ever built:
+
+- archive thumbnails:  ``div.minimal_thumb`` -> first ``a[href]``
+- "older" link:        first ``a[href]`` whose text contains "older"
+- index anchors:       every ``a[href]``
+"""
+
+from __future__ import annotations
+
+from typing import Iterator, List, Optional, Tuple
+
+import lxml.html
+from lxml import etree
+
+# Bump whenever extraction results change so cached parse records written by
+# an older parser (see parse_cache.py) are ignored.
+PARSER_VERSION = 1
+
+# Matches class="small" and class="foo small bar" alike, like
+# BeautifulSoup's class_ matching.
+_CLASS_TEST = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+
+SMALL_PARAGRAPHS = etree.XPath(f"//p[{_CLASS_TEST.format('small')}]")
+PARAGRAPH_LINKS = etree.XPath(".//a")
+IMDB_HREF = etree.XPath("(//a[contains(@href, 'imdb.com/title/')])[1]/@href")
+TITLE_TEXT = etree.XPath("(//title)[1]")
+
+# Bytes handed to the pull parser at a time.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Marker attribute set on a thumbnail div once its link has been taken.
+_TAKEN = '_imp_taken'
+
+
+def parse_document(content: bytes):
+    """
+    Parse raw HTML bytes into an lxml element tree.
+
+    Returns:
+        lxml.html.HtmlElement or None if the document can't be parsed
+    """
+    if not content:
+        return None
+    try:
+        return lxml.html.document_fromstring(content)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def page_title(doc) -> Optional[str]:
+    """Text of the first <title> element, or None."""
+    titles = TITLE_TEXT(doc)
+    if not titles:
+        return None
+    return titles[0].text_content()
+
+
+def other_size_links(doc) -> List[Tuple[str, str]]:
+    """
+    (href, link text) pairs from every ``p.small`` block containing "other sizes:".
+
+    Link text is returned stripped; callers decide which links carry dimensions.
+    """
+    links = []
+    for paragraph in SMALL_PARAGRAPHS(doc):
+        if 'other sizes:' not in paragraph.text_content():
+            continue
+        for link in PARAGRAPH_LINKS(paragraph):
+            links.append((link.get('href', ''), link.text_content().strip()))
+    return links
+
+
+def imdb_href(doc) -> Optional[str]:
+    """Raw href of the first IMDb title link, or None."""
+    hrefs = IMDB_HREF(doc)
+    return str(hrefs[0]) if hrefs else None
+
+
+# ------------------------------------------------------------------------- #
+# Streaming extraction (archive pages and year indexes)
+# ------------------------------------------------------------------------- #
+
+def _end_events(content: bytes, tags: Tuple[str, ...]) -> Iterator:
+    """Yield 'end' events for the given tags while feeding content in chunks."""
+    parser = etree.HTMLPullParser(events=('end',), tag=tags)
+    view = memoryview(content)
+    for offset in range(0, len(view), STREAM_CHUNK_SIZE):
+        parser.feed(bytes(view[offset:offset + STREAM_CHUNK_SIZE]))
+        for _, elem in parser.read_events():
+            yield elem
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        return
+    for _, elem in parser.read_events():
+        yield elem
+
+
+def _drop(elem) -> None:
+    """Free a handled element and every already-finished sibling before it."""
+    elem.clear()
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+def _has_class(elem, name: str) -> bool:
+    return name in (elem.get('class') or '').split()
+
+
+def _thumb_ancestor(elem):
+    parent = elem.getparent()
+    while parent is not None:
+        if parent.tag == 'div' and _has_class(parent, 'minimal_thumb'):
+            return parent
+        parent = parent.getparent()
+    return None
+
+
+def stream_anchor_hrefs(content: bytes) -> Iterator[str]:
+    """Yield every anchor href in document order without building a full DOM."""
+    if not content:
+        return
+    for elem in _end_events(content, ('a',)):
+        href = elem.get('href')
+        if href is not None:
+            yield href
+        _drop(elem)
+
+
+def stream_archive_links(content: bytes) -> Tuple[List[str], Optional[str]]:
+    """
+    Extract thumbnail links and the "older" link from a latest/archive page.
+
+    Returns:
+        tuple: (hrefs of the first link inside each ``div.minimal_thumb`` in
+        page order, relative URL of the "older" page such as 'page1637.html'
+        or None)
+    """
+    hrefs: List[str] = []
+    older = None
+    if not content:
+        return hrefs, older
+    for elem in _end_events(content, ('a', 'div')):
+        if elem.tag == 'a':
+            href = elem.get('href')
+            if href is not None:
+                thumb = _thumb_ancestor(elem)
+                if thumb is not None and thumb.get(_TAKEN) is None:
+                    hrefs.append(href)
+                    thumb.set(_TAKEN, '1')
+                if older is None and 'older' in ''.join(elem.itertext()).lower():
+                    candidate = href.strip()
+                    if 'page' in candidate and '.html' in candidate:
+                        older = candidate
+            if _thumb_ancestor(elem) is None:
+                _drop(elem)
+        elif _has_class(elem, 'minimal_thumb'):
+            _drop(elem)
+    return hrefs, older
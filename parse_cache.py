@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of parsed poster pages.
+
+Re-crawls fetch many poster pages whose HTML has not changed since the last
+run. Each parse result is stored as a compact record keyed by the page URL
+and a hash of the response body, so an identical page is served from the
+cache without building a DOM. Records carry the parser version
+(``page_parser.PARSER_VERSION``); bumping it invalidates every record
+written by an older parser.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+import events
+
+# Keys of a parse_poster_page() result that hold a resolution entry.
+SIZE_KEYS = ('xxxlg', 'xxlg', 'xlg', 'lg')
+
+
+def body_hash(content: bytes) -> str:
+    """Short, fast digest of a response body."""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+class ParseResultCache:
+    """Stores one parse record per poster URL as a small JSON file."""
+
+    def __init__(self, cache_dir: str, parser_version: int) -> None:
+        self.cache_dir = cache_dir
+        self.parser_version = parser_version
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, name[:2], f"{name}.json")
+
+    @staticmethod
+    def _compact(info: Dict) -> Dict:
+        """Drop empty resolution slots; they are restored on load."""
+        return {key: value for key, value in info.items() if not (key in SIZE_KEYS and value is None)}
+
+    @staticmethod
+    def _expand(record: Dict) -> Dict:
+        info = {key: None for key in SIZE_KEYS}
+        info.update(record)
+        return info
+
+    def get(self, url: str, digest: str) -> Optional[Tuple[Dict, Optional[str]]]:
+        """
+        Return (info, imdb_url) for an unchanged page, or None on a miss.
+
+        A record only matches when both the body hash and the parser version
+        are the ones it was written with.
+        """
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as fh:
+                record = json.load(fh)
+        except (OSError, ValueError):
+            record = None
+        if (not isinstance(record, dict)
+                or record.get('v') != self.parser_version
+                or record.get('url') != url
+                or record.get('hash') != digest
+                or not isinstance(record.get('info'), dict)):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._expand(record['info']), record.get('imdb_url')
+
+    def store(self, url: str, digest: str, info: Dict, imdb_url: Optional[str]) -> None:
+        record = {
+            'v': self.parser_version,
+            'url': url,
+            'hash': digest,
+            'info': self._compact(info),
+            'imdb_url': imdb_url
+        }
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as fh:
+                json.dump(record, fh, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            events.warning('save_failed', f"  Warning: Could not cache parse result for {url}: {exc}", path=path, error=str(exc))
@@ -14,89 +14,97 @@ import os
 import re
 import sys
 import json
-import yaml
 import argparse
+import itertools
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+try:
+    import fcntl
+except ImportError:  # Windows has no flock()
+    fcntl = None
+
+from urllib.parse import urljoin, urlparse
 from dotenv import load_dotenv
 
-from digest_tracker import DigestTracker
-from email_sender import EmailSender
+# requests, bs4, lxml (page_parser), the email stack (PIL, smtplib) and the
+# digest, cassette and metrics helpers are imported where they are first
+# used, so a run that exits early (--email-digest on a disabled day, --help,
+# trace-summary) never loads them. benchmarks/bench_startup.py guards this.
+from crawl_engine import ProgressReporter, Stage, format_duration, run_pipeline
+from enrichment import BackgroundEnricher, enrich_store
+import events
+from failed_jobs import FailedJobStore
+from genre_decisions import GenreDecisionCache
+from job_queue import LeasedJobQueue, LeaseKeeper, default_worker_id
+from movie_catalog import MovieCatalog, split_poster_url
+from parse_cache import ParseResultCache, body_hash
+from profiling import PROFILE_KINDS, RunProfiler
 from schedule_checker import should_run_today
+from settings import CONFIG_FILE, get_config, report_problems
+from stage_timings import StageTimings
+from tmdb_client import TmdbCache, TmdbClient, empty_metadata, genre_names
+from tracing import NULL_TRACER, Tracer, summarize_trace
+from year_index_cache import YearIndexCache
 
 # Load environment variables from .env file
 load_dotenv()
 
 # Unified configuration file
-CONFIG_FILE = 'config.yaml'
-
-def load_config():
-    """Load unified configuration from config.yaml"""
-    default_config = {
-        'files': {
-            'movie_metadata': 'movie_metadata.json',
-            'email_tracking': 'email_tracking.json',
-            'digest_state': 'digest_state.json',
-            'downloads_dir': 'downloads'
-        },
-        'tmdb': {
-            'base_url': 'https://api.themoviedb.org/3'
-        },
-        'genres': {},
-        'resolutions': {
-            'XXXLG': {'allow': True},
-            'XXLG': {'allow': True},
-            'XLG': {'allow': True},
-            'LG': {'allow': False}
-        },
-        'http': {
-            'timeout_seconds': 30,
-            'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        },
-        'site': {
-            'base_url': 'http://www.impawards.com',
-            'latest_url': 'http://www.impawards.com/archives/latest.html'
-        }
-    }
-    
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, 'r') as f:
-                user_config = yaml.safe_load(f) or {}
-                # Merge with defaults
-                for key, value in user_config.items():
-                    if isinstance(value, dict) and key in default_config:
-                        default_config[key].update(value)
-                    else:
-                        default_config[key] = value
-        except Exception as e:
-            print(f"  Warning: Could not load {CONFIG_FILE}: {e}")
-            print(f"  Using default configuration")
-    
-    return default_config
-
-# Load configuration
-CONFIG = load_config()
+# Load configuration (parsed once per process, see settings.py)
+# Warnings are reported by main() once --quiet/--json-events are applied
+CONFIG = get_config(report=False)
 
 # TMDb API Configuration
 # Get your free API key at: https://www.themoviedb.org/settings/api
 TMDB_API_KEY = os.environ.get('TMDB_API_KEY', '')  # Loaded from .env file or environment variable
-TMDB_BASE_URL = CONFIG['tmdb']['base_url']
+TMDB_BASE_URL = CONFIG.tmdb.base_url
 
 # File paths from config
-MOVIE_METADATA_FILE = CONFIG['files']['movie_metadata']
+MOVIE_METADATA_FILE = CONFIG.files.movie_metadata
+
+# Format: "Tron: Ares Movie Poster (#1 of 31) - IMP Awards"
+POSTER_TITLE_RE = re.compile(r'(.+?) Movie Poster \(#(\d+) of \d+\)')
+POSTER_URL_RE = re.compile(r'/(\d{4})/([^/]+)\.html$')
 
 
 class MovieMetadataStore:
-    """Handles persistent storage of movie-level metadata."""
+    """
+    Handles persistent storage of movie-level metadata.
+
+    Several worker processes may share one store file. Updates are applied
+    in memory at once and kept in a pending list; a flush replays them onto
+    the latest on-disk data under an exclusive file lock, so concurrent
+    writers never drop each other's changes. Each flush rewrites the whole
+    file, so they are batched: every ``flush_every`` updates or
+    ``flush_interval`` seconds, whichever comes first, plus an explicit
+    save() at the end of the run. Batches are also spaced at least
+    ``FLUSH_SPACING`` times the previous flush's duration apart, so flushing
+    stays a bounded share of the run however large the store grows.
+    """
 
-    def __init__(self, path: str = MOVIE_METADATA_FILE):
+    FLUSH_SPACING = 10
+
+    def __init__(self, path: str = MOVIE_METADATA_FILE, tracer=None, flush_every: Optional[int] = None, flush_interval: Optional[float] = None):
         self.path = path
+        self.tracer = tracer or NULL_TRACER
+        self.lock_path = f"{path}.lock"
+        self.flush_every = max(1, flush_every or CONFIG.store.flush_every)
+        self.flush_interval = flush_interval if flush_interval is not None else CONFIG.store.flush_interval_seconds
+        self._lock = threading.RLock()
+        self._pending: List[Tuple] = []
+        self.flushes = 0
+        started = time.monotonic()
         self.data: Dict[str, Dict] = self._load()
+        self._reindex()
+        # A rewrite costs at least as much as the initial read
+        self._last_flush = time.monotonic()
+        self._flush_seconds = self._last_flush - started
 
     def _load(self) -> Dict[str, Dict]:
         if os.path.exists(self.path):
@@ -104,17 +112,91 @@ class MovieMetadataStore:
                 with open(self.path, 'r', encoding='utf-8') as fh:
                     return json.load(fh)
             except Exception as exc:
-                print(f"  Warning: Could not load {self.path}: {exc}")
+                events.warning('store_load_failed', f"  Warning: Could not load {self.path}: {exc}", path=self.path, error=str(exc))
         return {}
 
+    def _reindex(self) -> None:
+        """Rebuild the IMDb ID and (year, slug) -> movie key lookups."""
+        self._keys_by_imdb: Dict[str, str] = {}
+        self._keys_by_slug: Dict[Tuple[str, str], str] = {}
+        for movie_id, entry in self.data.items():
+            self._index_entry(movie_id, entry)
+
+    def _index_entry(self, movie_id: str, entry: Dict) -> None:
+        if entry.get('imdb_id'):
+            self._keys_by_imdb.setdefault(entry['imdb_id'], movie_id)
+        if entry.get('movie_slug'):
+            self._keys_by_slug.setdefault((str(entry.get('year')), entry['movie_slug']), movie_id)
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold an exclusive inter-process lock on the store (POSIX only)."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, 'a') as lock_fh:
+            fcntl.flock(lock_fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_fh, fcntl.LOCK_UN)
+
     def save(self) -> None:
-        tmp_path = f"{self.path}.tmp"
-        with open(tmp_path, 'w', encoding='utf-8') as fh:
-            json.dump(self.data, fh, indent=2)
-        os.replace(tmp_path, self.path)
+        """Merge pending updates into the store file now (no-op when nothing is pending)."""
+        with self._lock:
+            if not self._pending:
+                return
+            self._flush()
+
+    def _flush(self) -> None:
+        started = time.monotonic()
+        with self._lock, self.tracer.span('store_flush', pending=len(self._pending)) as span, self._file_lock():
+            # Merge our updates into whatever other workers have written.
+            self.data = self._load()
+            self._reindex()
+            for update in self._pending:
+                self._apply(*update)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as fh:
+                json.dump(self.data, fh, indent=2)
+            os.replace(tmp_path, self.path)
+            self._pending = []
+            now = time.monotonic()
+            self._flush_seconds = now - started
+            self._last_flush = now
+            self.flushes += 1
+            if span.id is not None:
+                span.set(entries=len(self.data), bytes=os.path.getsize(self.path))
+
+    def durable_after(self) -> int:
+        """
+        Flush count after which every update applied so far is on disk.
+
+        Compare with ``flushes``: once ``flushes`` reaches the returned
+        value, updates made before the call have been written.
+        """
+        with self._lock:
+            return self.flushes + (1 if self._pending else 0)
+
+    def update_movie(self, movie_id: str, metadata: Dict, poster_info: Optional[Dict] = None, source_url: Optional[str] = None, save: bool = True) -> None:
+        """
+        Apply an update in memory and queue it for the store file.
+
+        With save=True the pending batch is flushed once it is due
+        (``flush_every`` updates or ``flush_interval`` seconds, spaced by
+        ``FLUSH_SPACING``); with save=False it waits for the next save().
+        """
+        update = (str(movie_id), metadata, poster_info, source_url, datetime.now(timezone.utc).isoformat())
+        with self._lock:
+            self._pending.append(update)
+            self._apply(*update)
+            if save:
+                since = time.monotonic() - self._last_flush
+                due = len(self._pending) >= self.flush_every or since >= self.flush_interval
+                if due and since >= self.FLUSH_SPACING * self._flush_seconds:
+                    self._flush()
 
-    def update_movie(self, movie_id: str, metadata: Dict, poster_info: Optional[Dict] = None, source_url: Optional[str] = None) -> None:
-        movie_id = str(movie_id)
+    def _apply(self, movie_id: str, metadata: Dict, poster_info: Optional[Dict], source_url: Optional[str], updated_at: str) -> None:
         entry = self.data.get(movie_id, {
             'movie_id': movie_id,
             'movie_title': metadata.get('movie_title'),
@@ -156,39 +238,231 @@ class MovieMetadataStore:
                 posters.append(poster_info)
             entry['posters'] = posters
 
-        entry['last_updated'] = datetime.now(timezone.utc).isoformat()
+        entry['last_updated'] = updated_at
         self.data[movie_id] = entry
-        self.save()
+        self._index_entry(movie_id, entry)
+
+    def find_key(self, imdb_id: Optional[str] = None, year=None, movie_slug: Optional[str] = None) -> Optional[str]:
+        """
+        Return the key of an existing entry for a movie, if any.
+
+        Matches by IMDb ID first, then by year/slug, so a poster downloaded
+        before its TMDb ID is known lands on the movie's existing entry
+        instead of a new one keyed by IMDb ID.
+        """
+        with self._lock:
+            if imdb_id and imdb_id in self._keys_by_imdb:
+                return self._keys_by_imdb[imdb_id]
+            if movie_slug:
+                return self._keys_by_slug.get((str(year), movie_slug))
+        return None
+
+    def find_by_slug(self, year: str, movie_slug: str) -> Optional[Dict]:
+        """Return the stored movie entry for a year/slug pair, if any."""
+        with self._lock:
+            key = self._keys_by_slug.get((str(year), movie_slug))
+            return self.data.get(key) if key is not None else None
 
 
 class PosterDownloader:
-    def __init__(self, base_url=None):
+    def __init__(self, base_url=None, max_connections=None, tracer=None):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from http_control import REQUEST_CLASSES, HttpGovernor, RetryPolicy
+        import page_parser
+        
+        # Settings this downloader was built with (see refresh_config())
+        self.config = CONFIG
         # Use config value or fallback
-        self.base_url = base_url or CONFIG['site']['base_url']
+        self.base_url = base_url or CONFIG.site.base_url
+        # Span writer for --trace (a no-op unless enabled)
+        self.tracer = tracer or NULL_TRACER
         self.session = requests.Session()
         
+        # Size the connection pool for the concurrent engine so worker
+        # threads reuse connections instead of opening throwaway ones
+        max_connections = max_connections or CONFIG.crawl.max_concurrency
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(10, max_connections))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
         # HTTP settings from config
-        user_agent = CONFIG['http'].get('user_agent', 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
         self.session.headers.update({
-            'User-Agent': user_agent,
+            'User-Agent': CONFIG.http.user_agent,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'DNT': '1',
             'Connection': 'keep-alive'
         })
-        self.timeout = CONFIG['http'].get('timeout_seconds', 30)
+        self.timeout = CONFIG.http.timeout_seconds
+        
+        # Every request goes through per-host rate limits and an adaptive
+        # (AIMD) concurrency window; TMDb shares the same session
+        http_config = CONFIG.http
+        retry_policies = {}
+        for request_class in REQUEST_CLASSES:
+            overrides = http_config.retry_classes.get(request_class) or {}
+            retry_policies[request_class] = RetryPolicy(
+                max_retries=overrides.get('max_retries', http_config.max_retries),
+                base_delay=overrides.get('retry_delay_seconds', http_config.retry_delay_seconds),
+                max_delay=http_config.retry_max_delay_seconds
+            )
+        self.http = HttpGovernor(
+            self.session,
+            timeout=self.timeout,
+            max_retries=http_config.max_retries,
+            retry_delay=http_config.retry_delay_seconds,
+            default_rate=http_config.requests_per_second,
+            host_rates={
+                urlparse(TMDB_BASE_URL).hostname: CONFIG.tmdb.requests_per_second
+            },
+            max_concurrency=max_connections,
+            min_concurrency=http_config.min_concurrency,
+            adaptive=http_config.adaptive_concurrency,
+            policies=retry_policies,
+            tracer=self.tracer
+        )
         
         # Load genre and resolution configs from unified config
-        self.genre_config = CONFIG.get('genres', {})
-        self.resolution_config = CONFIG.get('resolutions', {})
+        self.genre_config = CONFIG.genres
+        self.resolution_config = CONFIG.resolutions
         
         # Show which resolutions are enabled
         enabled = [name for name, settings in self.resolution_config.items() 
                   if isinstance(settings, dict) and settings.get('allow', True)]
         if enabled:
-            print(f"  Resolution settings: {', '.join(enabled)} enabled")
+            events.info('resolutions', f"  Resolution settings: {', '.join(enabled)} enabled", enabled=enabled)
+        
+        self.timings = StageTimings()
+        self.run_stats = Counter()
+        self._stats_lock = threading.Lock()
+        self.metadata_store = MovieMetadataStore(tracer=self.tracer)
+        self.failed_jobs = FailedJobStore(
+            CONFIG.files.failed_jobs,
+            retry_delay_minutes=CONFIG.failed_jobs.retry_delay_minutes,
+            max_attempts=CONFIG.failed_jobs.max_attempts
+        )
+        
+        self.tmdb = TmdbClient(
+            TMDB_API_KEY,
+            TMDB_BASE_URL,
+            lambda url, **kwargs: self._get(url, request_class='tmdb', **kwargs),
+            cache=TmdbCache(
+                os.path.join(CONFIG.cache.dir, 'tmdb.json'),
+                ttl_days=CONFIG.tmdb.cache_ttl_days,
+                missing_ttl_days=CONFIG.tmdb.missing_ttl_days
+            ),
+            timings=self.timings,
+            tracer=self.tracer
+        )
+        self.lazy_enrichment = CONFIG.tmdb.lazy_enrichment
+        self.enricher = BackgroundEnricher(self.fetch_tmdb_metadata, self.metadata_store)
+        
+        cache_config = CONFIG.cache
+        self.year_index_cache = YearIndexCache(
+            os.path.join(cache_config.dir, 'year_index'),
+            frozen_ttl_days=cache_config.year_index_ttl_days,
+            recent_ttl_hours=cache_config.recent_year_ttl_hours
+        )
+        self.movie_catalog = MovieCatalog(
+            self.year_index_cache,
+            os.path.join(cache_config.dir, 'archive_urls.json')
+        )
+        self.genre_decisions = GenreDecisionCache(
+            os.path.join(cache_config.dir, 'genre_decisions.json'),
+            self.genre_config
+        )
+        self.parse_cache = None
+        if cache_config.parse_results:
+            self.parse_cache = ParseResultCache(
+                os.path.join(cache_config.dir, 'parsed'),
+                page_parser.PARSER_VERSION
+            )
+    
+    def refresh_config(self):
+        """
+        Pick up edits to config.yaml between jobs (long-running worker mode).
+        
+        Only the per-poster settings (genre blocklist, resolution choices) are
+        reapplied; HTTP, cache and concurrency settings need a restart.
+        
+        Returns:
+            bool: True if a changed config.yaml was loaded
+        """
+        config = get_config()
+        if config is self.config:
+            return False
+        self.config = config
+        self.genre_config = config.genres
+        self.resolution_config = config.resolutions
+        self.genre_decisions.save()
+        decisions = GenreDecisionCache(self.genre_decisions.path, self.genre_config)
+        decisions.hits, decisions.misses = self.genre_decisions.hits, self.genre_decisions.misses
+        self.genre_decisions = decisions
+        events.info('config_reloaded', f"↻ Reloaded genre and resolution settings from {config.path}", path=config.path)
+        return True
+    
+    def _get(self, url, request_class='page', **kwargs):
+        """GET through the per-host limiter (rate limit, AIMD concurrency, retries)."""
+        return self.http.get(url, request_class=request_class, **kwargs)
+    
+    def count(self, key, amount=1):
+        """Add to a run counter (exported by --metrics textfile/push_url)."""
+        with self._stats_lock:
+            self.run_stats[key] += amount
+    
+    def use_cassette(self, mode, directory, latency_ms=0, jitter_ms=0):
+        """
+        Record every response to, or replay every response from, a cassette directory.
+        
+        Args:
+            mode: 'record' or 'replay'
+            directory: Cassette directory
+            latency_ms: Replay only: delay injected into every response
+            jitter_ms: Replay only: random +/- variation on that delay
+        """
+        from cassette import mount_cassette
         
-        self.metadata_store = MovieMetadataStore()
+        self.cassette = mount_cassette(
+            self.session, mode, directory,
+            latency_ms=latency_ms,
+            jitter_ms=jitter_ms,
+            pool_maxsize=max(10, self.http.max_concurrency)
+        )
+        label = 'Recording responses to' if mode == 'record' else 'Replaying responses from'
+        events.info('cassette', f"  {label} {directory}", mode=mode, directory=directory)
+    
+    def close(self):
+        """Finish background work (queued TMDb enrichment) and flush the stores before exiting."""
+        self.enricher.close()
+        self.metadata_store.save()
+        self.movie_catalog.save()
+        self.genre_decisions.save()
+        self.tmdb.cache.save()
+        cassette = getattr(self, 'cassette', None)
+        if cassette is not None:
+            from cassette import ReplayAdapter
+            
+            if isinstance(cassette, ReplayAdapter):
+                events.info('cassette_replayed', f"  Replayed {cassette.served} response(s), {cassette.missing} not in cassette",
+                            served=cassette.served, missing=cassette.missing)
+    
+    def genres_needed(self, required_genres=None):
+        """
+        Check whether TMDb genres are needed to decide if a poster is downloaded.
+        
+        Args:
+            required_genres: List of required genres (AND logic) or None
+            
+        Returns:
+            bool: True if a --genre filter is given or any genre is blocked
+        """
+        if required_genres or not self.lazy_enrichment:
+            return True
+        return any(
+            isinstance(setting, dict) and not setting.get('allow', True)
+            for setting in self.genre_config.values()
+        )
     
     def check_genre_blocklist(self, genres):
         """
@@ -257,6 +531,75 @@ class PosterDownloader:
                     return href
         return None
     
+    def extract_archive_links(self, content):
+        """
+        Extract thumbnail poster links and the "older" link from an archive page.
+        
+        Uses the streaming lxml extractor (no full DOM), falling back to
+        BeautifulSoup when no thumbnails are found.
+        
+        Args:
+            content: Raw HTML bytes of a latest/archive page
+            
+        Returns:
+            tuple: (thumbnail hrefs in page order, older page href or None)
+        """
+        import page_parser
+        
+        hrefs, older_link = page_parser.stream_archive_links(content)
+        if hrefs:
+            return hrefs, older_link
+        
+        from bs4 import BeautifulSoup
+        
+        soup = BeautifulSoup(content, 'lxml')
+        hrefs = []
+        # Look for links in thumbnail divs (class="minimal_thumb")
+        for div in soup.find_all('div', class_='minimal_thumb'):
+            link = div.find('a', href=True)
+            if link:
+                hrefs.append(link['href'])
+        return hrefs, self.get_older_page_link(soup)
+    
+    def extract_anchor_hrefs(self, content):
+        """
+        Return every anchor href on a page, in document order.
+        
+        Args:
+            content: Raw HTML bytes
+            
+        Returns:
+            list: hrefs in document order
+        """
+        return list(self.iter_anchor_hrefs(content))
+    
+    def iter_anchor_hrefs(self, content):
+        """
+        Yield every anchor href on a page as it is parsed.
+        
+        Uses the streaming lxml extractor, which drops each element after use
+        so large year indexes never build a full DOM. Falls back to
+        BeautifulSoup when the stream finds no anchors.
+        
+        Args:
+            content: Raw HTML bytes
+            
+        Yields:
+            str: href values in document order
+        """
+        import page_parser
+        
+        found = False
+        for href in page_parser.stream_anchor_hrefs(content):
+            found = True
+            yield href
+        if not found:
+            from bs4 import BeautifulSoup
+            
+            soup = BeautifulSoup(content, 'lxml')
+            for link in soup.find_all('a', href=True):
+                yield link['href']
+    
     def get_recent_posters(
         self,
         latest_url: str = None,
@@ -264,8 +607,6 @@ class PosterDownloader:
         stop_after_ids: Optional[set] = None,
         return_details: bool = False
     ):
-        if latest_url is None:
-            latest_url = CONFIG['site']['latest_url']
         """
         Fetch all poster URLs from the latest additions page(s).
         
@@ -278,7 +619,43 @@ class PosterDownloader:
         Returns:
             list: List of full poster page URLs from all requested pages
         """
-        all_poster_links = []
+        details: Dict = {}
+        all_poster_links = list(self.iter_recent_posters(
+            latest_url=latest_url,
+            num_pages=num_pages,
+            stop_after_ids=stop_after_ids,
+            details=details
+        ))
+        if return_details:
+            return all_poster_links, details
+        return all_poster_links
+    
+    def iter_recent_posters(
+        self,
+        latest_url: str = None,
+        num_pages: int = 1,
+        stop_after_ids: Optional[set] = None,
+        details: Optional[Dict] = None
+    ):
+        """
+        Yield poster URLs from the latest additions page(s) as each page is parsed.
+        
+        Args:
+            latest_url: URL to the latest additions page
+            num_pages: Number of recent pages to process (default: 1)
+            stop_after_ids: Optional set of poster URLs that indicates when to stop crawling
+            details: Optional dict filled with crawl details ('pages_fetched',
+                'found_known', 'stop_reason') once the crawl finishes
+            
+        Yields:
+            str: Full poster page URL
+        """
+        if latest_url is None:
+            latest_url = CONFIG.site.latest_url
+        if details is None:
+            details = {}
+        
+        total_links = 0
         current_url = latest_url
         seen_links = set()
         stop_ids = set(stop_after_ids or [])
@@ -286,73 +663,71 @@ class PosterDownloader:
         pages_fetched = 0
         
         for page_num in range(1, num_pages + 1):
-            print(f"\nFetching recent additions page {page_num}/{num_pages}: {current_url}")
+            events.info('archive_page_fetch', f"\nFetching recent additions page {page_num}/{num_pages}: {current_url}",
+                        page=page_num, pages=num_pages, url=current_url)
             
             try:
-                response = self.session.get(current_url, timeout=self.timeout)
+                response = self._get(current_url, request_class='index')
                 response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'lxml')
-                
-                # Find all links that match poster pattern: ../YEAR/poster_name.html
-                poster_links: List[str] = []
-                
-                # Look for links in thumbnail divs (class="minimal_thumb")
-                for div in soup.find_all('div', class_='minimal_thumb'):
-                    link = div.find('a', href=True)
-                    if link:
-                        href = link['href']
-                        # Pattern: ../2025/movie_name.html
-                        if href.startswith('../') and '.html' in href:
-                            # Convert relative URL to full URL
-                            # ../2025/tron_ares.html -> http://www.impawards.com/2025/tron_ares.html
-                            clean_href = href.replace('../', '')
-                            full_url = f"{self.base_url}/{clean_href}"
-                            if full_url in seen_links:
-                                continue
-                            if stop_ids and full_url in stop_ids:
-                                found_known = True
-                                break
-                            poster_links.append(full_url)
-                            seen_links.add(full_url)
-                    if found_known:
-                        break
-                
-                print(f"  ✓ Found {len(poster_links)} posters on this page")
-                all_poster_links.extend(poster_links)
-                pages_fetched += 1
-                
-                if found_known:
-                    print("  ✓ Encountered previously processed poster. Stopping crawl.")
-                    break
-                
-                # If we need more pages, find the "older" link
-                if page_num < num_pages:
-                    older_link = self.get_older_page_link(soup)
-                    if older_link:
-                        # Construct next URL
-                        current_url = f"http://www.impawards.com/archives/{older_link}"
-                    else:
-                        print(f"  Warning: Could not find 'older' link. Stopping at page {page_num}")
-                        break
-                
+                thumbnail_hrefs, older_link = self.extract_archive_links(response.content)
             except Exception as e:
-                print(f"  ✗ Error fetching page {page_num}: {e}")
+                events.error('archive_page_failed', f"  ✗ Error fetching page {page_num}: {e}",
+                             page=page_num, url=current_url, error=str(e))
+                break
+            
+            # Find all links that match poster pattern: ../YEAR/poster_name.html
+            poster_links: List[str] = []
+            
+            for href in thumbnail_hrefs:
+                # Pattern: ../2025/movie_name.html
+                if href.startswith('../') and '.html' in href:
+                    # Convert relative URL to full URL
+                    # ../2025/tron_ares.html -> http://www.impawards.com/2025/tron_ares.html
+                    clean_href = href.replace('../', '')
+                    full_url = f"{self.base_url}/{clean_href}"
+                    if full_url in seen_links:
+                        continue
+                    if stop_ids and full_url in stop_ids:
+                        found_known = True
+                        break
+                    poster_links.append(full_url)
+                    seen_links.add(full_url)
+            
+            events.info('archive_page_parsed', f"  ✓ Found {len(poster_links)} posters on this page",
+                        page=page_num, posters=len(poster_links))
+            self.movie_catalog.add_archive_urls(poster_links)
+            pages_fetched += 1
+            total_links += len(poster_links)
+            
+            # Hand this page's posters downstream before fetching the next one
+            yield from poster_links
+            
+            if found_known:
+                events.info('archive_known_poster', "  ✓ Encountered previously processed poster. Stopping crawl.",
+                            page=page_num)
                 break
+            
+            # If we need more pages, follow the "older" link
+            if page_num < num_pages:
+                if older_link:
+                    # Construct next URL relative to the current archive page
+                    current_url = urljoin(current_url, older_link)
+                else:
+                    events.warning('archive_no_older_link',
+                                   f"  Warning: Could not find 'older' link. Stopping at page {page_num}", page=page_num)
+                    break
         
         if found_known:
-            print(f"\n✓ Total: {len(all_poster_links)} new posters before reaching known digest boundary (pages fetched: {pages_fetched})")
+            message = f"\n✓ Total: {total_links} new posters before reaching known digest boundary (pages fetched: {pages_fetched})"
         else:
-            print(f"\n✓ Total: {len(all_poster_links)} posters across {pages_fetched} page(s)")
+            message = f"\n✓ Total: {total_links} posters across {pages_fetched} page(s)"
+        events.info('archive_crawled', message, posters=total_links, pages=pages_fetched, reached_known=found_known)
         
-        details = {
+        details.update({
             'pages_fetched': pages_fetched,
             'found_known': found_known,
             'stop_reason': 'known_id' if found_known else 'max_pages'
-        }
-        
-        if return_details:
-            return all_poster_links, details
-        return all_poster_links
+        })
     
     def get_year_posters(self, year):
         """
@@ -364,47 +739,132 @@ class PosterDownloader:
         Returns:
             list: List of full poster page URLs
         """
+        return list(self.iter_year_posters(year))
+    
+    def iter_year_posters(self, year):
+        """
+        Yield poster URLs for a specific year as the index is parsed.
+        
+        Extracted URL lists are cached locally: past years are served from the
+        cache without any request, recent years are revalidated once their
+        short TTL expires.
+        
+        Args:
+            year: Year to fetch posters for (e.g., 2024)
+            
+        Yields:
+            str: Full poster page URL
+        """
+        cached = self.year_index_cache.get(year, base_url=self.base_url)
+        if cached and self.year_index_cache.is_fresh(cached):
+            events.info('year_index_cached', f"\n✓ Using cached index for {year}: {len(cached['urls'])} posters",
+                        year=year, posters=len(cached['urls']))
+            yield from cached['urls']
+            return
+        
         # Use the "std.html" page which shows all posters on one page
         year_url = f"{self.base_url}/{year}/std.html"
-        print(f"\nFetching all posters for {year} from: {year_url}")
+        events.info('year_index_fetch', f"\nFetching all posters for {year} from: {year_url}", year=year, url=year_url)
         
         try:
-            response = self.session.get(year_url, timeout=self.timeout)
+            response = self._get(
+                year_url,
+                request_class='index',
+                headers=self.year_index_cache.validators(cached)
+            )
+            if response.status_code == 304 and cached:
+                self.year_index_cache.touch(cached)
+                events.info('year_index_unchanged', f"✓ Index for {year} unchanged: {len(cached['urls'])} posters",
+                            year=year, posters=len(cached['urls']))
+                yield from cached['urls']
+                return
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'lxml')
-            
-            # Find all links in the page
-            poster_links = []
-            
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                # Look for poster links: movie_name.html, movie_name_ver2.html, etc.
-                # Exclude navigation links (alpha1.html, alpha2.html, std.html, etc.)
-                if (href.endswith('.html') and 
-                    not href.startswith('/') and 
-                    not href.startswith('http') and
-                    not href.startswith('#') and
-                    'alpha' not in href and
-                    'std' not in href):
-                    
-                    full_url = f"{self.base_url}/{year}/{href}"
-                    poster_links.append(full_url)
-            
-            # Remove duplicates (each poster appears twice in the HTML)
-            poster_links = list(dict.fromkeys(poster_links))
-            
-            print(f"✓ Found {len(poster_links)} posters for year {year}")
-            
-            return poster_links
-            
+            hrefs = self.iter_anchor_hrefs(response.content)
         except Exception as e:
-            print(f"✗ Error fetching posters for year {year}: {e}")
-            return []
+            events.error('year_index_failed', f"✗ Error fetching posters for year {year}: {e}", year=year, error=str(e))
+            if cached:
+                events.warning('year_index_fallback', f"  Falling back to cached index ({len(cached['urls'])} posters)",
+                               year=year, posters=len(cached['urls']))
+                yield from cached['urls']
+            return
+        
+        # Each poster appears twice in the HTML; only yield the first
+        poster_links: Dict[str, None] = {}
+        
+        for href in hrefs:
+            # Look for poster links: movie_name.html, movie_name_ver2.html, etc.
+            # Exclude navigation links (alpha1.html, alpha2.html, std.html, etc.)
+            if (href.endswith('.html') and 
+                not href.startswith('/') and 
+                not href.startswith('http') and
+                not href.startswith('#') and
+                'alpha' not in href and
+                'std' not in href):
+                
+                full_url = f"{self.base_url}/{year}/{href}"
+                if full_url not in poster_links:
+                    poster_links[full_url] = None
+                    yield full_url
+        
+        events.info('year_index_parsed', f"✓ Found {len(poster_links)} posters for year {year}",
+                    year=year, posters=len(poster_links))
+        
+        if poster_links:
+            self.year_index_cache.store(year, list(poster_links), response.headers, base_url=self.base_url)
+    
+    def iter_backfill_posters(self, years, max_workers=2, on_index_loaded=None):
+        """
+        Yield poster URLs for several years, newest year first.
+        
+        Year indexes are fetched concurrently in the background while URLs
+        from already-loaded years are streamed to the caller. URLs are
+        deduplicated across all years.
+        
+        Args:
+            years: Iterable of years to include
+            max_workers: Number of concurrent year index fetches
+            on_index_loaded: Optional callback(year, count) run as each index loads
+            
+        Yields:
+            str: Full poster page URL
+        """
+        years = sorted(set(years), reverse=True)
+        seen = set()
+        pool = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        futures = []
+        
+        def index_loaded(future, year):
+            # Cancelled on early exit; a failed fetch is raised to the caller below
+            if future.cancelled() or future.exception() is not None:
+                return
+            on_index_loaded(year, len(future.result() or []))
+        
+        try:
+            for year in years:
+                future = pool.submit(self.get_year_posters, year)
+                if on_index_loaded:
+                    future.add_done_callback(lambda f, y=year: index_loaded(f, y))
+                futures.append(future)
+            for future in futures:
+                for url in future.result():
+                    if url in seen:
+                        continue
+                    seen.add(url)
+                    yield url
+        finally:
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=False)
     
     def get_movie_posters(self, movie_identifier, return_details=False):
         """
         Fetch all poster URLs for a specific movie (all variants).
         
+        Variants are resolved from the local slug catalog (cached year indexes
+        and archive pages) without any request. Only when the catalog is stale
+        for the movie's year is the year index revalidated; the movie page
+        itself is fetched only if the catalog still has no entry for it.
+        
         Args:
             movie_identifier: Path or full URL to a movie poster page
             return_details: Whether to return (posters, metadata) tuple
@@ -418,11 +878,18 @@ class PosterDownloader:
             movie_identifier = movie_identifier.lstrip('/')
             movie_url = f"{self.base_url}/{movie_identifier}"
         
-        print(f"\nFetching movie posters from: {movie_url}")
+        catalog_result = self.resolve_movie_from_catalog(movie_url)
+        if catalog_result:
+            poster_links, details = catalog_result
+            return (poster_links, details) if return_details else poster_links
+        
+        events.info('movie_page_fetch', f"\nFetching movie posters from: {movie_url}", url=movie_url)
         
         try:
-            response = self.session.get(movie_url, timeout=self.timeout)
+            response = self._get(movie_url)
             response.raise_for_status()
+            from bs4 import BeautifulSoup
+            
             soup = BeautifulSoup(response.content, 'lxml')
             
             match = re.search(r'/(\d{4})/([^/]+)\.html$', movie_url)
@@ -447,6 +914,7 @@ class PosterDownloader:
             
             add_link(movie_url)
             
+            variant_pattern = re.compile(rf"{re.escape(base_name.lower())}(_ver\d+)?\.html$")
             for link in soup.find_all('a', href=True):
                 href = link['href']
                 candidate = urljoin(movie_url, href)
@@ -455,12 +923,13 @@ class PosterDownloader:
                 if not filename.endswith('.html'):
                     continue
                 
-                if not re.match(rf"{re.escape(base_name.lower())}(_ver\d+)?\.html$", filename):
+                if not variant_pattern.match(filename):
                     continue
                 
                 add_link(candidate)
             
-            print(f"✓ Found {len(poster_links)} poster page(s) for {base_name}")
+            events.info('movie_resolved', f"✓ Found {len(poster_links)} poster page(s) for {base_name}",
+                        movie=base_name, posters=len(poster_links), source='site')
             
             details = {
                 'movie_title': movie_title or base_name.replace('_', ' ').title(),
@@ -471,9 +940,47 @@ class PosterDownloader:
             return (poster_links, details) if return_details else poster_links
         
         except Exception as e:
-            print(f"✗ Error fetching posters for movie {movie_identifier}: {e}")
+            events.error('movie_failed', f"✗ Error fetching posters for movie {movie_identifier}: {e}",
+                         movie=movie_identifier, error=str(e))
             return ([], {}) if return_details else []
 
+    def resolve_movie_from_catalog(self, movie_url):
+        """
+        Resolve all variants of a movie from the local slug catalog.
+        
+        Args:
+            movie_url: Full URL to any poster page of the movie
+            
+        Returns:
+            tuple: (poster_urls, details) or None when the catalog can't answer
+        """
+        parts = split_poster_url(movie_url)
+        if not parts:
+            return None
+        year, slug, _ = parts
+        
+        if self.movie_catalog.is_stale(year, base_url=self.base_url):
+            # Revalidate the year index (a conditional request for recent years)
+            self.get_year_posters(year)
+        
+        poster_links = self.movie_catalog.variants(year, slug, base_url=self.base_url)
+        if not poster_links:
+            return None
+        if movie_url not in poster_links:
+            poster_links.insert(0, movie_url)
+        
+        stored = self.metadata_store.find_by_slug(year, slug)
+        base_name = os.path.splitext(os.path.basename(movie_url))[0]
+        events.info('movie_resolved', f"\n✓ Resolved {len(poster_links)} poster page(s) for {slug} from local catalog",
+                    movie=slug, posters=len(poster_links), source='catalog')
+        
+        details = {
+            'movie_title': (stored or {}).get('movie_title') or slug.replace('_', ' ').title(),
+            'base_name': base_name,
+            'year': year
+        }
+        return poster_links, details
+
     def parse_poster_page(self, url):
         """
         Parse a poster page and extract available resolution information.
@@ -488,38 +995,130 @@ class PosterDownloader:
                 'base_name': str
             }
         """
-        response = self.session.get(url, timeout=self.timeout)
+        response = self._get(url)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'lxml')
+        info, _ = self.parse_poster_cached(url, response.content)
+        return info
+
+    def parse_poster_cached(self, url, content):
+        """
+        Parse poster page HTML, reusing the stored result for an unchanged page.
+        
+        Args:
+            url: Poster page URL
+            content: Raw HTML bytes
+            
+        Returns:
+            tuple: Same as parse_poster_content()
+        """
+        with self.tracer.span('parse', bytes=len(content)) as span:
+            if self.parse_cache is None:
+                return self.parse_poster_content(url, content)
+            
+            started = time.perf_counter()
+            digest = body_hash(content)
+            cached = self.parse_cache.get(url, digest)
+            if cached is not None:
+                self.timings.record('parse', time.perf_counter() - started)
+                span.set(cache='hit')
+                return cached
+            
+            info, imdb_url = self.parse_poster_content(url, content)
+            self.parse_cache.store(url, digest, info, imdb_url)
+            span.set(cache='miss')
+            return info, imdb_url
+
+    def parse_poster_content(self, url, content):
+        """
+        Parse poster page HTML into resolution info and the IMDb URL.
+        
+        Uses the lxml/XPath fast path and falls back to BeautifulSoup when it
+        finds neither a title nor an "other sizes" block.
+        
+        Args:
+            url: Poster page URL (used for year and base name)
+            content: Raw HTML bytes
+            
+        Returns:
+            tuple: (info dict as from parse_poster_page(), imdb_url or None)
+        """
+        import page_parser
+        
+        # 'parse' closes before 'imdb' starts on both paths, so stage shares
+        # never count the IMDb extraction twice
+        soup = None
+        with self.timings.time('parse'):
+            doc = page_parser.parse_document(content)
+            info = None
+            if doc is not None:
+                title_text = page_parser.page_title(doc)
+                size_links = page_parser.other_size_links(doc)
+                if title_text is not None or size_links:
+                    info = self.build_poster_info(url, title_text, size_links)
+            if info is None:
+                from bs4 import BeautifulSoup
+                
+                soup = BeautifulSoup(content, 'lxml')
+                info = self.parse_poster_soup(url, soup)
+        with self.timings.time('imdb'):
+            if soup is None:
+                return info, self.normalize_imdb_url(page_parser.imdb_href(doc))
+            return info, self.extract_imdb_url(soup)
+
+    def parse_poster_soup(self, url, soup):
+        """
+        Extract resolution information from a BeautifulSoup poster page.
         
-        # Extract movie title and year from page title
-        # Format: "Tron: Ares Movie Poster (#1 of 31) - IMP Awards"
+        Args:
+            url: Poster page URL (used for year and base name)
+            soup: BeautifulSoup object of the poster page
+            
+        Returns:
+            dict: Same structure as parse_poster_page()
+        """
         title_tag = soup.find('title')
-        if title_tag:
-            title_text = title_tag.text
-            # Extract movie name and poster number
-            match = re.search(r'(.+?) Movie Poster \(#(\d+) of \d+\)', title_text)
+        title_text = title_tag.text if title_tag else None
+        
+        # Find all links in the "other sizes:" section
+        # Looking for: other sizes: <a href = tron_ares_xlg.html>1013x1500</a> / <a href = tron_ares_xxlg.html>2025x3000</a>
+        size_links = []
+        for p in soup.find_all('p', class_='small'):
+            if 'other sizes:' in p.get_text():
+                for link in p.find_all('a'):
+                    size_links.append((link.get('href', ''), link.get_text().strip()))
+        
+        return self.build_poster_info(url, title_text, size_links)
+
+    def build_poster_info(self, url, title_text, size_links):
+        """
+        Build the parse_poster_page() result from extracted page fragments.
+        
+        Args:
+            url: Poster page URL (used for year and base name)
+            title_text: Text of the page <title>, or None
+            size_links: (href, link text) pairs from the "other sizes:" block
+            
+        Returns:
+            dict: Same structure as parse_poster_page()
+        """
+        movie_name = "Unknown"
+        poster_number = "1"
+        
+        # Extract movie title and poster number from page title
+        if title_text:
+            match = POSTER_TITLE_RE.search(title_text)
             if match:
                 movie_name = match.group(1).strip()
                 poster_number = match.group(2)
-            else:
-                movie_name = "Unknown"
-                poster_number = "1"
-        
-        # Extract year from breadcrumb or URL
-        year_match = re.search(r'/(\d{4})/', url)
-        year = year_match.group(1) if year_match else "unknown"
         
-        # Extract base name from URL
+        # Extract year and base name from URL
         # Format: http://www.impawards.com/2025/tron_ares.html
-        url_match = re.search(r'/(\d{4})/([^/]+)\.html$', url)
+        url_match = POSTER_URL_RE.search(url)
+        year_match = url_match or re.search(r'/(\d{4})/', url)
+        year = year_match.group(1) if year_match else "unknown"
         base_name = url_match.group(2) if url_match else None
         
-        # Find "other sizes:" section
-        # Looking for: other sizes: <a href = tron_ares_xlg.html>1013x1500</a> / <a href = tron_ares_xxlg.html>2025x3000</a>
-        page_text = soup.get_text()
-        
         result = {
             'movie_name': movie_name,
             'year': year,
@@ -535,41 +1134,27 @@ class PosterDownloader:
         if base_name:
             result['movie_slug'] = re.sub(r'_ver\d+$', '', base_name)
         
-        # Find all links in the "other sizes:" section
-        # Look for the paragraph containing "other sizes:"
-        for p in soup.find_all('p', class_='small'):
-            if 'other sizes:' in p.get_text():
-                # Find all links within this section
-                for link in p.find_all('a'):
-                    href = link.get('href', '')
-                    dimensions = link.get_text().strip()
-                    
-                    # Only process links that have dimension text (e.g., "1080x1350")
-                    # This filters out the second <a> tag that wraps the image
-                    if not dimensions or 'x' not in dimensions:
-                        continue
-                    
-                    # Check for all possible resolution sizes
-                    if '_xxxlg.html' in href:
-                        result['xxxlg'] = {
-                            'link': href,
-                            'dimensions': dimensions
-                        }
-                    elif '_xxlg.html' in href:
-                        result['xxlg'] = {
-                            'link': href,
-                            'dimensions': dimensions
-                        }
-                    elif '_xlg.html' in href:
-                        result['xlg'] = {
-                            'link': href,
-                            'dimensions': dimensions
-                        }
-                    elif '_lg.html' in href:
-                        result['lg'] = {
-                            'link': href,
-                            'dimensions': dimensions
-                        }
+        for href, dimensions in size_links:
+            # Only process links that have dimension text (e.g., "1080x1350")
+            # This filters out the second <a> tag that wraps the image
+            if not dimensions or 'x' not in dimensions:
+                continue
+            
+            # Check for all possible resolution sizes
+            if '_xxxlg.html' in href:
+                size_key = 'xxxlg'
+            elif '_xxlg.html' in href:
+                size_key = 'xxlg'
+            elif '_xlg.html' in href:
+                size_key = 'xlg'
+            elif '_lg.html' in href:
+                size_key = 'lg'
+            else:
+                continue
+            result[size_key] = {
+                'link': href,
+                'dimensions': dimensions
+            }
         
         return result
 
@@ -587,14 +1172,21 @@ class PosterDownloader:
         for link in soup.find_all('a'):
             href = link.get('href', '')
             if 'imdb.com/title/' in href:
-                # Ensure it uses https
-                if href.startswith('http://'):
-                    href = href.replace('http://', 'https://')
-                elif not href.startswith('https://'):
-                    href = 'https://' + href
-                return href
+                return self.normalize_imdb_url(href)
         return None
 
+    @staticmethod
+    def normalize_imdb_url(href):
+        """Return an IMDb link as an https URL (None passes through)."""
+        if not href:
+            return None
+        # Ensure it uses https
+        if href.startswith('http://'):
+            href = href.replace('http://', 'https://')
+        elif not href.startswith('https://'):
+            href = 'https://' + href
+        return href
+
     def fetch_tmdb_metadata(self, imdb_id):
         """
         Fetch movie metadata from TMDb using an IMDb ID.
@@ -605,61 +1197,22 @@ class PosterDownloader:
         Returns:
             dict: Metadata containing genres, release_date, tmdb_id, title.
         """
-        metadata = {
-            'imdb_id': imdb_id,
-            'tmdb_id': None,
-            'title': None,
-            'release_date': None,
-            'genres': []
-        }
-        
         if not TMDB_API_KEY:
-            print("  Warning: TMDb API key not set. Set TMDB_API_KEY environment variable.")
-            print("  Get your free API key at: https://www.themoviedb.org/settings/api")
-            return metadata
+            events.warning('tmdb_key_missing', "  Warning: TMDb API key not set. Set TMDB_API_KEY environment variable.\n"
+                           "  Get your free API key at: https://www.themoviedb.org/settings/api")
+            return empty_metadata(imdb_id)
+        
+        self.count('tmdb_lookups')
+        cached = self.tmdb.cache.get(imdb_id)
+        if cached is not None:
+            return cached
         
         try:
-            # Use TMDb /find endpoint to search by IMDb ID
-            url = f"{TMDB_BASE_URL}/find/{imdb_id}"
-            params = {
-                'api_key': TMDB_API_KEY,
-                'external_source': 'imdb_id'
-            }
-            
-            print(f"  Fetching metadata from TMDb...")
-            timeout = CONFIG['http'].get('timeout_seconds', 30)
-            response = requests.get(url, params=params, timeout=timeout)
-            response.raise_for_status()
-            
-            data = response.json()
-            movie_results = data.get('movie_results', [])
-            if movie_results:
-                movie = movie_results[0]
-                metadata['tmdb_id'] = movie.get('id')
-                metadata['title'] = movie.get('title') or movie.get('original_title')
-                metadata['release_date'] = movie.get('release_date')
-                genre_ids = movie.get('genre_ids', [])
-                metadata['genres'] = self.get_genre_names_from_ids(genre_ids)
-            
-            # Fetch full movie details to enrich metadata if TMDb ID is available
-            if metadata['tmdb_id']:
-                detail_url = f"{TMDB_BASE_URL}/movie/{metadata['tmdb_id']}"
-                detail_params = {'api_key': TMDB_API_KEY}
-                timeout = CONFIG['http'].get('timeout_seconds', 30)
-                detail_resp = requests.get(detail_url, params=detail_params, timeout=timeout)
-                detail_resp.raise_for_status()
-                detail_data = detail_resp.json()
-                metadata['release_date'] = detail_data.get('release_date') or metadata['release_date']
-                detail_genres = detail_data.get('genres')
-                if detail_genres:
-                    metadata['genres'] = [g.get('name', '').strip() for g in detail_genres if g.get('name')]
-                if not metadata['title']:
-                    metadata['title'] = detail_data.get('title') or detail_data.get('original_title')
-            
-            return metadata
+            events.detail('tmdb_lookup', "  Fetching metadata from TMDb...", imdb_id=imdb_id)
+            return self.tmdb.lookup(imdb_id, use_cache=False)
         except Exception as e:
-            print(f"  Warning: Could not fetch TMDb data: {e}")
-            return metadata
+            events.warning('tmdb_failed', f"  Warning: Could not fetch TMDb data: {e}", imdb_id=imdb_id, error=str(e))
+            return empty_metadata(imdb_id)
     
     def get_genre_names_from_ids(self, genre_ids):
         """
@@ -671,16 +1224,7 @@ class PosterDownloader:
         Returns:
             list: List of genre names
         """
-        # TMDb genre mappings (as of 2024)
-        genre_map = {
-            28: 'Action', 12: 'Adventure', 16: 'Animation', 35: 'Comedy',
-            80: 'Crime', 99: 'Documentary', 18: 'Drama', 10751: 'Family',
-            14: 'Fantasy', 36: 'History', 27: 'Horror', 10402: 'Music',
-            9648: 'Mystery', 10749: 'Romance', 878: 'Science Fiction',
-            10770: 'TV Movie', 53: 'Thriller', 10752: 'War', 37: 'Western'
-        }
-        
-        return [genre_map.get(gid, f'Unknown ({gid})') for gid in genre_ids]
+        return genre_names(genre_ids)
 
     def construct_image_url(self, resolution_link, year):
         """
@@ -733,92 +1277,212 @@ class PosterDownloader:
         # Check if file already exists
         if skip_if_exists and self.check_file_exists(save_path):
             file_size = os.path.getsize(save_path)
-            print(f"✓ Already downloaded: {save_path} ({file_size:,} bytes)")
+            events.detail('image_exists', f"✓ Already downloaded: {save_path} ({file_size:,} bytes)",
+                          path=save_path, bytes=file_size)
             return True, True
         
-        print(f"Downloading: {url}")
-        response = self.session.get(url, stream=True, timeout=self.timeout)
-        response.raise_for_status()
+        events.detail('image_download', f"Downloading: {url}", url=url)
+        with self.tracer.span('download', url=url) as span:
+            with self.timings.time('download'), self.http.stream(url, request_class='image') as response:
+                response.raise_for_status()
+                
+                # Create directory if it doesn't exist
+                os.makedirs(os.path.dirname(save_path), exist_ok=True)
+                
+                # Download and save
+                with open(save_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=8192):
+                        f.write(chunk)
+            
+            file_size = os.path.getsize(save_path)
+            span.set(bytes=file_size)
+        self.count('bytes_downloaded', file_size)
+        events.detail('image_saved', f"✓ Saved to: {save_path} ({file_size:,} bytes)", path=save_path, bytes=file_size)
+        return True, False
+
+    def fetch_poster_page(self, url):
+        """
+        Fetch a poster page once and extract everything later stages need.
         
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
+        Args:
+            url: Poster page URL
+            
+        Returns:
+            dict: {'url', 'info' (parse_poster_page result), 'imdb_url', 'imdb_id'}
+        """
+        events.detail('poster_fetch', f"\nFetching poster page: {url}", url=url)
+        with self.timings.time('fetch'):
+            response = self._get(url)
+            response.raise_for_status()
         
-        # Download and save
-        with open(save_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        info, imdb_url = self.parse_poster_cached(url, response.content)
+        imdb_id = None
+        if imdb_url:
+            imdb_id_match = re.search(r'title/(tt\d+)', imdb_url)
+            if imdb_id_match:
+                imdb_id = imdb_id_match.group(1)
         
-        file_size = os.path.getsize(save_path)
-        print(f"✓ Saved to: {save_path} ({file_size:,} bytes)")
-        return True, False
+        return {
+            'url': url,
+            'info': info,
+            'imdb_url': imdb_url,
+            'imdb_id': imdb_id
+        }
 
-    def process_poster_page(self, url, output_dir="downloads", prompt_confirm=True, required_genres=None, skip_existing=True):
+    def prefetch_tmdb(self, imdb_ids, workers=None):
         """
-        Process a single poster page: parse, identify best resolution, and download.
+        Resolve IMDb IDs on TMDb in one concurrent, deduplicated burst.
+        
+        Results land in the TMDb lookup cache, so the per-poster enrich step
+        that follows needs no network round trips.
         
         Args:
-            url: Poster page URL
-            output_dir: Base directory for downloads
-            prompt_confirm: Whether to ask for confirmation before downloading (default: True)
-            required_genres: List of required genres (AND logic) or None to skip filter
-            skip_existing: Whether to skip already downloaded files (default: True)
+            imdb_ids: Iterable of IMDb IDs (duplicates are ignored)
+            workers: Concurrent lookups (default: tmdb.enrich_workers)
+            
+        Returns:
+            int: Number of IDs looked up on TMDb (cache misses)
+        """
+        if not TMDB_API_KEY:
+            return 0
+        missing = sorted({imdb_id for imdb_id in imdb_ids if self.tmdb.cache.get(imdb_id) is None})
+        if not missing:
+            return 0
         
+        def lookup(imdb_id):
+            try:
+                self.tmdb.lookup(imdb_id)
+                return True
+            except Exception as e:
+                events.warning('tmdb_failed', f"  Warning: Could not fetch TMDb data for {imdb_id}: {e}",
+                               imdb_id=imdb_id, error=str(e))
+                return False
+        
+        workers = workers or CONFIG.tmdb.enrich_workers
+        events.info('tmdb_prefetch', f"\nResolving {len(missing)} movie(s) on TMDb ({workers} concurrent lookups)...",
+                    movies=len(missing), workers=workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            resolved = sum(pool.map(lookup, missing))
+        events.info('tmdb_prefetched', f"✓ TMDb metadata ready for {resolved}/{len(missing)} movie(s)",
+                    resolved=resolved, movies=len(missing))
+        return len(missing)
+
+    def cached_rejection(self, url, required_genres=None):
+        """
+        Look up a recorded genre rejection for a poster URL without any network I/O.
+        
+        Args:
+            url: Poster page URL
+            required_genres: List of required genres (AND logic) or None
+            
         Returns:
-            tuple: (success: bool, already_existed: bool, save_path: Optional[str])
+            dict: The recorded decision ('reason', 'genres') or None
         """
-        # Parse the page
-        print(f"\nFetching poster page: {url}")
-        response = self.session.get(url, timeout=self.timeout)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'lxml')
+        parts = split_poster_url(url)
+        if not parts:
+            return None
+        year, slug, _ = parts
+        decision = self.genre_decisions.get(year, slug, required_genres)
+        if decision:
+            label = 'BLOCKED' if decision.get('reason') == 'blocked' else 'FILTERED'
+            genres = ', '.join(decision.get('genres') or []) or 'unknown'
+            events.detail('poster_rejected', f"\n✗ {label} (cached): {url}\n  Genres: {genres}",
+                          url=url, reason=decision.get('reason'), genres=decision.get('genres') or [], cached=True)
+        return decision
+
+    def record_rejection(self, page, required_genres, reason):
+        """Remember a genre rejection so later runs skip the movie up front."""
+        info = page.get('info') or {}
+        slug = info.get('movie_slug')
+        if slug and info.get('year') not in (None, 'unknown'):
+            self.genre_decisions.record(info['year'], slug, required_genres, reason, page.get('genres') or [])
+
+    def enrich_poster(self, page, required_genres=None):
+        """
+        Look up TMDb metadata for a fetched poster page and apply genre rules.
         
-        # Extract IMDb URL and gather metadata
-        imdb_url = self.extract_imdb_url(soup)
+        Sets page['tmdb_metadata'] and page['genres']. When no genre rule needs
+        the genres, the lookup is skipped and page['enrich_later'] is set so the
+        movie is enriched in the background after download.
+        
+        Args:
+            page: Dict returned by fetch_poster_page()
+            required_genres: List of required genres (AND logic) or None to skip filter
+            
+        Returns:
+            bool: True if the poster is eligible for download
+        """
         genres: List[str] = []
         tmdb_metadata: Dict[str, Optional[str]] = {}
-        imdb_id: Optional[str] = None
+        imdb_url = page.get('imdb_url')
+        imdb_id = page.get('imdb_id')
         
         if imdb_url:
-            print(f"✓ Found IMDb URL: {imdb_url}")
-            imdb_id_match = re.search(r'title/(tt\d+)', imdb_url)
-            if imdb_id_match:
-                imdb_id = imdb_id_match.group(1)
+            events.detail('imdb_found', f"✓ Found IMDb URL: {imdb_url}", url=page.get('url'), imdb_url=imdb_url)
+            if imdb_id and not self.genres_needed(required_genres):
+                # Genres are metadata only here; resolve them after download
+                page['enrich_later'] = True
+            elif imdb_id:
                 tmdb_metadata = self.fetch_tmdb_metadata(imdb_id)
                 genres = tmdb_metadata.get('genres', []) or []
                 if genres:
-                    print(f"✓ Genres: {', '.join(genres)}")
+                    events.detail('genres_found', f"✓ Genres: {', '.join(genres)}", url=page.get('url'), genres=genres)
                 else:
-                    print("  No genre information found")
+                    events.detail('genres_missing', "  No genre information found", url=page.get('url'))
             else:
-                print("  Could not extract IMDb ID from URL")
+                events.detail('imdb_id_missing', "  Could not extract IMDb ID from URL", url=page.get('url'))
         else:
-            print("✗ No IMDb URL found on poster page")
-        
-        if genres:
-            if required_genres:
-                matches, missing = self.check_genre_filter(genres, required_genres)
-                if not matches:
-                    print(f"✗ FILTERED: Movie missing required genre(s): {', '.join(missing)}")
-                    print(f"  Required: {', '.join(required_genres)}")
-                    return False, False, None
-            
-            is_blocked, blocked_genres = self.check_genre_blocklist(genres)
-            if is_blocked:
-                print(f"✗ BLOCKED: Movie contains blocked genre(s): {', '.join(blocked_genres)}")
-                print(f"  Edit {CONFIG_FILE} to change genre settings")
-                return False, False, None
+            events.detail('imdb_missing', "✗ No IMDb URL found on poster page", url=page.get('url'))
         
-        # Parse poster info
-        info = self.parse_poster_page(url)
+        page['tmdb_metadata'] = tmdb_metadata
+        page['genres'] = genres
         
-        print(f"\nMovie: {info['movie_name']}")
-        print(f"Year: {info['year']}")
-        print(f"Poster: #{info['poster_number']}")
+        if genres:
+            with self.timings.time('filter'):
+                return self.apply_genre_rules(page, genres, required_genres)
+        return True
+    
+    def apply_genre_rules(self, page, genres, required_genres=None):
+        """
+        Apply the --genre filter and the config.yaml blocklist to a poster's genres.
         
-        # Determine which resolution to download based on configuration
-        selected_size = None
-        selected_info = None
+        Args:
+            page: Dict from fetch_poster_page() (rejections are recorded from it)
+            genres: TMDb genre names for the movie
+            required_genres: List of required genres (AND logic) or None to skip filter
+            
+        Returns:
+            bool: True if the poster passes both
+        """
+        if required_genres:
+            matches, missing = self.check_genre_filter(genres, required_genres)
+            if not matches:
+                events.detail('poster_rejected', f"✗ FILTERED: Movie missing required genre(s): {', '.join(missing)}\n"
+                              f"  Required: {', '.join(required_genres)}",
+                              url=page.get('url'), reason='filtered', genres=genres, missing=missing)
+                self.record_rejection(page, required_genres, 'filtered')
+                return False
+        
+        is_blocked, blocked_genres = self.check_genre_blocklist(genres)
+        if is_blocked:
+            events.detail('poster_rejected', f"✗ BLOCKED: Movie contains blocked genre(s): {', '.join(blocked_genres)}\n"
+                          f"  Edit {CONFIG_FILE} to change genre settings",
+                          url=page.get('url'), reason='blocked', genres=genres, blocked=blocked_genres)
+            self.record_rejection(page, required_genres, 'blocked')
+            return False
+        
+        return True
+
+    def select_resolution(self, info):
+        """
+        Pick the highest available resolution that is enabled in config.yaml.
         
+        Args:
+            info: Dict returned by parse_poster_page()
+            
+        Returns:
+            tuple: (size_key, {'link', 'dimensions'}) or (None, None)
+        """
         resolution_priority = [
             ('xxxlg', 'XXXLG'),
             ('xxlg', 'XXLG'),
@@ -832,24 +1496,34 @@ class PosterDownloader:
                 is_allowed = res_config.get('allow', True) if isinstance(res_config, dict) else True
                 
                 if is_allowed:
-                    selected_size = res_key
-                    selected_info = info[res_key]
-                    print(f"✓ {res_name} available: {selected_info['dimensions']}")
-                    break
+                    events.detail('resolution_selected', f"✓ {res_name} available: {info[res_key]['dimensions']}",
+                                  size=res_name, dimensions=info[res_key]['dimensions'])
+                    return res_key, info[res_key]
                 else:
-                    print(f"  {res_name} available but disabled in {CONFIG_FILE}")
+                    events.detail('resolution_disabled', f"  {res_name} available but disabled in {CONFIG_FILE}", size=res_name)
         
-        if not selected_size or not selected_info:
-            print(f"✗ No enabled resolutions found - SKIPPING")
-            print(f"  Edit {CONFIG_FILE} to enable resolutions")
-            return False, False, None
+        events.detail('resolution_missing', f"✗ No enabled resolutions found - SKIPPING\n"
+                      f"  Edit {CONFIG_FILE} to enable resolutions")
+        return None, None
+
+    def download_poster(self, page, selected_size, selected_info, output_dir="downloads", skip_existing=True):
+        """
+        Download the selected resolution and record it in the metadata store.
         
-        if prompt_confirm:
-            print()
-            response = input("Proceed with download? (yes/no): ").strip().lower()
-            if response not in ['yes', 'y']:
-                print("Download cancelled by user")
-                return False, False, None
+        Args:
+            page: Dict from fetch_poster_page() after enrich_poster()
+            selected_size: Resolution key from select_resolution()
+            selected_info: Resolution dict from select_resolution()
+            output_dir: Base directory for downloads
+            skip_existing: Whether to skip already downloaded files (default: True)
+            
+        Returns:
+            tuple: (success: bool, already_existed: bool, save_path: Optional[str])
+        """
+        url = page['url']
+        info = page['info']
+        tmdb_metadata = page.get('tmdb_metadata') or {}
+        imdb_id = page.get('imdb_id')
         
         download_url = self.construct_image_url(
             selected_info['link'],
@@ -863,20 +1537,23 @@ class PosterDownloader:
         success, already_existed = self.download_image(download_url, save_path, skip_if_exists=skip_existing)
         if success or already_existed:
             movie_slug = info.get('movie_slug') or info.get('base_name')
+            # Reuse the movie's existing entry whatever it was keyed by; with
+            # lazy enrichment the TMDb ID is not known yet at this point
             movie_key = (
-                (tmdb_metadata.get('tmdb_id') if tmdb_metadata else None)
+                self.metadata_store.find_key(imdb_id, info.get('year'), movie_slug)
+                or tmdb_metadata.get('tmdb_id')
                 or imdb_id
                 or (f"{info['year']}_{movie_slug}" if movie_slug else None)
                 or url
             )
             movie_metadata_payload = {
-                'movie_title': (tmdb_metadata.get('title') if tmdb_metadata else None) or info['movie_name'],
+                'movie_title': tmdb_metadata.get('title') or info['movie_name'],
                 'movie_slug': movie_slug,
                 'year': info.get('year'),
-                'release_date': tmdb_metadata.get('release_date') if tmdb_metadata else None,
-                'genres': genres,
+                'release_date': tmdb_metadata.get('release_date'),
+                'genres': page.get('genres') or [],
                 'imdb_id': imdb_id,
-                'tmdb_id': tmdb_metadata.get('tmdb_id') if tmdb_metadata else None
+                'tmdb_id': tmdb_metadata.get('tmdb_id')
             }
             poster_metadata_payload = {
                 'poster_page': url,
@@ -887,15 +1564,291 @@ class PosterDownloader:
                 'variant_slug': info.get('base_name'),
                 'downloaded_at': datetime.now(timezone.utc).isoformat()
             }
-            self.metadata_store.update_movie(
-                movie_key,
-                movie_metadata_payload,
-                poster_info=poster_metadata_payload,
-                source_url=url
-            )
+            with self.timings.time('save'):
+                self.metadata_store.update_movie(
+                    movie_key,
+                    movie_metadata_payload,
+                    poster_info=poster_metadata_payload,
+                    source_url=url
+                )
+            if page.get('enrich_later') and imdb_id and TMDB_API_KEY:
+                stored = self.metadata_store.data.get(str(movie_key)) or {}
+                if not (stored.get('tmdb_id') and stored.get('genres')):
+                    self.enricher.submit(movie_key, imdb_id)
             return success, already_existed, save_path
         return success, already_existed, None
 
+    def process_poster_page(self, url, output_dir="downloads", prompt_confirm=True, required_genres=None, skip_existing=True):
+        """
+        Process a single poster page: parse, identify best resolution, and download.
+        
+        Args:
+            url: Poster page URL
+            output_dir: Base directory for downloads
+            prompt_confirm: Whether to ask for confirmation before downloading (default: True)
+            required_genres: List of required genres (AND logic) or None to skip filter
+            skip_existing: Whether to skip already downloaded files (default: True)
+        
+        Returns:
+            tuple: (success: bool, already_existed: bool, save_path: Optional[str])
+        """
+        if self.cached_rejection(url, required_genres):
+            return False, False, None
+        
+        page = self.fetch_poster_page(url)
+        if not self.enrich_poster(page, required_genres):
+            return False, False, None
+        
+        info = page['info']
+        events.detail('poster', f"\nMovie: {info['movie_name']}\nYear: {info['year']}\nPoster: #{info['poster_number']}",
+                      url=url, movie=info['movie_name'], year=info['year'], poster_number=info['poster_number'])
+        
+        # Determine which resolution to download based on configuration
+        selected_size, selected_info = self.select_resolution(info)
+        if not selected_size or not selected_info:
+            return False, False, None
+        
+        if prompt_confirm:
+            print()
+            response = input("Proceed with download? (yes/no): ").strip().lower()
+            if response not in ['yes', 'y']:
+                print("Download cancelled by user")
+                return False, False, None
+        
+        return self.download_poster(page, selected_size, selected_info, output_dir, skip_existing)
+
+
+def build_poster_pipeline(downloader, required_genres=None, skip_existing=True, workers=None, include_fetch=True):
+    """
+    Build the fetch -> enrich -> download stages used for streaming batches.
+    
+    Args:
+        downloader: PosterDownloader instance
+        required_genres: List of required genres (AND logic) or None
+        skip_existing: Whether to skip already downloaded files
+        workers: Threads per stage (default: crawl.pipeline_workers)
+        include_fetch: False when jobs arrive with their pages already fetched
+        
+    Returns:
+        list: Stage objects for run_pipeline()
+    """
+    workers = workers or CONFIG.crawl.pipeline_workers
+    
+    def fetch(job):
+        if downloader.cached_rejection(job['url'], required_genres):
+            job['outcome'] = 'skipped'
+            return False
+        job.update(downloader.fetch_poster_page(job['url']))
+        return True
+    
+    def enrich(job):
+        if downloader.enrich_poster(job, required_genres):
+            return True
+        job['outcome'] = 'skipped'
+        return False
+    
+    def download(job):
+        info = job['info']
+        events.detail('poster', f"\nMovie: {info['movie_name']} ({info['year']}) • Poster #{info['poster_number']}",
+                      url=job['url'], movie=info['movie_name'], year=info['year'], poster_number=info['poster_number'])
+        selected_size, selected_info = downloader.select_resolution(info)
+        if not selected_size:
+            job['outcome'] = 'skipped'
+            return False
+        success, already_existed, save_path = downloader.download_poster(
+            job, selected_size, selected_info, skip_existing=skip_existing
+        )
+        job['save_path'] = save_path
+        if already_existed:
+            job['outcome'] = 'already_downloaded'
+        elif success:
+            job['outcome'] = 'downloaded'
+        else:
+            job['outcome'] = 'skipped'
+        return True
+    
+    stages = [
+        Stage('fetch', fetch, workers),
+        Stage('enrich', enrich, workers),
+        Stage('download', download, workers)
+    ]
+    return stages if include_fetch else stages[1:]
+
+
+def plan_poster_window(downloader, poster_urls, required_genres=None, workers=None):
+    """
+    Planning phase for a window of posters: fetch every page, then prefetch TMDb.
+    
+    Pages are fetched concurrently and their distinct IMDb IDs are resolved in
+    one TMDb burst, so the enrich stage applies genre rules from the cache and
+    only eligible posters are downloaded.
+    
+    Args:
+        downloader: PosterDownloader instance
+        poster_urls: List of poster page URLs
+        required_genres: List of required genres (AND logic) or None
+        workers: Concurrent page fetches and TMDb lookups
+            (default: crawl.max_concurrency and tmdb.enrich_workers)
+        
+    Returns:
+        list: Job dicts in input order (failed or cached-rejected ones carry an 'outcome')
+    """
+    def fetch(url):
+        job = {'url': url}
+        downloader.tracer.begin_job(job)
+        if downloader.cached_rejection(url, required_genres):
+            job['outcome'] = 'skipped'
+            return job
+        try:
+            with downloader.tracer.span('stage:fetch', poster=url, parent=job.get('trace_id')):
+                job.update(downloader.fetch_poster_page(url))
+        except Exception as e:
+            events.error('poster_failed', f"✗ Error processing poster (fetch): {e}", url=url, stage='fetch', error=str(e))
+            job['outcome'] = 'errors'
+            job['error'] = str(e)
+            job['exception'] = e
+        return job
+    
+    with ThreadPoolExecutor(max_workers=workers or CONFIG.crawl.max_concurrency) as pool:
+        jobs = list(pool.map(fetch, poster_urls))
+    
+    if downloader.genres_needed(required_genres):
+        downloader.prefetch_tmdb(
+            (job['imdb_id'] for job in jobs if job.get('imdb_id') and 'outcome' not in job),
+            workers=workers
+        )
+    return jobs
+
+
+def iter_planned_jobs(downloader, poster_urls, required_genres=None, window=None, workers=None):
+    """
+    Group a poster URL stream into planning windows and yield prefetched jobs.
+    
+    Windows keep memory bounded on unbounded streams (e.g. --backfill) while
+    each window's TMDb lookups are still batched together.
+    
+    Args:
+        downloader: PosterDownloader instance
+        poster_urls: Iterable of poster page URLs
+        required_genres: List of required genres (AND logic) or None
+        window: URLs planned per batch (default: crawl.prefetch_window)
+        workers: Concurrent page fetches and TMDb lookups per window (see plan_poster_window)
+        
+    Yields:
+        dict: Job dicts for the enrich -> download stages
+    """
+    window = window or CONFIG.crawl.prefetch_window
+    batch = []
+    for url in poster_urls:
+        batch.append(url)
+        if len(batch) >= window:
+            yield from plan_poster_window(downloader, batch, required_genres, workers)
+            batch = []
+    if batch:
+        yield from plan_poster_window(downloader, batch, required_genres, workers)
+
+
+def is_permanent_failure(error):
+    """True for errors a later retry cannot fix (4xx responses other than 429)."""
+    import requests
+    
+    response = getattr(error, 'response', None)
+    if not isinstance(error, requests.HTTPError) or response is None:
+        return False
+    return 400 <= response.status_code < 500 and response.status_code != 429
+
+
+def process_poster_stream(downloader, poster_urls, required_genres=None, skip_existing=True, workers=None, on_complete=None, progress=None, prefetch=None, retry_failed=True, plan_workers=None):
+    """
+    Stream poster URLs through the concurrent fetch -> enrich -> download pipeline.
+    
+    With TMDb prefetch enabled (crawl.tmdb_prefetch), pages are fetched in
+    planning windows and each window's movies are resolved on TMDb in one
+    burst before enrich -> download runs on them.
+    
+    Posters that failed in earlier runs and are due for another attempt are
+    processed first; posters that fail in this run are saved to the
+    failed-jobs file for the next one.
+    
+    Args:
+        downloader: PosterDownloader instance
+        poster_urls: Iterable (list or generator) of poster page URLs
+        required_genres: List of required genres (AND logic) or None
+        skip_existing: Whether to skip already downloaded files
+        workers: Threads per stage (default: crawl.pipeline_workers)
+        on_complete: Optional callback(job) for each finished poster
+        progress: Optional ProgressReporter (a new one is created by default)
+        prefetch: Plan windows with a TMDb prefetch (default: crawl.tmdb_prefetch)
+        retry_failed: Drain and update the persisted failed-jobs file
+        plan_workers: Concurrent page fetches and TMDb lookups while planning
+            (default: crawl.max_concurrency and tmdb.enrich_workers)
+        
+    Returns:
+        tuple: (stats dict, ProgressReporter)
+    """
+    progress = progress or ProgressReporter()
+    if prefetch is None:
+        prefetch = CONFIG.crawl.tmdb_prefetch
+    failed_jobs = downloader.failed_jobs if retry_failed else None
+    source = poster_urls
+    
+    if failed_jobs is not None:
+        retry_urls = failed_jobs.due()
+        if retry_urls:
+            events.info('failed_retry', f"\n↻ Retrying {len(retry_urls)} poster(s) that failed in earlier runs",
+                        posters=len(retry_urls))
+        retry_set = set(retry_urls)
+        source = itertools.chain(retry_urls, (url for url in poster_urls if url not in retry_set))
+        
+        def track(job):
+            if job.get('outcome') == 'errors' and is_permanent_failure(job.get('exception')):
+                failed_jobs.resolve(job['url'])
+            elif job.get('outcome') == 'errors':
+                if not failed_jobs.record_failure(job['url'], job.get('error', '')):
+                    events.error('failed_gave_up', f"✗ Giving up on {job['url']} after {failed_jobs.max_attempts} failed runs",
+                                 url=job['url'], attempts=failed_jobs.max_attempts)
+            else:
+                failed_jobs.resolve(job['url'])
+            if on_complete:
+                on_complete(job)
+    else:
+        track = on_complete
+    
+    if prefetch:
+        source = iter_planned_jobs(downloader, source, required_genres, workers=plan_workers)
+    stats = run_pipeline(
+        source,
+        build_poster_pipeline(downloader, required_genres, skip_existing, workers, include_fetch=not prefetch),
+        queue_size=CONFIG.crawl.pipeline_queue_size,
+        progress=progress,
+        on_complete=track,
+        tracer=downloader.tracer
+    )
+    for outcome in ('downloaded', 'already_downloaded', 'skipped', 'errors'):
+        downloader.count(outcome, stats.get(outcome, 0))
+    
+    if failed_jobs is not None:
+        failed_jobs.save()
+        if len(failed_jobs):
+            events.notice('failed_queued', f"\nℹ️  {len(failed_jobs)} failed poster(s) queued for retry in {failed_jobs.path}",
+                          posters=len(failed_jobs), path=failed_jobs.path)
+    return stats, progress
+
+
+def parse_year_range(value):
+    """
+    Parse a FROM-TO year range for --backfill (a single year is also accepted).
+    
+    Returns:
+        tuple: (first_year: int, last_year: int) in ascending order
+    """
+    match = re.fullmatch(r'\s*(\d{4})\s*(?:-\s*(\d{4})\s*)?', value)
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid year range '{value}' (expected e.g. 1910-2025)")
+    first = int(match.group(1))
+    last = int(match.group(2) or first)
+    return (min(first, last), max(first, last))
+
 
 def main():
     # Parse command-line arguments
@@ -903,10 +1856,19 @@ def main():
         description='IMP Awards Poster Downloader - Download high-resolution movie posters',
         epilog='If no arguments provided, interactive menu will be shown.'
     )
+    parser.add_argument('command', nargs='?', choices=['enqueue', 'worker', 'trace-summary'],
+                        help='enqueue: add posters selected by --latest/--year/--backfill/--movie to the shared job queue; '
+                             'worker: process jobs from the shared job queue until it is drained; '
+                             'trace-summary: report the slowest posters, operations and hosts in a --trace file')
     parser.add_argument('--latest', action='store_true',
                         help='Download all posters from the recent additions page')
     parser.add_argument('--year', type=int, metavar='YEAR',
                         help='Download all posters for a specific year (e.g., --year=2024)')
+    parser.add_argument('--backfill', type=parse_year_range, metavar='FROM-TO',
+                        help='Download all posters for a range of years, newest first (e.g., --backfill 1910-2025)')
+    parser.add_argument('--concurrency', type=int, metavar='N',
+                        help=f"Global concurrency budget for --backfill (default: {CONFIG.crawl.max_concurrency}); "
+                             f"concurrent TMDb lookups for --enrich (default: {CONFIG.tmdb.enrich_workers})")
     parser.add_argument('--genre', action='append', metavar='GENRE',
                         help='Filter by genre (can be used multiple times for AND logic, e.g., --genre=animation --genre=comedy)')
     parser.add_argument('--pages', type=int, metavar='N',
@@ -917,17 +1879,60 @@ def main():
                         help='Download all posters for a specific movie (enter path or full URL, e.g., 2025/tron_ares.html)')
     parser.add_argument('--email-digest', action='store_true',
                         help='Send email digest of new posters since the last successful digest run')
-    parser.add_argument('--digest-pages', type=int, metavar='N', default=5,
-                        help='Maximum number of latest pages to scan when building the digest (default: 5)')
+    parser.add_argument('--digest-pages', type=int, metavar='N', default=CONFIG.digest.default_pages,
+                        help=f"Maximum number of latest pages to scan when building the digest (default: {CONFIG.digest.default_pages})")
     parser.add_argument('--digest-test', action='store_true',
                         help='Prefix digest email subjects with [TEST]')
+    parser.add_argument('--enrich', action='store_true',
+                        help='Fill in missing TMDb metadata (release date, TMDb ID, genres) for movies already in the metadata store')
+    parser.add_argument('--record', metavar='DIR',
+                        help='Record every HTTP response (pages, images, TMDb) to a cassette directory')
+    parser.add_argument('--replay', metavar='DIR',
+                        help='Serve every HTTP request from a recorded cassette directory (no network)')
+    parser.add_argument('--replay-latency', type=float, metavar='MS', default=0,
+                        help='Latency injected into each replayed response, in milliseconds')
+    parser.add_argument('--replay-jitter', type=float, metavar='MS', default=0,
+                        help='Random +/- variation on --replay-latency, in milliseconds')
+    parser.add_argument('--timings', metavar='FILE',
+                        help='Write per-stage timing histograms (fetch, parse, TMDb, download, ...) to a JSON file')
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help='Only print summaries, progress, warnings and errors (no per-poster lines)')
+    parser.add_argument('--json-events', action='store_true',
+                        help='Print one JSON event per line (level, event, message and fields) instead of text')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='Write one JSON span per HTTP request, parse, TMDb call, download, store flush and '
+                             'email send to FILE (JSONL); read it back with the trace-summary command')
+    parser.add_argument('--profile', nargs='?', const='cpu', choices=PROFILE_KINDS, metavar='cpu|alloc',
+                        help='Profile the run: cpu (cProfile stats + collapsed stacks for flamegraphs, the default) '
+                             'or alloc (tracemalloc top allocation sites + peak memory per stage)')
+    parser.add_argument('--profile-dir', metavar='DIR', default=CONFIG.files.profiles_dir,
+                        help=f"Directory for timestamped --profile output (default: {CONFIG.files.profiles_dir})")
+    parser.add_argument('--queue-dir', metavar='DIR', default=CONFIG.queue.dir,
+                        help=f"Shared job queue directory for enqueue/worker (default: {CONFIG.queue.dir})")
+    parser.add_argument('--worker-id', metavar='ID',
+                        help='Worker name recorded on leased jobs (default: hostname-pid)')
     
     args = parser.parse_args()
+    if args.record and args.replay:
+        parser.error('--record and --replay cannot be combined')
+    if args.command == 'trace-summary':
+        if not args.trace:
+            parser.error('trace-summary needs --trace FILE')
+        for line in summarize_trace(args.trace):
+            print(line)
+        return
     
-    print("=" * 60)
-    print("IMP Awards Poster Downloader")
-    print("=" * 60)
-    print()
+    events.configure(quiet=args.quiet, json_events=args.json_events)
+    events.info('start', f"{'=' * 60}\nIMP Awards Poster Downloader\n{'=' * 60}\n", mode=run_mode(args))
+    report_problems(CONFIG)
+    
+    # Gate the digest before anything heavy is loaded (requests, the email
+    # stack, caches), so a cron run on a disabled day exits right away
+    if args.email_digest and not args.command:
+        should_run, reason = should_run_today()
+        if not should_run:
+            events.notice('digest_skipped', f"ℹ️  Skipping digest run: {reason}", reason=reason)
+            return
     
     # Handle --startfresh flag
     skip_existing = not args.startfresh  # Disable duplicate checking if starting fresh
@@ -936,17 +1941,107 @@ def main():
         import shutil
         downloads_dir = 'downloads'
         if os.path.exists(downloads_dir):
-            print(f"🗑️  Clearing downloads folder...")
+            events.info('downloads_clearing', "🗑️  Clearing downloads folder...")
             shutil.rmtree(downloads_dir)
-            print(f"✓ Downloads folder cleared\n")
+            events.info('downloads_cleared', "✓ Downloads folder cleared\n", path=downloads_dir)
         else:
-            print(f"ℹ️  Downloads folder doesn't exist yet\n")
+            events.info('downloads_missing', "ℹ️  Downloads folder doesn't exist yet\n", path=downloads_dir)
     
-    downloader = PosterDownloader()
+    tracer = Tracer(args.trace) if args.trace else None
+    downloader = PosterDownloader(max_connections=args.concurrency, tracer=tracer)
+    if args.record:
+        downloader.use_cassette('record', args.record)
+    elif args.replay:
+        downloader.use_cassette('replay', args.replay, args.replay_latency, args.replay_jitter)
+        if not TMDB_API_KEY:
+            # Cassettes never store the key; any value replays TMDb responses
+            set_tmdb_api_key('replay', downloader)
+    profiler = None
+    if args.profile:
+        profiler = RunProfiler(args.profile, args.profile_dir, run_mode(args))
+        profiler.start(downloader.timings)
+    started = time.monotonic()
+    succeeded = False
+    try:
+        run_cli(parser, args, downloader, skip_existing)
+        succeeded = True
+    finally:
+        downloader.close()
+        if profiler:
+            profiler.stop()
+        downloader.tracer.close()
+        if args.timings:
+            downloader.timings.save(args.timings)
+            events.notice('timings_written', f"✓ Stage timings written to {args.timings}", path=args.timings)
+        from metrics_export import export_run_metrics
+        
+        export_run_metrics(
+            downloader, run_mode(args), time.monotonic() - started,
+            textfile=CONFIG.metrics.textfile,
+            push_url=CONFIG.metrics.push_url,
+            succeeded=succeeded
+        )
+
+
+def run_mode(args):
+    """Name of the mode run_cli() dispatches to (the ``mode`` label on exported metrics)."""
+    if args.command:
+        return args.command
+    for flag, mode in (('enrich', 'enrich'), ('email_digest', 'digest'), ('movie', 'movie'),
+                       ('latest', 'latest'), ('year', 'year'), ('backfill', 'backfill')):
+        if getattr(args, flag):
+            return mode
+    return 'interactive'
+
+
+def set_tmdb_api_key(api_key, downloader=None):
+    """Override the TMDb API key for this process (used by --replay)."""
+    global TMDB_API_KEY
+    TMDB_API_KEY = api_key
+    if downloader:
+        downloader.tmdb.api_key = api_key
+
+
+def run_cli(parser, args, downloader, skip_existing):
+    """Dispatch parsed command-line arguments to the selected mode."""
+    if args.command:
+        queue = LeasedJobQueue(
+            args.queue_dir,
+            lease_seconds=CONFIG.queue.lease_seconds,
+            max_attempts=CONFIG.queue.max_attempts
+        )
+        if args.command == 'enqueue':
+            if args.movie:
+                poster_urls = downloader.get_movie_posters(args.movie)
+            elif args.year:
+                poster_urls = downloader.get_year_posters(args.year)
+            elif args.backfill:
+                poster_urls = list(downloader.iter_backfill_posters(
+                    range(args.backfill[0], args.backfill[1] + 1),
+                    max_workers=args.concurrency or CONFIG.crawl.max_concurrency
+                ))
+            elif args.latest:
+                poster_urls = downloader.get_recent_posters(num_pages=args.pages if args.pages else 1)
+            else:
+                parser.error('enqueue requires one of --latest, --year, --backfill or --movie')
+            enqueue_jobs(queue, poster_urls)
+        else:
+            run_worker(
+                downloader,
+                queue,
+                worker_id=args.worker_id,
+                required_genres=args.genre,
+                skip_existing=skip_existing,
+                poll_seconds=CONFIG.queue.poll_seconds
+            )
+        return
     
     # Check for command-line mode
+    if args.enrich:
+        process_enrichment(downloader, workers=args.concurrency)
+        return
     if args.email_digest:
-        max_pages = args.digest_pages if args.digest_pages and args.digest_pages > 0 else 5
+        max_pages = args.digest_pages if args.digest_pages and args.digest_pages > 0 else CONFIG.digest.default_pages
         subject_prefix = "[TEST]" if args.digest_test else ""
         run_email_digest(
             downloader,
@@ -974,6 +2069,16 @@ def main():
         # Process specific year via command line (auto-confirm for automation)
         process_year_posters(downloader, args.year, required_genres=args.genre, auto_confirm=True, skip_existing=skip_existing)
         return
+    elif args.backfill:
+        process_backfill(
+            downloader,
+            args.backfill[0],
+            args.backfill[1],
+            required_genres=args.genre,
+            skip_existing=skip_existing,
+            concurrency=args.concurrency
+        )
+        return
     
     # Interactive menu mode
     print("What would you like to do?")
@@ -1036,10 +2141,78 @@ def main():
         sys.exit(1)
 
 
+def print_batch_summary(title, stats, progress=None, downloader=None):
+    """Print the end-of-run statistics block shared by all batch modes."""
+    lines = [
+        "\n" + "=" * 60,
+        title,
+        "=" * 60,
+        f"Total posters:        {stats['total']}",
+        f"New downloads:        {stats['downloaded']}",
+        f"Already downloaded:   {stats['already_downloaded']}",
+        f"Skipped:              {stats['skipped']}",
+        f"Errors:               {stats['errors']}"
+    ]
+    fields = {key: stats[key] for key in ('total', 'downloaded', 'already_downloaded', 'skipped', 'errors')}
+    if progress:
+        elapsed = time.monotonic() - progress.started_at
+        lines.append(f"Elapsed:              {format_duration(elapsed)} ({progress.rate():.2f} posters/sec)")
+        fields.update(elapsed_seconds=round(elapsed, 3), posters_per_sec=round(progress.rate(), 3))
+    if downloader:
+        host_lines = downloader.http.summary_lines()
+        if host_lines:
+            lines.append("HTTP:")
+            lines.extend(f"  {line}" for line in host_lines)
+        lines.extend(stage_timing_lines(downloader))
+        fields['stages'] = stage_timing_fields(downloader)
+    lines.append("=" * 60)
+    events.block(events.NOTICE, 'batch_summary', lines, title=title, **fields)
+
+
+def stage_timing_lines(downloader):
+    """The "Stages:" block for the per-stage timing histograms collected so far."""
+    stage_lines = downloader.timings.summary_lines()
+    if not stage_lines:
+        return []
+    return ["Stages:"] + [f"  {line}" for line in stage_lines]
+
+
+def stage_timing_fields(downloader):
+    """Compact per-stage count/total/p50/p95 for JSON events."""
+    return {
+        name: {key: data[key] for key in ('count', 'total_seconds', 'p50_seconds', 'p95_seconds')}
+        for name, data in downloader.timings.as_dict().items()
+    }
+
+
+def print_stage_timings(downloader):
+    """Print the per-stage timing histograms collected so far."""
+    lines = stage_timing_lines(downloader)
+    if lines:
+        events.block(events.NOTICE, 'stage_timings', lines, stages=stage_timing_fields(downloader))
+
+
+def announce_filters(required_genres=None):
+    """Note the --genre filter (if any) and the blocklist before a batch starts."""
+    lines = []
+    if required_genres:
+        lines.append(f"Genre filter: Movies must match ALL of: {', '.join(required_genres)}")
+    lines.append("Posters will be filtered by your genre blocklist settings")
+    events.info('filters', '\n'.join(lines), required_genres=required_genres or [])
+
+
+def announce_batch(title, **fields):
+    """Print the banner that starts a batch."""
+    events.info('batch_started', f"\n{'=' * 60}\n{title}\n{'=' * 60}", title=title, **fields)
+
+
 def process_recent_additions(downloader, required_genres=None, num_pages=1, auto_confirm=False, skip_existing=True):
     """
     Process all posters from the recent additions page(s).
     
+    In auto-confirm mode posters are streamed into the pipeline as each
+    archive page is parsed, so downloads start before the crawl finishes.
+    
     Args:
         downloader: PosterDownloader instance
         required_genres: List of required genres (AND logic) or None
@@ -1047,73 +2220,91 @@ def process_recent_additions(downloader, required_genres=None, num_pages=1, auto
         auto_confirm: If True, skip confirmation prompt (for command-line mode)
         skip_existing: Whether to skip already downloaded files (default: True)
     """
-    # Get list of recent posters
-    poster_urls = downloader.get_recent_posters(num_pages=num_pages)
-    
-    if not poster_urls:
-        print("✗ No posters found on recent additions page")
-        return
-    
-    print(f"\nReady to process {len(poster_urls)} posters from recent additions")
-    if required_genres:
-        print(f"Genre filter: Movies must match ALL of: {', '.join(required_genres)}")
-    print("Posters will be filtered by your genre blocklist settings")
-    print()
+    if auto_confirm:
+        poster_urls = downloader.iter_recent_posters(num_pages=num_pages)
+        events.info('batch_source', f"\nStreaming posters from {num_pages} recent additions page(s)", pages=num_pages)
+    else:
+        # Get list of recent posters so the user can confirm the batch size
+        poster_urls = downloader.get_recent_posters(num_pages=num_pages)
+        
+        if not poster_urls:
+            events.error('no_posters', "✗ No posters found on recent additions page")
+            return
+        
+        events.info('batch_source', f"\nReady to process {len(poster_urls)} posters from recent additions",
+                    posters=len(poster_urls), pages=num_pages)
+    announce_filters(required_genres)
     
     if not auto_confirm:
+        print()
         response = input(f"Continue with batch processing? (yes/no): ").strip().lower()
         if response not in ['yes', 'y']:
-            print("Cancelled by user")
+            events.info('cancelled', "Cancelled by user")
             return
     
-    print("\n" + "=" * 60)
-    print("Starting batch processing...")
-    print("=" * 60)
+    announce_batch("Starting batch processing...")
     
-    stats = {
-        'total': len(poster_urls),
-        'downloaded': 0,
-        'already_downloaded': 0,
-        'skipped': 0,
-        'blocked': 0,
-        'errors': 0
-    }
+    stats, progress = process_poster_stream(
+        downloader,
+        poster_urls,
+        required_genres=required_genres,
+        skip_existing=skip_existing
+    )
     
-    for i, url in enumerate(poster_urls, 1):
-        print(f"\n[{i}/{stats['total']}] Processing: {url}")
-        print("-" * 60)
-        
-        try:
-            success, already_existed, _ = downloader.process_poster_page(
-                url,
-                prompt_confirm=False,
-                required_genres=required_genres,
-                skip_existing=skip_existing
-            )
-            if success:
-                stats['downloaded'] += 1
-            elif already_existed:
-                stats['already_downloaded'] += 1
-            else:
-                stats['skipped'] += 1
-        except KeyboardInterrupt:
-            print("\n\n✗ Interrupted by user")
-            break
-        except Exception as e:
-            print(f"✗ Error processing poster: {e}")
-            stats['errors'] += 1
-            continue
+    if not stats['total']:
+        events.error('no_posters', "✗ No posters found on recent additions page")
+        return
     
     # Final statistics
-    print("\n" + "=" * 60)
-    print("BATCH PROCESSING COMPLETE")
-    print("=" * 60)
-    print(f"Total posters:        {stats['total']}")
-    print(f"New downloads:        {stats['downloaded']}")
-    print(f"Already downloaded:   {stats['already_downloaded']}")
-    print(f"Skipped:              {stats['skipped']}")
-    print(f"Errors:               {stats['errors']}")
-    print("=" * 60)
+    print_batch_summary("BATCH PROCESSING COMPLETE", stats, progress, downloader)
+
+
+def process_backfill(downloader, first_year, last_year, required_genres=None, skip_existing=True, concurrency=None):
+    """
+    Process every poster across a range of years as a single managed run.
+    
+    Year indexes are fetched concurrently and streamed newest-first into the
+    fetch -> enrich -> download pipeline. Index fetches, window planning
+    (page fetches and the TMDb prefetch) and the pipeline stages share one
+    global concurrency budget.
+    
+    Args:
+        downloader: PosterDownloader instance
+        first_year: Oldest year to include
+        last_year: Newest year to include
+        required_genres: List of required genres (AND logic) or None
+        skip_existing: Whether to skip already downloaded files (default: True)
+        concurrency: Global concurrency budget (default: crawl.max_concurrency)
+    """
+    budget = max(4, concurrency or CONFIG.crawl.max_concurrency)
+    index_workers = max(1, budget // 4)
+    stage_workers = max(1, (budget - index_workers) // 3)
+    years = range(first_year, last_year + 1)
+    
+    events.info('batch_source', f"\nBackfilling {len(years)} year(s): {last_year} → {first_year}\n"
+                f"Concurrency budget: {budget} ({index_workers} index fetchers, {stage_workers} workers per pipeline stage)",
+                first_year=first_year, last_year=last_year, concurrency=budget)
+    announce_filters(required_genres)
+    announce_batch("Starting backfill...")
+    
+    # Index sizes feed the ETA before their posters reach the pipeline
+    progress = ProgressReporter()
+    poster_urls = downloader.iter_backfill_posters(
+        years,
+        max_workers=index_workers,
+        on_index_loaded=lambda year, count: progress.add_expected(count)
+    )
+    stats, progress = process_poster_stream(
+        downloader,
+        poster_urls,
+        required_genres=required_genres,
+        skip_existing=skip_existing,
+        workers=stage_workers,
+        plan_workers=stage_workers,
+        progress=progress
+    )
+    
+    print_batch_summary(f"BACKFILL COMPLETE FOR {first_year}-{last_year}", stats, progress, downloader)
 
 
 def run_email_digest(
@@ -1126,61 +2317,65 @@ def run_email_digest(
     """
     Crawl recent additions until the last emailed poster, download new files,
     and send an email digest.
+    
+    The schedule (``should_run_today``) is checked by main() before the
+    downloader is built; callers that bypass main() should check it first.
     """
-    # Check schedule configuration
-    should_run, reason = should_run_today()
-    if not should_run:
-        print(f"ℹ️  Skipping digest run: {reason}")
-        return
+    from digest_tracker import DigestTracker
+    from email_sender import EmailSender
     
     tracker = DigestTracker()
     known_ids = tracker.get_known_ids()
     
-    poster_urls, crawl_details = downloader.get_recent_posters(
+    crawl_details: Dict = {}
+    poster_urls = downloader.iter_recent_posters(
         num_pages=max_pages,
         stop_after_ids=known_ids,
-        return_details=True
+        details=crawl_details
     )
     
-    if not poster_urls:
-        if crawl_details['found_known']:
-            print("ℹ️  No new posters since the last digest.")
+    events.info('digest_started', "\nPreparing digest from recent additions", pages=max_pages)
+    
+    # The failed-jobs file holds posters from --year/--backfill runs, which
+    # must not be emailed as new; a failed digest poster is never recorded as
+    # sent, so the next digest's crawl reaches it again anyway.
+    finished_jobs: List[Dict] = []
+    stats, _ = process_poster_stream(
+        downloader,
+        poster_urls,
+        required_genres=required_genres,
+        skip_existing=skip_existing,
+        on_complete=finished_jobs.append,
+        retry_failed=False
+    )
+    
+    print_stage_timings(downloader)
+    
+    if not stats['total']:
+        if crawl_details.get('found_known'):
+            events.notice('digest_empty', "ℹ️  No new posters since the last digest.", reason='no_new_posters')
         else:
-            print("ℹ️  No posters discovered within the requested page window.")
-            print("    Tip: Increase --digest-pages to scan deeper into the archive.")
+            events.notice('digest_empty', "ℹ️  No posters discovered within the requested page window.\n"
+                          "    Tip: Increase --digest-pages to scan deeper into the archive.", reason='page_window')
         return
     
-    print(f"\nPreparing digest for {len(poster_urls)} poster(s)")
-    
     downloaded_paths: List[str] = []
     emailed_ids: List[str] = []
     skipped_ids: List[str] = []
     
-    for i, url in enumerate(poster_urls, 1):
-        print(f"\n[{i}/{len(poster_urls)}] Processing digest poster: {url}")
-        try:
-            success, already_existed, save_path = downloader.process_poster_page(
-                url,
-                prompt_confirm=False,
-                required_genres=required_genres,
-                skip_existing=skip_existing
-            )
-            if success or already_existed:
-                if save_path and save_path not in downloaded_paths:
-                    downloaded_paths.append(save_path)
-                emailed_ids.append(url)
-            else:
-                skipped_ids.append(url)
-        except KeyboardInterrupt:
-            print("\n✗ Digest interrupted by user")
-            break
-        except Exception as exc:
-            print(f"✗ Error processing poster for digest: {exc}")
-            skipped_ids.append(url)
-            continue
+    # Posters finish out of order; keep the archive's newest-first order
+    for job in sorted(finished_jobs, key=lambda job: job['index']):
+        if job.get('outcome') in ('downloaded', 'already_downloaded'):
+            save_path = job.get('save_path')
+            if save_path and save_path not in downloaded_paths:
+                downloaded_paths.append(save_path)
+            emailed_ids.append(job['url'])
+        else:
+            skipped_ids.append(job['url'])
     
     if not downloaded_paths:
-        print("\nℹ️  No posters downloaded or already present for emailing.")
+        events.notice('digest_empty', "\nℹ️  No posters downloaded or already present for emailing.",
+                      reason='nothing_downloaded', skipped=len(skipped_ids))
         if skipped_ids:
             tracker.record_ignored(skipped_ids)
             tracker.save()
@@ -1188,10 +2383,13 @@ def run_email_digest(
     
     prefix = subject_prefix.strip()
     if prefix:
-        print(f"\nUsing email subject prefix: {prefix}")
+        events.info('digest_prefix', f"\nUsing email subject prefix: {prefix}", prefix=prefix)
     
-    sender = EmailSender()
+    sender = EmailSender(timings=downloader.timings, tracer=downloader.tracer)
     emails_sent = sender.send_poster_updates(downloaded_paths, subject_prefix=prefix)
+    downloader.count('email_batches_sent', sender.batches_sent)
+    downloader.count('email_batches_failed', sender.batches_failed)
+    downloader.count('email_attempts_failed', sender.attempts_failed)
     
     if emails_sent > 0:
         if emailed_ids:
@@ -1200,171 +2398,275 @@ def run_email_digest(
             tracker.record_ignored(skipped_ids)
         tracker.save()
     else:
-        print("✗ Email delivery failed; digest state not advanced.")
+        events.error('digest_failed', "✗ Email delivery failed; digest state not advanced.",
+                     batches_failed=sender.batches_failed)
         if skipped_ids:
             tracker.record_ignored(skipped_ids)
         tracker.save()
 
 
-def process_movie_posters(downloader, movie_identifier, required_genres=None, auto_confirm=False, skip_existing=True):
+def process_enrichment(downloader, workers=None):
     """
-    Process all posters for a specific movie (all variants).
+    Resolve missing TMDb metadata for every incomplete movie in the store.
     
     Args:
         downloader: PosterDownloader instance
-        movie_identifier: Path or URL to the movie poster page
-        required_genres: List of required genres (AND logic) or None
-        auto_confirm: Skip confirmation prompt when True
-        skip_existing: Whether to skip already downloaded files
+        workers: Concurrent TMDb lookups (default: tmdb.enrich_workers)
     """
-    poster_urls, details = downloader.get_movie_posters(movie_identifier, return_details=True)
+    if not TMDB_API_KEY:
+        events.error('tmdb_key_missing', "✗ TMDb API key not set. Set TMDB_API_KEY environment variable.")
+        return
+    
+    workers = workers or CONFIG.tmdb.enrich_workers
+    events.info('enrich_started', f"\nEnriching {downloader.metadata_store.path} from TMDb ({workers} concurrent lookups)",
+                path=downloader.metadata_store.path, workers=workers)
+    start = time.monotonic()
+    stats = enrich_store(downloader.metadata_store, downloader.tmdb, workers=workers)
     
+    elapsed = time.monotonic() - start
+    lines = [
+        f"\n{'=' * 60}",
+        "Enrichment Summary:",
+        f"  Incomplete entries: {stats['incomplete']}",
+        f"  Enriched: {stats['resolved']}",
+        f"  Not found on TMDb: {stats['not_found']}",
+        f"  Errors: {stats['errors']}",
+        f"  TMDb requests: {downloader.tmdb.requests_made}",
+        f"  Elapsed: {format_duration(elapsed)}"
+    ]
+    lines.extend(f"  {line}" for line in downloader.http.summary_lines())
+    lines.append(f"{'=' * 60}")
+    events.block(events.NOTICE, 'enrich_summary', lines, tmdb_requests=downloader.tmdb.requests_made,
+                 elapsed_seconds=round(elapsed, 3), **stats)
+
+
+def enqueue_jobs(queue, poster_urls):
+    """
+    Add poster page URLs to the shared worker queue.
+    
+    Args:
+        queue: LeasedJobQueue instance
+        poster_urls: Poster page URLs to queue (already-known URLs are skipped)
+        
+    Returns:
+        int: Number of newly queued jobs
+    """
     if not poster_urls:
-        print("✗ No posters found for that movie")
-        return
+        events.error('no_posters', "✗ No posters found to enqueue")
+        return 0
     
-    movie_title = details.get('movie_title', 'Unknown Movie')
-    year = details.get('year', 'unknown')
+    added = queue.enqueue(poster_urls)
+    counts = queue.counts()
+    events.notice('enqueued', f"\n✓ Queued {added} new job(s) ({len(poster_urls) - added} already known)\n"
+                  f"  Queue: {counts['pending']} pending, {counts['leased']} leased, "
+                  f"{counts['done']} done, {counts['failed']} failed", added=added, **counts)
+    return added
+
+
+def run_worker(downloader, queue, worker_id=None, required_genres=None, skip_existing=True, poll_seconds=5):
+    """
+    Process poster jobs from the shared queue until it is drained.
     
-    print(f"\nReady to process {len(poster_urls)} posters for {movie_title} ({year})")
-    if required_genres:
-        print(f"Genre filter: Movies must match ALL of: {', '.join(required_genres)}")
-    print("Posters will be filtered by your genre blocklist settings")
-    print()
+    Each job is leased while it is processed; if this worker dies the lease
+    expires and another worker picks the job up. A finished job stays
+    leased until the metadata store flush that includes its update, so a
+    worker that dies between flushes leaves its unsaved jobs to be redone
+    rather than marked done. The worker exits once no job is pending or
+    leased anywhere.
     
-    if not auto_confirm:
-        response = input(f"Continue with batch processing? (yes/no): ").strip().lower()
-        if response not in ['yes', 'y']:
-            print("Cancelled by user")
-            return
+    Args:
+        downloader: PosterDownloader instance
+        queue: LeasedJobQueue instance
+        worker_id: Name recorded on leased jobs (default: hostname-pid)
+        required_genres: List of required genres (AND logic) or None
+        skip_existing: Whether to skip already downloaded files (default: True)
+        poll_seconds: Idle wait while other workers still hold leases
+    """
+    worker_id = worker_id or default_worker_id()
     
-    print("\n" + "=" * 60)
-    print(f"Starting batch processing for {movie_title}...")
-    print("=" * 60)
+    announce_batch(f"Worker {worker_id} processing queue: {queue.root}", worker=worker_id, queue=queue.root)
     
     stats = {
-        'total': len(poster_urls),
+        'processed': 0,
         'downloaded': 0,
         'already_downloaded': 0,
         'skipped': 0,
-        'blocked': 0,
         'errors': 0
     }
     
-    for i, url in enumerate(poster_urls, 1):
-        print(f"\n[{i}/{stats['total']}] Processing: {url}")
-        print("-" * 60)
+    store = downloader.metadata_store
+    # (job, store flush count that makes its metadata durable)
+    finished = []
+    
+    def settle():
+        """Complete finished jobs whose metadata has reached the store file."""
+        waiting = []
+        for done_job, needed in finished:
+            if store.flushes < needed:
+                waiting.append((done_job, needed))
+            elif not queue.complete(done_job):
+                events.warning('lease_lost', f"  Warning: Lease on {done_job.url} expired before it was completed",
+                               worker=worker_id, url=done_job.url)
+        finished[:] = waiting
+    
+    while True:
+        job = queue.claim(worker_id)
+        if job is None:
+            # Publish our batch and complete its jobs; they count as leased
+            # for is_drained() until then
+            store.save()
+            settle()
+            if queue.is_drained():
+                break
+            time.sleep(poll_seconds)
+            continue
+        
+        downloader.refresh_config()
+        stats['processed'] += 1
+        events.detail('job_claimed', f"\n[{worker_id} #{stats['processed']}] Processing: {job.url}\n{'-' * 60}",
+                      worker=worker_id, url=job.url, number=stats['processed'])
         
         try:
-            success, already_existed, _ = downloader.process_poster_page(
-                url,
-                prompt_confirm=False,
-                required_genres=required_genres,
-                skip_existing=skip_existing
-            )
-            if success:
-                stats['downloaded'] += 1
-            elif already_existed:
-                stats['already_downloaded'] += 1
-            else:
-                stats['skipped'] += 1
+            held = [done_job for done_job, _ in finished]
+            with LeaseKeeper(queue, job, *held), downloader.tracer.span('poster', poster=job.url) as span:
+                success, already_existed, _ = downloader.process_poster_page(
+                    job.url,
+                    prompt_confirm=False,
+                    required_genres=required_genres,
+                    skip_existing=skip_existing
+                )
+                span.set(outcome='already_downloaded' if already_existed else 'downloaded' if success else 'skipped')
         except KeyboardInterrupt:
-            print("\n\n✗ Interrupted by user")
+            events.warning('interrupted', "\n\n✗ Interrupted by user")
+            queue.release(job)
             break
         except Exception as e:
-            print(f"✗ Error processing poster: {e}")
+            requeued = queue.fail(job, str(e))
+            events.error('poster_failed', f"✗ Error processing poster: {e}" + (" (requeued)" if requeued else " (giving up)"),
+                         url=job.url, error=str(e), requeued=requeued)
             stats['errors'] += 1
             continue
+        
+        finished.append((job, store.durable_after()))
+        settle()
+        if success:
+            stats['downloaded'] += 1
+        elif already_existed:
+            stats['already_downloaded'] += 1
+        else:
+            stats['skipped'] += 1
     
-    print("\n" + "=" * 60)
-    print(f"BATCH PROCESSING COMPLETE FOR {movie_title}")
-    print("=" * 60)
-    print(f"Total posters:        {stats['total']}")
-    print(f"New downloads:        {stats['downloaded']}")
-    print(f"Already downloaded:   {stats['already_downloaded']}")
-    print(f"Skipped:              {stats['skipped']}")
-    print(f"Errors:               {stats['errors']}")
-    print("=" * 60)
+    store.save()
+    settle()
+    counts = queue.counts()
+    events.block(events.NOTICE, 'worker_summary', [
+        "\n" + "=" * 60,
+        f"WORKER {worker_id} FINISHED",
+        "=" * 60,
+        f"Jobs processed:       {stats['processed']}",
+        f"New downloads:        {stats['downloaded']}",
+        f"Already downloaded:   {stats['already_downloaded']}",
+        f"Skipped:              {stats['skipped']}",
+        f"Errors:               {stats['errors']}",
+        f"Queue:                {counts['done']} done, {counts['failed']} failed",
+        "=" * 60
+    ], worker=worker_id, queue_done=counts['done'], queue_failed=counts['failed'], **stats)
 
 
-def process_year_posters(downloader, year, required_genres=None, auto_confirm=False, skip_existing=True):
+def process_movie_posters(downloader, movie_identifier, required_genres=None, auto_confirm=False, skip_existing=True):
     """
-    Process all posters from a specific year.
+    Process all posters for a specific movie (all variants).
     
     Args:
         downloader: PosterDownloader instance
-        year: Year to process (int)
+        movie_identifier: Path or URL to the movie poster page
         required_genres: List of required genres (AND logic) or None
-        auto_confirm: If True, skip confirmation prompt (for command-line mode)
-        skip_existing: Whether to skip already downloaded files (default: True)
+        auto_confirm: Skip confirmation prompt when True
+        skip_existing: Whether to skip already downloaded files
     """
-    # Get list of posters for the year
-    poster_urls = downloader.get_year_posters(year)
+    poster_urls, details = downloader.get_movie_posters(movie_identifier, return_details=True)
     
     if not poster_urls:
-        print(f"✗ No posters found for year {year}")
+        events.error('no_posters', "✗ No posters found for that movie", movie=movie_identifier)
         return
     
-    print(f"\nReady to process {len(poster_urls)} posters from {year}")
-    if required_genres:
-        print(f"Genre filter: Movies must match ALL of: {', '.join(required_genres)}")
-    print("Posters will be filtered by your genre blocklist settings")
-    print()
+    movie_title = details.get('movie_title', 'Unknown Movie')
+    year = details.get('year', 'unknown')
+    
+    events.info('batch_source', f"\nReady to process {len(poster_urls)} posters for {movie_title} ({year})",
+                posters=len(poster_urls), movie=movie_title, year=year)
+    announce_filters(required_genres)
     
     if not auto_confirm:
+        print()
         response = input(f"Continue with batch processing? (yes/no): ").strip().lower()
         if response not in ['yes', 'y']:
-            print("Cancelled by user")
+            events.info('cancelled', "Cancelled by user")
             return
     
-    print("\n" + "=" * 60)
-    print(f"Starting batch processing for {year}...")
-    print("=" * 60)
+    announce_batch(f"Starting batch processing for {movie_title}...")
     
-    stats = {
-        'total': len(poster_urls),
-        'downloaded': 0,
-        'already_downloaded': 0,
-        'skipped': 0,
-        'blocked': 0,
-        'errors': 0
-    }
+    stats, progress = process_poster_stream(
+        downloader,
+        poster_urls,
+        required_genres=required_genres,
+        skip_existing=skip_existing
+    )
     
-    for i, url in enumerate(poster_urls, 1):
-        print(f"\n[{i}/{stats['total']}] Processing: {url}")
-        print("-" * 60)
+    print_batch_summary(f"BATCH PROCESSING COMPLETE FOR {movie_title}", stats, progress, downloader)
+
+
+def process_year_posters(downloader, year, required_genres=None, auto_confirm=False, skip_existing=True):
+    """
+    Process all posters from a specific year.
+    
+    In auto-confirm mode posters are streamed into the pipeline while the
+    year index is still being read.
+    
+    Args:
+        downloader: PosterDownloader instance
+        year: Year to process (int)
+        required_genres: List of required genres (AND logic) or None
+        auto_confirm: If True, skip confirmation prompt (for command-line mode)
+        skip_existing: Whether to skip already downloaded files (default: True)
+    """
+    if auto_confirm:
+        poster_urls = downloader.iter_year_posters(year)
+        events.info('batch_source', f"\nStreaming posters from {year}", year=year)
+    else:
+        # Get list of posters for the year so the user can confirm the batch size
+        poster_urls = downloader.get_year_posters(year)
         
-        try:
-            success, already_existed, _ = downloader.process_poster_page(
-                url,
-                prompt_confirm=False,
-                required_genres=required_genres,
-                skip_existing=skip_existing
-            )
-            if success:
-                stats['downloaded'] += 1
-            elif already_existed:
-                stats['already_downloaded'] += 1
-            else:
-                stats['skipped'] += 1
-        except KeyboardInterrupt:
-            print("\n\n✗ Interrupted by user")
-            break
-        except Exception as e:
-            print(f"✗ Error processing poster: {e}")
-            stats['errors'] += 1
-            continue
+        if not poster_urls:
+            events.error('no_posters', f"✗ No posters found for year {year}", year=year)
+            return
+        
+        events.info('batch_source', f"\nReady to process {len(poster_urls)} posters from {year}",
+                    posters=len(poster_urls), year=year)
+    announce_filters(required_genres)
+    
+    if not auto_confirm:
+        print()
+        response = input(f"Continue with batch processing? (yes/no): ").strip().lower()
+        if response not in ['yes', 'y']:
+            events.info('cancelled', "Cancelled by user")
+            return
+    
+    announce_batch(f"Starting batch processing for {year}...")
+    
+    stats, progress = process_poster_stream(
+        downloader,
+        poster_urls,
+        required_genres=required_genres,
+        skip_existing=skip_existing
+    )
+    
+    if not stats['total']:
+        events.error('no_posters', f"✗ No posters found for year {year}", year=year)
+        return
     
     # Final statistics
-    print("\n" + "=" * 60)
-    print(f"BATCH PROCESSING COMPLETE FOR {year}")
-    print("=" * 60)
-    print(f"Total posters:        {stats['total']}")
-    print(f"New downloads:        {stats['downloaded']}")
-    print(f"Already downloaded:   {stats['already_downloaded']}")
-    print(f"Skipped:              {stats['skipped']}")
-    print(f"Errors:               {stats['errors']}")
-    print("=" * 60)
+    print_batch_summary(f"BATCH PROCESSING COMPLETE FOR {year}", stats, progress, downloader)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Built-in profiling for slow crawl and digest runs (``--profile``).
+
+``cpu`` runs the selected mode under cProfile (every pipeline thread, not
+just the main one) and samples the stacks of all threads for flamegraphs.
+``alloc`` runs it under tracemalloc and reports the top allocation sites and
+the peak traced memory seen while each pipeline stage was running.
+
+Each run writes into its own timestamped directory:
+
+    cpu    cpu.pstats        cProfile data (python -m pstats, snakeviz, ...)
+           cpu_top.txt       top functions by cumulative and own time
+           stacks.collapsed  sampled stacks in collapsed format
+                             (flamegraph.pl, speedscope, inferno)
+    alloc  alloc_top.txt     top allocation sites and tracebacks
+           alloc_stages.txt  peak traced memory per pipeline stage
+           alloc.snapshot    tracemalloc snapshot (tracemalloc.Snapshot.load)
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import events
+
+PROFILE_KINDS = ('cpu', 'alloc')
+
+# Seconds between stack samples (cpu) and traced-memory samples (alloc)
+SAMPLE_INTERVAL = 0.005
+MEMORY_SAMPLE_INTERVAL = 0.01
+# Frames kept per allocation traceback; more frames cost more memory
+ALLOC_FRAMES = 16
+TOP_ENTRIES = 40
+
+# cProfile/pstats and tracemalloc are imported by the profile classes, so
+# the downloader can import PROFILE_KINDS without paying for them.
+
+
+def format_bytes(size: float) -> str:
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _thread_label(name: str) -> str:
+    # Fold "ThreadPoolExecutor-0_3" / "pipeline-download-2" into one root per pool
+    return re.sub(r'\d+', 'N', name).replace(';', ':')
+
+
+class StackSampler:
+    """Background thread that counts the stacks of every other thread."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                labels.append(_thread_label(names.get(ident, 'thread')))
+                self.stacks[';'.join(reversed(labels))] += 1
+            self.samples += 1
+
+    def write(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as fh:
+            for stack, count in self.stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+
+
+class CpuProfile:
+    """cProfile across the main thread and every thread started while enabled."""
+
+    def __init__(self) -> None:
+        import cProfile
+
+        self.main = cProfile.Profile()
+        self.thread_profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self.sampler = StackSampler()
+        # Python 3.12+ profiles all threads from one profiler (sys.monitoring)
+        # and refuses a second one; older versions profile only the caller.
+        self.per_thread = sys.version_info < (3, 12)
+
+    def _start_thread_profile(self, frame, event, arg) -> None:
+        import cProfile
+
+        profile = cProfile.Profile()
+        with self._lock:
+            self.thread_profiles.append(profile)
+        # Replaces this hook for the rest of the thread
+        profile.enable()
+
+    def start(self) -> None:
+        # Sampler first, so its own thread is not profiled
+        self.sampler.start()
+        if self.per_thread:
+            threading.setprofile(self._start_thread_profile)
+        self.main.enable()
+
+    def stop(self, directory: str) -> List[str]:
+        import pstats
+
+        self.main.disable()
+        if self.per_thread:
+            threading.setprofile(None)
+        self.sampler.stop()
+
+        stats = pstats.Stats(self.main)
+        with self._lock:
+            for profile in self.thread_profiles:
+                profile.disable()
+                stats.add(profile)
+        stats.dump_stats(os.path.join(directory, 'cpu.pstats'))
+
+        report = io.StringIO()
+        stats.stream = report
+        report.write(f"Threads profiled: {1 + len(self.thread_profiles)}\n")
+        report.write(f"Stack samples: {self.sampler.samples} (every {SAMPLE_INTERVAL * 1000:.0f} ms)\n\n")
+        report.write("=== By cumulative time ===\n")
+        stats.sort_stats('cumulative').print_stats(TOP_ENTRIES)
+        report.write("=== By own time ===\n")
+        stats.sort_stats('tottime').print_stats(TOP_ENTRIES)
+        with open(os.path.join(directory, 'cpu_top.txt'), 'w', encoding='utf-8') as fh:
+            fh.write(report.getvalue())
+
+        self.sampler.write(os.path.join(directory, 'stacks.collapsed'))
+        return ['cpu.pstats', 'cpu_top.txt', 'stacks.collapsed']
+
+
+class AllocProfile:
+    """tracemalloc with per-stage peak memory taken from StageTimings callbacks."""
+
+    def __init__(self) -> None:
+        self.stage_peaks: Dict[str, int] = {}
+        # (monotonic time, traced bytes) for the last minute
+        self._samples: deque = deque(maxlen=int(60 / MEMORY_SAMPLE_INTERVAL))
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        import tracemalloc
+
+        tracemalloc.start(ALLOC_FRAMES)
+        self._thread = threading.Thread(target=self._run, name='profile-memory', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        import tracemalloc
+
+        while not self._stop.wait(MEMORY_SAMPLE_INTERVAL):
+            current = tracemalloc.get_traced_memory()[0]
+            with self._lock:
+                self._samples.append((time.monotonic(), current))
+
+    def stage_finished(self, stage: str, seconds: float) -> None:
+        """StageTimings observer: attribute the samples taken during the stage to it."""
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            return
+        now = time.monotonic()
+        peak = tracemalloc.get_traced_memory()[0]
+        with self._lock:
+            for sampled_at, current in reversed(self._samples):
+                if sampled_at < now - seconds:
+                    break
+                peak = max(peak, current)
+            if peak > self.stage_peaks.get(stage, 0):
+                self.stage_peaks[stage] = peak
+
+    def stop(self, directory: str) -> List[str]:
+        import tracemalloc
+
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        tracemalloc.stop()
+        snapshot.dump(os.path.join(directory, 'alloc.snapshot'))
+
+        with open(os.path.join(directory, 'alloc_top.txt'), 'w', encoding='utf-8') as fh:
+            fh.write(f"Traced memory at exit: {format_bytes(current)} • peak: {format_bytes(peak)}\n\n")
+            fh.write(f"=== Top {TOP_ENTRIES} allocation sites (live at exit) ===\n")
+            for stat in snapshot.statistics('lineno')[:TOP_ENTRIES]:
+                frame = stat.traceback[0]
+                fh.write(f"{format_bytes(stat.size):>11} {stat.count:>8} blocks  {frame.filename}:{frame.lineno}\n")
+            fh.write("\n=== Top 10 allocation tracebacks ===\n")
+            for stat in snapshot.statistics('traceback')[:10]:
+                fh.write(f"\n{format_bytes(stat.size)} in {stat.count} blocks\n")
+                fh.write('\n'.join(stat.traceback.format(most_recent_first=True)) + '\n')
+
+        from stage_timings import STAGES
+
+        with open(os.path.join(directory, 'alloc_stages.txt'), 'w', encoding='utf-8') as fh:
+            fh.write("Peak traced memory while each stage was running\n")
+            fh.write(f"(sampled every {MEMORY_SAMPLE_INTERVAL * 1000:.0f} ms and at each stage end; "
+                     "stages overlap across pipeline threads)\n\n")
+            names = [name for name in STAGES if name in self.stage_peaks]
+            names += sorted(set(self.stage_peaks) - set(names))
+            for name in names:
+                fh.write(f"{STAGES.get(name, name):<16} {format_bytes(self.stage_peaks[name]):>11}\n")
+            fh.write(f"{'whole run':<16} {format_bytes(peak):>11}\n")
+        return ['alloc_top.txt', 'alloc_stages.txt', 'alloc.snapshot']
+
+
+class RunProfiler:
+    """
+    Profile one run of the downloader and save the results.
+
+    Args:
+        kind: 'cpu' or 'alloc'
+        root: Directory that receives one timestamped subdirectory per run
+        label: Run mode, included in the directory name
+    """
+
+    def __init__(self, kind: str, root: str, label: str = 'run') -> None:
+        if kind not in PROFILE_KINDS:
+            raise ValueError(f"unknown profile kind '{kind}' (expected one of {', '.join(PROFILE_KINDS)})")
+        self.kind = kind
+        self.directory = os.path.join(root, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{label}-{kind}")
+        self.profile = CpuProfile() if kind == 'cpu' else AllocProfile()
+        self.timings = None
+        self.started = 0.0
+
+    def start(self, timings=None) -> None:
+        """Start profiling; ``timings`` (StageTimings) enables per-stage peaks in alloc mode."""
+        os.makedirs(self.directory, exist_ok=True)
+        if timings is not None and isinstance(self.profile, AllocProfile):
+            self.timings = timings
+            timings.observer = self.profile.stage_finished
+        self.started = time.perf_counter()
+        self.profile.start()
+        events.info('profile_started', f"ℹ️  Profiling ({self.kind}) into {self.directory}", kind=self.kind, directory=self.directory)
+
+    def stop(self) -> str:
+        """Stop profiling and write the result files; returns the output directory."""
+        elapsed = time.perf_counter() - self.started
+        if self.timings is not None:
+            self.timings.observer = None
+        files = self.profile.stop(self.directory)
+        with open(os.path.join(self.directory, 'command.txt'), 'w', encoding='utf-8') as fh:
+            fh.write(' '.join(sys.argv) + '\n')
+            fh.write(f"profiled {elapsed:.2f}s\n")
+        events.notice('profile_written', f"✓ {self.kind} profile written to {self.directory} ({', '.join(files)})",
+                      kind=self.kind, directory=self.directory, files=files)
+        return self.directory
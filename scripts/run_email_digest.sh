@@ -18,13 +18,10 @@ if [[ -z "$PYTHON_BIN" ]]; then
     exit 1
 fi
 
-# Check if script should run today based on config.yaml schedule
-if ! "$PYTHON_BIN" schedule_checker.py >/dev/null 2>&1; then
-    "$PYTHON_BIN" schedule_checker.py
-    exit 0
-fi
-
 # Default to scanning 5 pages unless overridden
 PAGES="${PAGES_OVERRIDE:-5}"
 
-"$PYTHON_BIN" poster_downloader.py --email-digest --digest-pages "$PAGES" "$@"
+# The downloader checks the config.yaml schedule itself before loading its
+# heavy dependencies. -m runs it from cached bytecode instead of recompiling
+# the script on every cron run.
+"$PYTHON_BIN" -m poster_downloader --email-digest --digest-pages "$PAGES" "$@"
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+The single loader for config.yaml, shared by every module.
+
+``get_config()`` parses the file once per process and caches the result.
+It stats the file on each call and parses it again only when its mtime or
+size changes, so a long-running worker can pick up edits between jobs.
+Every section is a typed ``__slots__`` class whose field table is also the
+one place its defaults live:
+
+    config = get_config()
+    config.crawl.max_concurrency      # int, default 8
+    config.schedule.days_of_week      # dict, merged over all-days-enabled
+    config.genres                     # free-form genre blocklist mapping
+
+Missing keys and ``null`` values take the default. Values of the wrong
+type (``max_concurrency: "eight"``) and unknown keys
+are reported as warning events, and the default is used instead, so a typo
+never stops a cron run. Each warning is reported once, not again on every
+reload of an unchanged mistake. Mapping fields (``resolutions``, ``days_of_week``,
+``retry_classes``) are merged over their defaults one level deep, as
+before.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+import events
+
+CONFIG_FILE = 'config.yaml'
+
+DEFAULT_USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+_TYPE_NAMES = {bool: 'true/false', int: 'an integer', float: 'a number', str: 'a string', dict: 'a mapping'}
+
+
+def _coerce(value: Any, kind: type, default: Any, where: str, problems: List[str]) -> Any:
+    """Check ``value`` against ``kind``; returns the value to use (the default if invalid)."""
+    # Missing keys and explicit nulls both mean "use the default"
+    if value is None:
+        return default
+    if kind is bool:
+        ok = isinstance(value, bool)
+    elif kind is int:
+        ok = isinstance(value, int) and not isinstance(value, bool)
+    elif kind is float:
+        ok = isinstance(value, (int, float)) and not isinstance(value, bool)
+        value = float(value) if ok else value
+    elif kind is str:
+        ok = not isinstance(value, (dict, list))
+        value = str(value) if ok else value
+    else:
+        ok = isinstance(value, dict)
+        value = {**default, **value} if ok else value
+    if not ok:
+        problems.append(f"{where} must be {_TYPE_NAMES[kind]} (got {value!r}), using {default!r}")
+        return default
+    return value
+
+
+class Section:
+    """
+    Base class for a config section.
+
+    Subclasses list ``FIELDS`` as (name, type, default) and derive
+    ``__slots__`` from it; the constructor validates a parsed YAML mapping
+    against that table.
+    """
+
+    __slots__ = ()
+    FIELDS: Tuple[Tuple[str, type, Any], ...] = ()
+
+    def __init__(self, values: Optional[Dict] = None, where: str = '', problems: Optional[List[str]] = None) -> None:
+        values = values or {}
+        problems = problems if problems is not None else []
+        for name, kind, default in self.FIELDS:
+            if kind is dict:
+                default = dict(default)
+            setattr(self, name, _coerce(values.get(name), kind, default, f"{where}.{name}", problems))
+        known = {name for name, _, _ in self.FIELDS}
+        for name in values:
+            if name not in known:
+                problems.append(f"unknown setting {where}.{name} (ignored)")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name, _, _ in self.FIELDS}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+
+class FilesConfig(Section):
+    FIELDS = (
+        ('movie_metadata', str, 'movie_metadata.json'),
+        ('email_tracking', str, 'email_tracking.json'),
+        ('digest_state', str, 'digest_state.json'),
+        ('failed_jobs', str, 'failed_jobs.json'),
+        ('downloads_dir', str, 'downloads'),
+        ('profiles_dir', str, 'profiles'),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class TmdbConfig(Section):
+    FIELDS = (
+        ('base_url', str, 'https://api.themoviedb.org/3'),
+        ('lazy_enrichment', bool, True),
+        ('requests_per_second', float, 20.0),
+        ('cache_ttl_days', float, 30.0),
+        ('missing_ttl_days', float, 7.0),
+        ('enrich_workers', int, 4),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class EmailConfig(Section):
+    FIELDS = (
+        ('max_size_mb', int, 10),
+        ('thumbnail_max_width', int, 800),
+        ('jpeg_quality', int, 85),
+        ('max_retries', int, 3),
+        ('retry_delay_seconds', float, 5.0),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class HttpConfig(Section):
+    FIELDS = (
+        ('timeout_seconds', float, 30.0),
+        ('max_retries', int, 3),
+        ('retry_delay_seconds', float, 2.0),
+        ('retry_max_delay_seconds', float, 60.0),
+        ('retry_classes', dict, {}),
+        ('requests_per_second', float, 5.0),
+        ('adaptive_concurrency', bool, True),
+        ('min_concurrency', int, 1),
+        ('user_agent', str, DEFAULT_USER_AGENT),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class DigestConfig(Section):
+    FIELDS = (
+        ('default_pages', int, 5),
+        ('history_limit', int, 500),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class ScheduleConfig(Section):
+    FIELDS = (
+        ('enabled', bool, True),
+        ('days_of_week', dict, {day: True for day in WEEKDAYS}),
+        ('preferred_time', str, '08:00'),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class SiteConfig(Section):
+    FIELDS = (
+        ('base_url', str, 'http://www.impawards.com'),
+        ('latest_url', str, 'http://www.impawards.com/archives/latest.html'),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class CrawlConfig(Section):
+    FIELDS = (
+        ('max_concurrency', int, 8),
+        ('pipeline_workers', int, 2),
+        ('pipeline_queue_size', int, 8),
+        ('tmdb_prefetch', bool, True),
+        ('prefetch_window', int, 100),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class CacheConfig(Section):
+    FIELDS = (
+        ('dir', str, 'cache'),
+        ('year_index_ttl_days', float, 365.0),
+        ('recent_year_ttl_hours', float, 6.0),
+        ('parse_results', bool, True),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class StoreConfig(Section):
+    FIELDS = (
+        ('flush_every', int, 200),
+        ('flush_interval_seconds', float, 30.0),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class FailedJobsConfig(Section):
+    FIELDS = (
+        ('retry_delay_minutes', float, 15.0),
+        ('max_attempts', int, 8),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class QueueConfig(Section):
+    FIELDS = (
+        ('dir', str, 'job_queue'),
+        ('lease_seconds', float, 300.0),
+        ('max_attempts', int, 3),
+        ('poll_seconds', float, 5.0),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class MetricsConfig(Section):
+    FIELDS = (
+        ('textfile', str, ''),
+        ('push_url', str, ''),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+# Top-level mappings kept as plain dicts: genre name / resolution name -> {'allow': bool, ...}
+MAPPINGS = {
+    'genres': {},
+    'resolutions': {
+        'XXXLG': {'allow': True},
+        'XXLG': {'allow': True},
+        'XLG': {'allow': True},
+        'LG': {'allow': False}
+    },
+}
+
+
+class Config:
+    """
+    Validated contents of one config.yaml.
+
+    Attributes:
+        path: File the values came from
+        mtime_ns: Its modification time when parsed (None if it was missing)
+        problems: Load and validation warnings (see report_problems())
+    """
+
+    SECTIONS = (
+        ('files', FilesConfig),
+        ('tmdb', TmdbConfig),
+        ('email', EmailConfig),
+        ('http', HttpConfig),
+        ('digest', DigestConfig),
+        ('schedule', ScheduleConfig),
+        ('site', SiteConfig),
+        ('crawl', CrawlConfig),
+        ('cache', CacheConfig),
+        ('store', StoreConfig),
+        ('failed_jobs', FailedJobsConfig),
+        ('queue', QueueConfig),
+        ('metrics', MetricsConfig),
+    )
+    __slots__ = tuple(name for name, _ in SECTIONS) + tuple(MAPPINGS) + ('path', 'mtime_ns', 'problems')
+
+    def __init__(self, data: Optional[Dict] = None, path: str = CONFIG_FILE, mtime_ns: Optional[int] = None) -> None:
+        data = data or {}
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.problems: List[str] = []
+        for name, section in self.SECTIONS:
+            values = data.get(name)
+            if values is not None and not isinstance(values, dict):
+                self.problems.append(f"{name} must be a mapping, using defaults")
+                values = None
+            setattr(self, name, section(values, name, self.problems))
+        for name, default in MAPPINGS.items():
+            setattr(self, name, _coerce(data.get(name), dict, default, name, self.problems))
+        known = {name for name, _ in self.SECTIONS} | set(MAPPINGS)
+        for name in data:
+            if name not in known:
+                self.problems.append(f"unknown section {name} (ignored)")
+
+
+def parse_config(path: str = CONFIG_FILE) -> Config:
+    """
+    Parse and validate ``path`` without touching the cache.
+
+    A missing file gives the defaults; an unreadable or invalid one gives the
+    defaults too, with the error in ``problems``. Nothing is reported.
+
+    Args:
+        path: YAML file to read
+
+    Returns:
+        Config: Validated configuration
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return Config(path=path)
+    try:
+        with open(path, 'r', encoding='utf-8') as fh:
+            # libyaml's SafeLoader when available (about 10x faster)
+            data = yaml.load(fh, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader)) or {}
+        if not isinstance(data, dict):
+            raise ValueError('top level must be a mapping')
+    except Exception as exc:
+        config = Config(path=path, mtime_ns=stat.st_mtime_ns)
+        config.problems.append(f"could not load ({exc}), using default configuration")
+        return config
+    return Config(data, path=path, mtime_ns=stat.st_mtime_ns)
+
+
+_lock = threading.Lock()
+# abspath -> ((mtime_ns, size) when parsed, Config)
+_cache: Dict[str, Tuple[Optional[Tuple[int, int]], Config]] = {}
+# abspath -> problems reported for the last version of that file
+_reported: Dict[str, frozenset] = {}
+
+
+def report_problems(config: Config) -> int:
+    """
+    Emit ``config.problems`` as warning events, skipping those already
+    reported for the previous version of the same file.
+
+    Args:
+        config: Configuration from get_config() or parse_config()
+
+    Returns:
+        int: Number of warnings emitted
+    """
+    key = os.path.abspath(config.path)
+    with _lock:
+        seen = _reported.get(key, frozenset())
+        _reported[key] = frozenset(config.problems)
+    new = [problem for problem in config.problems if problem not in seen]
+    for problem in new:
+        events.warning('config_problem', f"  Warning: {config.path}: {problem}", path=config.path, problem=problem)
+    return len(new)
+
+
+def get_config(path: str = CONFIG_FILE, report: bool = True) -> Config:
+    """
+    The cached configuration, parsed again only if the file changed.
+
+    Returns the same object until ``path``'s mtime or size changes, so
+    callers can detect a reload with ``is``.
+
+    Args:
+        path: YAML file (relative paths resolve against the working directory)
+        report: Emit new load and validation warnings (see report_problems());
+            pass False for loads that happen before events.configure()
+
+    Returns:
+        Config: Validated configuration
+    """
+    key = os.path.abspath(path)
+    try:
+        stat = os.stat(key)
+        version = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        version = None
+    with _lock:
+        cached = _cache.get(key)
+        if cached is None or cached[0] != version:
+            cached = _cache[key] = (version, parse_config(path))
+    if report:
+        report_problems(cached[1])
+    return cached[1]
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing histograms for the poster pipeline.
+
+Each poster passes through up to eight timed stages: page fetch, parse,
+IMDb link extraction, TMDb find, TMDb details, genre filter, image download
+and metadata save; digest emails add an SMTP send stage. Durations are aggregated into fixed log-scale buckets,
+so recording is cheap and memory stays constant however long the run, and
+the end-of-run summary shows where wall-clock time went (for example
+whether TMDb or image transfer dominates a digest).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+# Stage name -> summary label, in pipeline order.
+STAGES = {
+    'fetch': 'page fetch',
+    'parse': 'parse',
+    'imdb': 'IMDb extraction',
+    'tmdb_find': 'TMDb find',
+    'tmdb_detail': 'TMDb detail',
+    'filter': 'genre filter',
+    'download': 'image download',
+    'save': 'metadata save',
+    'smtp': 'SMTP send',
+}
+
+# Upper bucket bounds in seconds; the last bucket holds everything slower.
+BUCKET_BOUNDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_BARS = ' ▁▂▃▄▅▆▇█'
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 1:
+        return f"{seconds * 1000:.0f}ms"
+    return f"{seconds:.2f}s" if seconds < 10 else f"{seconds:.0f}s"
+
+
+class StageHistogram:
+    """Count, total, min/max and bucketed durations for one stage."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        for index, bound in enumerate(BUCKET_BOUNDS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Estimate a percentile by interpolating inside its bucket (clipped to min/max)."""
+        if not self.count:
+            return None
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            if count and seen + count >= rank:
+                lower = max(self.min, BUCKET_BOUNDS[index - 1] if index else 0.0)
+                upper = min(self.max, BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.max
+
+    def sparkline(self) -> str:
+        peak = max(self.buckets)
+        if not peak:
+            return ''
+        return ''.join(_BARS[0 if not count else max(1, round(count / peak * (len(_BARS) - 1)))]
+                       for count in self.buckets)
+
+    def as_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'total_seconds': self.total,
+            'mean_seconds': self.total / self.count if self.count else None,
+            'min_seconds': self.min if self.count else None,
+            'p50_seconds': self.percentile(50),
+            'p95_seconds': self.percentile(95),
+            'max_seconds': self.max,
+            'buckets': [{'le': bound, 'count': count}
+                        for bound, count in zip(list(BUCKET_BOUNDS) + ['+Inf'], self.buckets)],
+        }
+
+
+class StageTimings:
+    """Thread-safe collection of StageHistograms keyed by stage name."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.stages: Dict[str, StageHistogram] = {}
+        # Optional callable(stage, seconds) run after each record (used by --profile alloc)
+        self.observer: Optional[Callable[[str, float], None]] = None
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = StageHistogram()
+            histogram.add(seconds)
+        if self.observer is not None:
+            self.observer(stage, seconds)
+
+    @contextmanager
+    def time(self, stage: str):
+        """Record the duration of the ``with`` block under ``stage``."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def _ordered(self) -> List[str]:
+        with self._lock:
+            names = list(self.stages)
+        return [name for name in STAGES if name in names] + sorted(set(names) - set(STAGES))
+
+    def summary_lines(self) -> List[str]:
+        """One line per stage that ran, plus a legend for the histogram column."""
+        names = self._ordered()
+        if not names:
+            return []
+        busy = sum(self.stages[name].total for name in names) or 1.0
+        lines = []
+        for name in names:
+            histogram = self.stages[name]
+            lines.append(
+                f"{STAGES.get(name, name):<16} n={histogram.count:<6} "
+                f"total {format_seconds(histogram.total):>7} ({histogram.total / busy * 100:>3.0f}%) • "
+                f"p50 {format_seconds(histogram.percentile(50)):>6} • "
+                f"p95 {format_seconds(histogram.percentile(95)):>6} • "
+                f"max {format_seconds(histogram.max):>6}  {histogram.sparkline()}".rstrip()
+            )
+        lines.append(f"{'':<16} (histogram buckets: ≤{format_seconds(BUCKET_BOUNDS[0])} … "
+                     f"≤{format_seconds(BUCKET_BOUNDS[-1])}, slower; % of summed stage time)")
+        return lines
+
+    def as_dict(self) -> Dict[str, Dict]:
+        return {name: self.stages[name].as_dict() for name in self._ordered()}
+
+    def save(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump({'stages': self.as_dict()}, fh, indent=2)
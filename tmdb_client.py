@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Rate-limited, cached TMDb lookups by IMDb ID.
+
+Every lookup (``/find`` plus ``/movie`` details) goes through the caller's
+HTTP getter (the downloader's governed session), so concurrent callers share
+one connection pool and stay under the per-host API rate limit. Results are
+kept in a small JSON cache: resolved movies for a long TTL, "not on TMDb"
+answers for a shorter one so they are retried eventually. Failed requests are
+never cached.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+import events
+from tracing import NULL_TRACER
+
+# TMDb genre mappings (as of 2024)
+GENRE_NAMES = {
+    28: 'Action', 12: 'Adventure', 16: 'Animation', 35: 'Comedy',
+    80: 'Crime', 99: 'Documentary', 18: 'Drama', 10751: 'Family',
+    14: 'Fantasy', 36: 'History', 27: 'Horror', 10402: 'Music',
+    9648: 'Mystery', 10749: 'Romance', 878: 'Science Fiction',
+    10770: 'TV Movie', 53: 'Thriller', 10752: 'War', 37: 'Western'
+}
+
+
+def genre_names(genre_ids: List[int]) -> List[str]:
+    return [GENRE_NAMES.get(gid, f'Unknown ({gid})') for gid in genre_ids]
+
+
+def empty_metadata(imdb_id: str) -> Dict:
+    return {
+        'imdb_id': imdb_id,
+        'tmdb_id': None,
+        'title': None,
+        'release_date': None,
+        'genres': []
+    }
+
+
+class TmdbCache:
+    """JSON file of TMDb metadata keyed by IMDb ID."""
+
+    def __init__(self, path: str, ttl_days: float = 30, missing_ttl_days: float = 7) -> None:
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.missing_ttl = missing_ttl_days * 86400
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.data: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, imdb_id: str) -> Optional[Dict]:
+        """Return cached metadata that is still fresh, or None."""
+        with self._lock:
+            entry = self.data.get(imdb_id)
+        if not entry:
+            return None
+        ttl = self.ttl if entry.get('tmdb_id') else self.missing_ttl
+        if time.time() - entry.get('fetched_at', 0) > ttl:
+            return None
+        return {key: value for key, value in entry.items() if key != 'fetched_at'}
+
+    def put(self, imdb_id: str, metadata: Dict) -> None:
+        entry = dict(metadata)
+        entry['fetched_at'] = time.time()
+        with self._lock:
+            self.data[imdb_id] = entry
+            self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            # Keep entries other processes added since we loaded
+            merged = self._load()
+            merged.update(self.data)
+            self.data = merged
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as fh:
+                    json.dump(self.data, fh)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except OSError as exc:
+                events.warning('save_failed', f"  Warning: Could not save {self.path}: {exc}", path=self.path, error=str(exc))
+
+
+class TmdbClient:
+    """Thread-safe TMDb client sharing one HTTP getter and cache."""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        http_get: Callable,
+        cache: Optional[TmdbCache] = None,
+        timings=None,
+        tracer=None
+    ) -> None:
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.http_get = http_get
+        self.cache = cache
+        self.timings = timings
+        self.tracer = tracer or NULL_TRACER
+        self.requests_made = 0
+        self.endpoint_requests: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _get_json(self, path: str, params: Optional[Dict] = None, stage: Optional[str] = None) -> Dict:
+        with self._lock:
+            self.requests_made += 1
+            self.endpoint_requests[path.split('/')[1]] += 1
+        query = {'api_key': self.api_key}
+        query.update(params or {})
+        started = time.perf_counter()
+        try:
+            with self.tracer.span('tmdb', endpoint=path.split('/')[1], path=path):
+                response = self.http_get(f"{self.base_url}{path}", params=query)
+                response.raise_for_status()
+                return response.json()
+        finally:
+            if self.timings is not None and stage:
+                self.timings.record(stage, time.perf_counter() - started)
+
+    def lookup(self, imdb_id: str, use_cache: bool = True) -> Dict:
+        """
+        Resolve an IMDb ID to TMDb metadata (genres, release_date, tmdb_id, title).
+
+        If the ``/movie`` details request fails after ``/find`` succeeded,
+        the ``/find`` metadata is returned uncached.
+
+        Raises:
+            requests.RequestException: On network or HTTP errors from ``/find`` (never cached)
+        """
+        if use_cache and self.cache is not None:
+            cached = self.cache.get(imdb_id)
+            if cached is not None:
+                return cached
+
+        metadata = empty_metadata(imdb_id)
+        data = self._get_json(f"/find/{imdb_id}", {'external_source': 'imdb_id'}, stage='tmdb_find')
+        movie_results = data.get('movie_results', [])
+        if movie_results:
+            movie = movie_results[0]
+            metadata['tmdb_id'] = movie.get('id')
+            metadata['title'] = movie.get('title') or movie.get('original_title')
+            metadata['release_date'] = movie.get('release_date')
+            metadata['genres'] = genre_names(movie.get('genre_ids', []))
+
+        # Fetch full movie details to enrich metadata if TMDb ID is available
+        if metadata['tmdb_id']:
+            try:
+                detail_data = self._get_json(f"/movie/{metadata['tmdb_id']}", stage='tmdb_detail')
+            except Exception as exc:
+                # Keep the /find genres so genre rules still apply, but do not
+                # cache the partial result; the next lookup tries again
+                events.warning('tmdb_detail_failed',
+                               f"  Warning: TMDb details unavailable for {imdb_id}, using search result: {exc}",
+                               imdb_id=imdb_id, error=str(exc))
+                return metadata
+            metadata['release_date'] = detail_data.get('release_date') or metadata['release_date']
+            detail_genres = detail_data.get('genres')
+            if detail_genres:
+                metadata['genres'] = [g.get('name', '').strip() for g in detail_genres if g.get('name')]
+            if not metadata['title']:
+                metadata['title'] = detail_data.get('title') or detail_data.get('original_title')
+
+        if self.cache is not None:
+            self.cache.put(imdb_id, metadata)
+        return metadata
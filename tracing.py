@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Structured per-poster trace spans (``--trace FILE``).
+
+Every traced operation (HTTP request, parse, TMDb call, image download,
+metadata store flush, email send) is written as one JSON object per line:
+
+    {"id": 41, "parent": 37, "name": "http", "poster": "https://.../x.html",
+     "start": 1760000000.123, "end": 1760000000.456, "ms": 333.1,
+     "thread": "pipeline-fetch-0", "outcome": "ok", "bytes": 18432, ...}
+
+Batch runs also emit one ``poster`` span per poster (from discovery to
+completion); the pipeline stage spans (``stage:fetch``, ``stage:enrich``,
+``stage:download``) are its children and the operations above are theirs. Spans inherit the poster URL
+and parent from the span open on the same thread.
+
+Components hold ``NULL_TRACER`` unless tracing is enabled, so a disabled
+trace costs one method call returning a shared no-op context per span.
+``summarize_trace()`` backs the ``trace-summary`` command.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import events
+
+
+class Span:
+    """An open span; ``set()`` adds attributes (bytes, outcome, status, ...)."""
+
+    __slots__ = ('id', 'parent', 'name', 'poster', 'attrs')
+
+    def __init__(self, span_id: int, parent: Optional[int], name: str, poster: Optional[str], attrs: Dict) -> None:
+        self.id = span_id
+        self.parent = parent
+        self.name = name
+        self.poster = poster
+        self.attrs = attrs
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+
+class _NullSpan:
+    __slots__ = ()
+    id = None
+
+    def set(self, **attrs) -> None:
+        pass
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class NullTracer:
+    """Tracer used when --trace is not given: every span is the shared no-op."""
+
+    enabled = False
+
+    def span(self, name: str, poster: Optional[str] = None, parent: Optional[int] = None, **attrs) -> _NullSpan:
+        return NULL_SPAN
+
+    def begin_job(self, job: Dict) -> None:
+        pass
+
+    def end_job(self, job: Dict) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+NULL_TRACER = NullTracer()
+
+
+class Tracer:
+    """Thread-safe JSONL span writer."""
+
+    enabled = True
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.spans = 0
+        self._fh = open(path, 'w', encoding='utf-8')
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def write(self, record: Dict) -> None:
+        line = json.dumps(record, separators=(',', ':'), default=str)
+        with self._lock:
+            self._fh.write(line + '\n')
+            self.spans += 1
+
+    def _record(self, span: Span, start: float, end: float) -> Dict:
+        record = {
+            'id': span.id, 'parent': span.parent, 'name': span.name, 'poster': span.poster,
+            'start': round(start, 6), 'end': round(end, 6), 'ms': round((end - start) * 1000, 3),
+            'thread': threading.current_thread().name,
+        }
+        record.update(span.attrs)
+        record.setdefault('outcome', 'ok')
+        return record
+
+    @contextmanager
+    def span(self, name: str, poster: Optional[str] = None, parent: Optional[int] = None, **attrs) -> Iterator[Span]:
+        """
+        Time the ``with`` block as one span.
+
+        Args:
+            name: Operation name (http, parse, tmdb, download, store_flush, email, ...)
+            poster: Poster page URL (default: inherited from the enclosing span)
+            parent: Parent span id (default: the enclosing span on this thread)
+            **attrs: Extra fields written with the span
+
+        Yields:
+            Span: call ``span.set(...)`` to add bytes, outcome, status, ...
+        """
+        stack = self._stack()
+        enclosing = stack[-1] if stack else None
+        if enclosing is not None:
+            parent = parent if parent is not None else enclosing.id
+            poster = poster or enclosing.poster
+        span = Span(next(self._ids), parent, name, poster, attrs)
+        stack.append(span)
+        start = time.time()
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as exc:
+            span.attrs.setdefault('outcome', 'error')
+            span.attrs.setdefault('error', f"{type(exc).__name__}: {exc}"[:200])
+            raise
+        finally:
+            stack.pop()
+            self.write(self._record(span, start, start + time.perf_counter() - started))
+
+    def begin_job(self, job: Dict) -> None:
+        """Reserve the poster span of a pipeline job (its stages become children)."""
+        if 'trace_id' not in job:
+            job['trace_id'] = next(self._ids)
+            job['trace_start'] = time.time()
+
+    def end_job(self, job: Dict) -> None:
+        """Write the poster span of a finished pipeline job."""
+        if 'trace_id' not in job:
+            return
+        span = Span(job['trace_id'], None, 'poster', job.get('url'), {'outcome': job.get('outcome') or 'skipped'})
+        if job.get('error'):
+            span.attrs['error'] = str(job['error'])[:200]
+        self.write(self._record(span, job['trace_start'], time.time()))
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+        events.notice('trace_written', f"✓ Trace written to {self.path} ({self.spans:,} spans)", path=self.path, spans=self.spans)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))]
+
+
+def _format_ms(ms: float) -> str:
+    return f"{ms:.0f}ms" if ms < 1000 else f"{ms / 1000:.2f}s"
+
+
+def load_spans(path: str) -> List[Dict]:
+    spans = []
+    with open(path, 'r', encoding='utf-8') as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue  # Truncated last line of an interrupted run
+    return spans
+
+
+def summarize_trace(path: str, top: int = 10) -> List[str]:
+    """
+    Summarize a trace file: time per operation, slowest posters and hosts.
+
+    Args:
+        path: JSONL file written by --trace
+        top: Posters listed
+
+    Returns:
+        list: Report lines
+    """
+    spans = load_spans(path)
+    if not spans:
+        return [f"No spans in {path}"]
+
+    lines = []
+    wall = max(span['end'] for span in spans) - min(span['start'] for span in spans)
+    posters = [span for span in spans if span['name'] == 'poster']
+    lines.append(f"Trace {path}: {len(spans):,} spans • {len(posters):,} posters • {wall:.1f}s wall")
+
+    by_name = defaultdict(list)
+    for span in spans:
+        by_name[span['name']].append(span)
+    lines.append("")
+    lines.append(f"{'operation':<15} {'count':>7} {'total':>9} {'p50':>8} {'p95':>8} {'max':>8} {'MiB':>8} {'errors':>7}")
+    for name, group in sorted(by_name.items(), key=lambda item: -sum(span['ms'] for span in item[1])):
+        durations = [span['ms'] for span in group]
+        size = sum(span.get('bytes') or 0 for span in group) / (1024 * 1024)
+        errors = sum(1 for span in group if span.get('outcome') == 'error')
+        lines.append(f"{name:<15} {len(group):>7,} {_format_ms(sum(durations)):>9} {_format_ms(_percentile(durations, 50)):>8} "
+                     f"{_format_ms(_percentile(durations, 95)):>8} {_format_ms(max(durations)):>8} {size:>8.1f} {errors:>7}")
+
+    if posters:
+        children = defaultdict(list)
+        for span in spans:
+            if span.get('parent') is not None:
+                children[span['parent']].append(span)
+        lines.append("")
+        lines.append("Slowest posters (discovery to completion):")
+        for poster in sorted(posters, key=lambda span: -span['ms'])[:top]:
+            stages = children.get(poster['id'], [])
+            busy = sum(span['ms'] for span in stages)
+            parts = ' • '.join(f"{span['name'].split(':')[-1]} {_format_ms(span['ms'])}" for span in sorted(stages, key=lambda s: s['start']))
+            queued = f" • queued {_format_ms(max(0.0, poster['ms'] - busy))}" if stages else ''
+            lines.append(f"  {_format_ms(poster['ms']):>8}  {poster.get('outcome', ''):<18} {poster.get('poster')}")
+            if parts:
+                lines.append(f"  {'':>8}  {parts}{queued}")
+
+    requests_by_host = defaultdict(list)
+    for span in by_name.get('http', []):
+        requests_by_host[span.get('host') or '?'].append(span)
+    if requests_by_host:
+        lines.append("")
+        lines.append(f"{'host':<28} {'requests':>8} {'p50':>8} {'p95':>8} {'max':>8} {'MiB':>8} {'retried':>7} {'errors':>7}")
+        for host, group in sorted(requests_by_host.items(), key=lambda item: -sum(span['ms'] for span in item[1])):
+            durations = [span['ms'] for span in group]
+            size = sum(span.get('bytes') or 0 for span in group) / (1024 * 1024)
+            retried = sum(1 for span in group if (span.get('attempts') or 1) > 1)
+            errors = sum(1 for span in group if span.get('outcome') == 'error')
+            lines.append(f"{host:<28} {len(group):>8,} {_format_ms(_percentile(durations, 50)):>8} "
+                         f"{_format_ms(_percentile(durations, 95)):>8} {_format_ms(max(durations)):>8} "
+                         f"{size:>8.1f} {retried:>7} {errors:>7}")
+    return lines
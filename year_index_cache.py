@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Local cache of per-year poster indexes (``YEAR/std.html``).
+
+The poster set for past years is effectively frozen, so their extracted
+poster URL lists are kept for a long TTL and reused without any network
+request. Recent years (the current and previous year) still change, so their
+entries expire quickly and are revalidated with conditional requests
+(``If-None-Match`` / ``If-Modified-Since``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class YearIndexCache:
+    """Stores extracted poster URL lists per year as small JSON files."""
+
+    def __init__(self, cache_dir: str, frozen_ttl_days: float = 365, recent_ttl_hours: float = 6) -> None:
+        self.cache_dir = cache_dir
+        self.frozen_ttl = frozen_ttl_days * 86400
+        self.recent_ttl = recent_ttl_hours * 3600
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, year) -> str:
+        return os.path.join(self.cache_dir, f"{int(year)}.json")
+
+    @staticmethod
+    def is_recent(year) -> bool:
+        """Current and previous year indexes still receive new posters."""
+        return int(year) >= datetime.now().year - 1
+
+    def ttl_for(self, year) -> float:
+        return self.recent_ttl if self.is_recent(year) else self.frozen_ttl
+
+    # --------------------------------------------------------------------- #
+    # Lookups
+    # --------------------------------------------------------------------- #
+
+    def get(self, year, base_url: Optional[str] = None) -> Optional[Dict]:
+        """
+        Return the cached entry for a year (fresh or stale), or None.
+
+        Entries recorded against a different site base URL are ignored.
+        """
+        path = self._path(year)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or not isinstance(entry.get('urls'), list):
+            return None
+        if base_url and entry.get('base_url') not in (None, base_url):
+            return None
+        return entry
+
+    def is_fresh(self, entry: Dict) -> bool:
+        age = time.time() - entry.get('fetched_at', 0)
+        return age < self.ttl_for(entry['year'])
+
+    @staticmethod
+    def validators(entry: Optional[Dict]) -> Dict[str, str]:
+        """Conditional request headers for revalidating a cached entry."""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def cached_years(self) -> List[int]:
+        years = []
+        for name in os.listdir(self.cache_dir):
+            stem, ext = os.path.splitext(name)
+            if ext == '.json' and stem.isdigit():
+                years.append(int(stem))
+        return sorted(years)
+
+    # --------------------------------------------------------------------- #
+    # Updates
+    # --------------------------------------------------------------------- #
+
+    def store(self, year, urls: List[str], headers=None, base_url: Optional[str] = None) -> None:
+        headers = headers or {}
+        entry = {
+            'year': int(year),
+            'base_url': base_url,
+            'fetched_at': time.time(),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'urls': list(urls)
+        }
+        self._write(entry)
+
+    def touch(self, entry: Dict) -> None:
+        """Mark a revalidated (304 Not Modified) entry as fresh again."""
+        entry = dict(entry)
+        entry['fetched_at'] = time.time()
+        self._write(entry)
+
+    def _write(self, entry: Dict) -> None:
+        path = self._path(entry['year'])
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(entry, fh)
+        os.replace(tmp_path, path)